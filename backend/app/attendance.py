@@ -0,0 +1,630 @@
+import os
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from itertools import groupby
+from operator import itemgetter
+from typing import Callable, Iterable
+
+from pydantic import ValidationError
+from sqlalchemy import and_, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from . import models, schemas
+
+LOG_TYPES = ("IN", "OUT")
+
+# 근태 집계 기준
+# 일정(WorkSchedule)이 없는 근무일에 적용하는 근무유형 코드 (없으면 09:00-18:00, 휴게 60분)
+DEFAULT_WORK_TYPE = os.getenv("ATTENDANCE_DEFAULT_WORK_TYPE", "DAY")
+# 지각/조퇴 판정 유예 시간(분)
+GRACE_MINUTES = int(os.getenv("ATTENDANCE_GRACE_MINUTES", "0"))
+# 야간근로 시간대 (근로기준법: 22:00 ~ 익일 06:00)
+NIGHT_START = time(22, 0)
+NIGHT_END = time(6, 0)
+# 집계 결과를 한 번에 INSERT/UPDATE 하는 행 수 / 스트리밍 조회 단위
+AGGREGATE_BATCH_SIZE = int(os.getenv("ATTENDANCE_BATCH_SIZE", "1000"))
+STREAM_BATCH_SIZE = 10000
+
+
+def close_month(db: Session, year_month: str) -> dict[str, int]:
+    """Close the month for every employee: existing summaries are locked and no punch or
+    summary refresh is accepted for it afterwards, whether or not a summary row exists."""
+    if not is_month_closed(db, year_month):
+        db.add(models.AttendanceMonthClose(year_month=year_month))
+    q = db.query(models.AttendanceMonthSummary).filter(
+        models.AttendanceMonthSummary.year_month == year_month
+    )
+    updated = q.update({models.AttendanceMonthSummary.is_locked: True})
+    db.commit()
+    return {"locked_rows": updated}
+
+
+def is_month_closed(db: Session, year_month: str) -> bool:
+    c = models.AttendanceMonthClose
+    return db.scalar(select(c.year_month).where(c.year_month == year_month)) is not None
+
+
+def _existing_keys(db: Session, rows: list[dict]) -> set[tuple[int, datetime, str]]:
+    # 배치에 포함된 직원·시간 범위로 한 번만 조회
+    if not rows:
+        return set()
+    t = models.TimeLog
+    stmt = select(t.emp_id, t.log_datetime, t.log_type).where(
+        t.emp_id.in_({r["emp_id"] for r in rows}),
+        t.log_datetime >= min(r["log_datetime"] for r in rows),
+        t.log_datetime <= max(r["log_datetime"] for r in rows),
+    )
+    return {tuple(k) for k in db.execute(stmt)}
+
+
+def ingest_time_logs(
+    db: Session,
+    events: list,
+    source: str = "DEVICE",
+    device_id: str | None = None,
+) -> dict:
+    """Validate and insert a batch of clock events with one executemany.
+
+    Events are de-duplicated on (emp_id, log_datetime, log_type) within the batch and
+    against stored logs; ``source`` / ``device_id`` apply to events that omit them.
+    Month summaries are not touched here: ``refresh`` lists the (emp_id, year_month) keys
+    to pass to :func:`refresh_summary_batches` after the commit.
+    """
+    errors: list[dict] = []
+    candidates: list[tuple[int, dict]] = []
+    for i, raw in enumerate(events):
+        try:
+            ev = schemas.TimeLogEvent.model_validate(raw)
+        except ValidationError as e:
+            errors.append({"index": i, "reason": e.errors()[0]["msg"]})
+            continue
+        log_type = ev.log_type.upper()
+        if log_type not in LOG_TYPES:
+            errors.append({"index": i, "reason": "log_type must be IN or OUT"})
+            continue
+        candidates.append(
+            (
+                i,
+                {
+                    "emp_id": ev.emp_id,
+                    # 저장 시각은 기존 기록과 같이 naive 로 통일
+                    "log_datetime": ev.log_datetime.replace(tzinfo=None),
+                    "log_type": log_type,
+                    "source": ev.source or source,
+                    "device_id": ev.device_id or device_id,
+                    "created_at": datetime.utcnow(),
+                },
+            )
+        )
+
+    emp_ids = {r["emp_id"] for _, r in candidates}
+    known = set(
+        db.scalars(select(models.Employee.id).where(models.Employee.id.in_(emp_ids)))
+    ) if emp_ids else set()
+
+    closed = closed_months(db, {(r["emp_id"], _year_month(r["log_datetime"])) for _, r in candidates})
+
+    # 동시에 들어온 배치와 겹쳐 유니크 인덱스에 걸리면 기존 기록을 다시 읽고 한 번 재시도
+    for attempt in range(2):
+        existing = _existing_keys(db, [r for _, r in candidates])
+        seen: set[tuple[int, datetime, str]] = set()
+        rows, rejected = [], []
+        for i, r in candidates:
+            key = (r["emp_id"], r["log_datetime"], r["log_type"])
+            if r["emp_id"] not in known:
+                rejected.append({"index": i, "reason": "Employee not found"})
+            elif (r["emp_id"], _year_month(r["log_datetime"])) in closed:
+                rejected.append({"index": i, "reason": "Attendance month is closed"})
+            elif key in existing or key in seen:
+                rejected.append({"index": i, "reason": "Duplicate time log"})
+            else:
+                seen.add(key)
+                rows.append(r)
+        try:
+            if rows:
+                # 근태요약 재계산은 쓰기 트랜잭션 밖(큐 작업)에서 하므로 여기서는 기록만 저장
+                db.execute(insert(models.TimeLog), rows)
+            db.commit()
+            break
+        except IntegrityError:
+            db.rollback()
+            if attempt:
+                raise
+
+    errors = sorted(errors + rejected, key=lambda e: e["index"])
+    return {
+        "received": len(events),
+        "inserted": len(rows),
+        "rejected": len(errors),
+        "errors": errors,
+        "refresh": sorted(
+            {(r["emp_id"], ym) for r in rows for ym in months_for_punch(r["log_datetime"])}
+        ),
+    }
+
+
+# ---- 월 근태 집계 ----
+# 집계는 월 시작(1일 00:00)부터의 분 단위 실수로 계산
+DAY_MINUTES = 1440
+# 야간 시간대: 각 날짜 자정 기준 [-_NIGHT_BEFORE, +_NIGHT_AFTER)
+_NIGHT_BEFORE = DAY_MINUTES - (NIGHT_START.hour * 60 + NIGHT_START.minute)
+_NIGHT_AFTER = NIGHT_END.hour * 60 + NIGHT_END.minute
+
+
+@dataclass(frozen=True)
+class DayPlan:
+    """Planned shift in minutes from the start of the month."""
+
+    start: float
+    end: float
+    break_minutes: int
+
+    @property
+    def minutes(self) -> float:
+        return max(self.end - self.start - self.break_minutes, 0)
+
+
+@dataclass(frozen=True)
+class MonthCalendar:
+    """Days of a month (by index) with their off-day flag and default plan."""
+
+    year_month: str
+    start: datetime
+    days: int
+    off: tuple[bool, ...]
+    # 근무일의 기본 근무유형 일정 (휴일은 None)
+    default_plans: tuple[DayPlan | None, ...]
+    # 일정 없는 휴일 근무에 적용하는 기본 근무유형의 휴게시간
+    default_break: int
+
+    @property
+    def end(self) -> datetime:
+        return self.start + timedelta(days=self.days)
+
+    @property
+    def first_day(self) -> date:
+        return self.start.date()
+
+    @property
+    def last_day(self) -> date:
+        return self.first_day + timedelta(days=self.days - 1)
+
+    def minutes(self, ts: datetime) -> float:
+        return (ts - self.start).total_seconds() / 60
+
+    def day_index(self, d: date) -> int:
+        return (d - self.first_day).days
+
+
+@dataclass
+class MonthTotals:
+    planned_minutes: float = 0
+    worked_minutes: float = 0
+    overtime_minutes: float = 0
+    night_minutes: float = 0
+    holiday_minutes: float = 0
+    late_count: int = 0
+    early_leave_count: int = 0
+    absence_count: int = 0
+
+    def values(self) -> dict:
+        return {
+            "planned_hours": round(self.planned_minutes / 60, 2),
+            "worked_hours": round(self.worked_minutes / 60, 2),
+            "overtime_hours": round(self.overtime_minutes / 60, 2),
+            "night_hours": round(self.night_minutes / 60, 2),
+            "holiday_hours": round(self.holiday_minutes / 60, 2),
+            "late_count": self.late_count,
+            "early_leave_count": self.early_leave_count,
+            "absence_count": self.absence_count,
+        }
+
+
+@dataclass
+class EmployeeMonth:
+    """One employee's inputs for the month; days are indexes, times are minutes from month start.
+
+    ``punches`` are ``(minute, log_type)`` in time order, ``first_day``/``last_day`` bound the
+    employment within the month and ``plans`` override the calendar's default plan.
+    """
+
+    emp_id: int
+    first_day: int
+    last_day: int
+    punches: list[tuple[float, str]] = field(default_factory=list)
+    plans: dict[int, DayPlan] = field(default_factory=dict)
+    leave_days: set[int] = field(default_factory=set)
+
+
+def _hhmm_minutes(value: str) -> int:
+    h, m = value.split(":")
+    return int(h) * 60 + int(m)
+
+
+def load_month_calendar(db: Session, year_month: str) -> MonthCalendar:
+    y, m = int(year_month[:4]), int(year_month[4:6])
+    first = date(y, m, 1)
+    nxt = date(y + 1, 1, 1) if m == 12 else date(y, m + 1, 1)
+    n = (nxt - first).days
+
+    # 달력에 없는 날은 월~금 근무일
+    off = [(first + timedelta(days=i)).weekday() >= 5 for i in range(n)]
+    for work_date, is_workday, is_holiday in db.execute(
+        select(
+            models.WorkCalendar.work_date,
+            models.WorkCalendar.is_workday,
+            models.WorkCalendar.is_holiday,
+        ).where(models.WorkCalendar.work_date >= first, models.WorkCalendar.work_date < nxt)
+    ):
+        off[(work_date - first).days] = bool(is_holiday or not is_workday)
+
+    wt = db.execute(
+        select(models.WorkType.start_time, models.WorkType.end_time, models.WorkType.break_minutes)
+        .where(models.WorkType.code == DEFAULT_WORK_TYPE)
+    ).first()
+    start, end, brk = (
+        (_hhmm_minutes(wt[0]), _hhmm_minutes(wt[1]), wt[2] or 0) if wt else (9 * 60, 18 * 60, 60)
+    )
+    if end <= start:
+        end += DAY_MINUTES  # 야간조 (익일 종료)
+    plans = tuple(
+        None if off[i] else DayPlan(i * DAY_MINUTES + start, i * DAY_MINUTES + end, brk)
+        for i in range(n)
+    )
+    return MonthCalendar(year_month, datetime(y, m, 1), n, tuple(off), plans, brk)
+
+
+def _night_minutes(a: float, b: float) -> float:
+    total = 0.0
+    k = (a + _NIGHT_BEFORE) // DAY_MINUTES
+    while k * DAY_MINUTES - _NIGHT_BEFORE < b:
+        lo = max(a, k * DAY_MINUTES - _NIGHT_BEFORE)
+        hi = min(b, k * DAY_MINUTES + _NIGHT_AFTER)
+        if hi > lo:
+            total += hi - lo
+        k += 1
+    return total
+
+
+def summarize_employee(cal: MonthCalendar, emp: EmployeeMonth) -> MonthTotals:
+    """Reference (pure Python) month summary for one employee.
+
+    IN/OUT punches are paired in time order (an IN without OUT, or an OUT without IN, is
+    ignored) and each pair is booked on the day of its IN. Per day the scheduled work
+    type's break is deducted once; hours beyond the plan are overtime, hours on off-days
+    are holiday hours, and 22:00-06:00 is night work. A planned day without any IN is an
+    absence unless covered by approved leave.
+    """
+    sessions: dict[int, list[tuple[float, float]]] = {}
+    first_in: dict[int, float] = {}
+    opened = None
+    for m, kind in emp.punches:
+        if kind == "IN":
+            first_in.setdefault(int(m // DAY_MINUTES), m)
+            opened = m
+        elif opened is not None:
+            sessions.setdefault(int(opened // DAY_MINUTES), []).append((opened, m))
+            opened = None
+
+    t = MonthTotals()
+    grace = GRACE_MINUTES
+    for day in range(emp.first_day, emp.last_day + 1):
+        off = cal.off[day]
+        plan = emp.plans.get(day) or cal.default_plans[day]
+        pairs = sessions.get(day)
+        net = 0.0
+        if pairs:
+            gross = 0.0
+            for a, b in pairs:
+                gross += b - a
+                t.night_minutes += _night_minutes(a, b)
+            net = max(gross - (plan.break_minutes if plan else cal.default_break), 0)
+            t.worked_minutes += net
+            if off:
+                t.holiday_minutes += net
+        if plan is None:
+            continue
+        planned = plan.minutes
+        t.planned_minutes += planned
+        if day in emp.leave_days:
+            continue
+        if not off and net > planned:
+            t.overtime_minutes += net - planned
+        arrived = first_in.get(day)
+        if arrived is None:
+            t.absence_count += 1
+            continue
+        if arrived > plan.start + grace:
+            t.late_count += 1
+        if pairs and pairs[-1][1] < plan.end - grace:
+            t.early_leave_count += 1
+    return t
+
+
+class _SortedGroups:
+    """Walks rows sorted by employee id (first column) and hands out each employee's rows."""
+
+    def __init__(self, rows: Iterable):
+        self._groups = groupby(rows, key=itemgetter(0))
+        self._key, self._rows = next(self._groups, (None, ()))
+
+    def take(self, emp_id: int) -> list:
+        while self._key is not None and self._key < emp_id:
+            self._key, self._rows = next(self._groups, (None, ()))
+        if self._key != emp_id:
+            return []
+        rows = list(self._rows)
+        self._key, self._rows = next(self._groups, (None, ()))
+        return rows
+
+
+def _employees_in_month(cal: MonthCalendar, emp_ids: list[int] | None = None):
+    # 해당 월에 재직한 직원 (월중 퇴사자 포함)
+    e = models.Employee
+    stmt = select(e.id, e.hire_date, e.terminate_date).where(
+        or_(e.hire_date.is_(None), e.hire_date <= cal.last_day),
+        or_(
+            e.terminate_date >= cal.first_day,
+            and_(e.terminate_date.is_(None), e.status == "ACTIVE"),
+        ),
+    )
+    if emp_ids is not None:
+        stmt = stmt.where(e.id.in_(emp_ids))
+    return stmt
+
+
+def _month_statements(cal: MonthCalendar, employees: list, emp_ids: list[int] | None):
+    """Time log, schedule and approved-leave selects for the month, each ordered by employee."""
+    t = models.TimeLog
+    # 월말 야간조의 익일 퇴근까지 포함, 정렬은 (emp_id, log_datetime, log_type) 유니크 인덱스 순서
+    log_stmt = (
+        select(t.emp_id, t.log_datetime, t.log_type)
+        .where(t.log_datetime >= cal.start, t.log_datetime < cal.end + timedelta(days=1))
+        .order_by(t.emp_id, t.log_datetime, t.log_type)
+    )
+    ws, wt = models.WorkSchedule, models.WorkType
+    plan_stmt = (
+        select(ws.emp_id, ws.work_date, ws.planned_start, ws.planned_end, wt.break_minutes)
+        .join(wt, wt.id == ws.work_type_id)
+        .where(ws.work_date >= cal.first_day, ws.work_date <= cal.last_day)
+        .order_by(ws.emp_id, ws.work_date)
+    )
+    lr = models.LeaveRequest
+    leave_stmt = (
+        select(lr.emp_id, lr.start_datetime, lr.end_datetime)
+        .where(lr.status == "APPROVED", lr.start_datetime < cal.end, lr.end_datetime >= cal.start)
+        .order_by(lr.emp_id)
+    )
+    if emp_ids is not None:
+        return (
+            log_stmt.where(t.emp_id.in_(emp_ids)),
+            plan_stmt.where(ws.emp_id.in_(emp_ids)),
+            leave_stmt.where(lr.emp_id.in_(emp_ids)),
+        )
+    # 직원 id 범위 조건으로 (emp_id, ...) 인덱스 순서 스캔을 유도 (정렬 단계 없음)
+    lo, hi = employees[0][0], employees[-1][0]
+    return (
+        log_stmt.where(t.emp_id.between(lo, hi)),
+        plan_stmt.where(ws.emp_id.between(lo, hi)),
+        leave_stmt.where(lr.emp_id.between(lo, hi)),
+    )
+
+
+def _employed_days(cal: MonthCalendar, hired: date | None, terminated: date | None) -> tuple[int, int]:
+    last = cal.days - 1
+    return (
+        max(cal.day_index(hired), 0) if hired else 0,
+        min(cal.day_index(terminated), last) if terminated else last,
+    )
+
+
+def iter_employee_months(
+    db: Session, cal: MonthCalendar, emp_ids: list[int] | None = None
+) -> Iterable[EmployeeMonth]:
+    """Merge the employee list with time logs, schedules and approved leave in one ordered pass.
+
+    Feeds the reference ``summarize_employee``; aggregation itself uses the columnar loader in
+    ``attendance_kernel``.
+    """
+    # ORM 객체 없이 Core 행으로 스트리밍
+    conn = db.connection()
+    employees = conn.execute(_employees_in_month(cal, emp_ids).order_by(models.Employee.id)).all()
+    if not employees:
+        return
+    log_stmt, plan_stmt, leave_stmt = _month_statements(cal, employees, emp_ids)
+    logs, plans, leaves = (
+        _SortedGroups(conn.execute(stmt.execution_options(yield_per=STREAM_BATCH_SIZE)))
+        for stmt in (log_stmt, plan_stmt, leave_stmt)
+    )
+    start, last = cal.start, cal.days - 1
+    for emp_id, hired, terminated in employees:
+        first_day, last_day = _employed_days(cal, hired, terminated)
+        emp = EmployeeMonth(
+            emp_id=emp_id,
+            first_day=first_day,
+            last_day=last_day,
+            punches=[((ts - start).total_seconds() / 60, kind) for _, ts, kind in logs.take(emp_id)],
+        )
+        for _, work_date, p_start, p_end, brk in plans.take(emp_id):
+            emp.plans[cal.day_index(work_date)] = DayPlan(cal.minutes(p_start), cal.minutes(p_end), brk or 0)
+        for _, l_start, l_end in leaves.take(emp_id):
+            lo = max(cal.day_index(l_start.date()), 0)
+            hi = min(cal.day_index(l_end.date()), last)
+            emp.leave_days.update(range(lo, hi + 1))
+        yield emp
+
+
+def _write_months(
+    db: Session,
+    year_month: str,
+    emp_ids: list[int] | None = None,
+    batch_size: int = AGGREGATE_BATCH_SIZE,
+    progress: Callable[[int], None] | None = None,
+    commit_batches: bool = False,
+) -> dict[str, int]:
+    report = progress or (lambda pct: None)
+    s = models.AttendanceMonthSummary
+    existing_stmt = select(s.emp_id, s.id, s.is_locked).where(s.year_month == year_month)
+    if emp_ids is not None:
+        existing_stmt = existing_stmt.where(s.emp_id.in_(emp_ids))
+    existing = {emp_id: (sid, locked) for emp_id, sid, locked in db.execute(existing_stmt)}
+
+    inserts: list[dict] = []
+    updates: list[dict] = []
+    counts = {"created": 0, "updated": 0, "locked": 0}
+    # 마감된 월은 요약 행이 없는 직원도 새로 만들지 않음
+    if is_month_closed(db, year_month):
+        counts["locked"] = len(existing)
+        return counts
+    cal = load_month_calendar(db, year_month)
+
+    def flush() -> None:
+        if inserts:
+            db.execute(insert(s), inserts)
+        if updates:
+            db.execute(update(s), updates)
+        counts["created"] += len(inserts)
+        counts["updated"] += len(updates)
+        inserts.clear()
+        updates.clear()
+        if commit_batches:
+            # 배치마다 커밋해 SQLite 쓰기 잠금을 풀어 둠 (진행률 기록, 다른 쓰기 요청이 사이에 진행)
+            db.commit()
+
+    from . import attendance_kernel
+
+    report(10)
+    # 월 전체 입력을 열 단위 배열로 읽어 전 직원을 한 번에 계산
+    arrays = attendance_kernel.load_month_arrays(db, cal, emp_ids)
+    report(40)
+    totals = attendance_kernel.summarize_month(cal, arrays)
+    total = len(arrays) or 1
+    report(50)
+    for n, (emp_id, values) in enumerate(attendance_kernel.iter_values(arrays, totals), 1):
+        sid, locked = existing.get(emp_id, (None, False))
+        if locked:
+            counts["locked"] += 1
+            continue
+        if sid is None:
+            inserts.append({"emp_id": emp_id, "year_month": year_month, **values})
+        else:
+            updates.append({"id": sid, **values})
+        if len(inserts) + len(updates) >= batch_size:
+            flush()
+            report(50 + min(40, 40 * n // total))
+    flush()
+    return counts
+
+
+def aggregate_month(
+    db: Session,
+    year_month: str,
+    emp_ids: list[int] | None = None,
+    batch_size: int = AGGREGATE_BATCH_SIZE,
+    progress: Callable[[int], None] | None = None,
+) -> dict[str, int]:
+    """Build AttendanceMonthSummary rows from time logs; locked (closed) months are left untouched.
+
+    Each batch is committed before progress is reported, so a cancelled or failed run keeps
+    the batches written so far (each a complete summary); running it again finishes the month.
+    """
+    counts = _write_months(db, year_month, emp_ids, batch_size, progress, commit_batches=True)
+    db.commit()
+    return counts
+
+
+# ---- 출퇴근 기록 시 증분 반영 ----
+def _year_month(d: date) -> str:
+    return f"{d.year:04d}{d.month:02d}"
+
+
+def months_for_punch(ts: datetime) -> list[str]:
+    """Months whose summary a punch at ``ts`` can change."""
+    months = [_year_month(ts)]
+    # 1일 기록은 전월 말일 야간조의 퇴근일 수 있음
+    if ts.day == 1:
+        months.append(_year_month(ts.date() - timedelta(days=1)))
+    return months
+
+
+def months_between(start: datetime, end: datetime) -> list[str]:
+    months = []
+    d = date(start.year, start.month, 1)
+    while d <= end.date():
+        months.append(_year_month(d))
+        d = date(d.year + 1, 1, 1) if d.month == 12 else date(d.year, d.month + 1, 1)
+    return months
+
+
+def closed_months(db: Session, keys: Iterable[tuple[int, str]]) -> set[tuple[int, str]]:
+    """Subset of (emp_id, year_month) in a closed month or whose summary is locked."""
+    keys = set(keys)
+    if not keys:
+        return set()
+    c = models.AttendanceMonthClose
+    months = set(db.scalars(select(c.year_month).where(c.year_month.in_({k[1] for k in keys}))))
+    closed = {k for k in keys if k[1] in months}
+    s = models.AttendanceMonthSummary
+    rows = db.execute(
+        select(s.emp_id, s.year_month).where(
+            s.is_locked == True,  # noqa: E712
+            s.emp_id.in_({k[0] for k in keys}),
+            s.year_month.in_({k[1] for k in keys}),
+        )
+    )
+    return closed | ({tuple(r) for r in rows} & keys)
+
+
+def refresh_summaries(db: Session, keys: Iterable[tuple[int, str]]) -> dict[str, int]:
+    """Re-derive the given (emp_id, year_month) summaries inside the caller's transaction.
+
+    Only the listed employees' rows are read (about one month of punches each), so this runs
+    on every time-log write; locked rows are skipped. The caller must flush its changes first.
+    """
+    by_month: dict[str, set[int]] = {}
+    for emp_id, ym in keys:
+        by_month.setdefault(ym, set()).add(emp_id)
+    counts = {"created": 0, "updated": 0, "locked": 0}
+    for ym, ids in sorted(by_month.items()):
+        for k, v in _write_months(db, ym, sorted(ids)).items():
+            counts[k] += v
+    return counts
+
+
+def refresh_summary_batches(
+    db: Session,
+    keys: Iterable[tuple[int, str]],
+    batch_size: int = AGGREGATE_BATCH_SIZE,
+    progress: Callable[[int], None] | None = None,
+) -> dict[str, int]:
+    """Refresh the given summaries after a bulk ingest, committing each batch of employees.
+
+    Runs outside the ingest transaction (as a queued job), so the writer is held for one
+    batch at a time; a batch that races another refresh is re-read and retried once.
+    """
+    report = progress or (lambda pct: None)
+    by_month: dict[str, set[int]] = {}
+    for emp_id, ym in keys:
+        by_month.setdefault(ym, set()).add(emp_id)
+    chunks = [
+        (ym, ids[i : i + batch_size])
+        for ym, ids in ((ym, sorted(ids)) for ym, ids in sorted(by_month.items()))
+        for i in range(0, len(ids), batch_size)
+    ]
+    counts = {"created": 0, "updated": 0, "locked": 0}
+    for n, (ym, ids) in enumerate(chunks, 1):
+        for attempt in range(2):
+            try:
+                written = _write_months(db, ym, ids, batch_size)
+                db.commit()
+                break
+            except IntegrityError:
+                # 단건 등록 등이 같은 직원-월 요약을 먼저 만든 경우 기존 행을 다시 읽어 갱신
+                db.rollback()
+                if attempt:
+                    raise
+        for k, v in written.items():
+            counts[k] += v
+        report(100 * n // len(chunks))
+    return counts
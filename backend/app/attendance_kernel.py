@@ -0,0 +1,257 @@
+"""Vectorized (NumPy) month attendance computation.
+
+Produces the same totals as the reference ``attendance.summarize_employee`` for every
+employee of a month at once. Punches, schedules and leave are loaded as flat columns,
+punch pairing and the night window are array expressions over the punches, and breaks,
+overtime, holiday work and late/early/absence checks are evaluated on an
+employee x day grid seeded from the ``WorkCalendar`` flags.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from . import models
+from .attendance import (
+    _NIGHT_AFTER,
+    _NIGHT_BEFORE,
+    DAY_MINUTES,
+    GRACE_MINUTES,
+    STREAM_BATCH_SIZE,
+    EmployeeMonth,
+    MonthCalendar,
+    _employed_days,
+    _employees_in_month,
+    _month_statements,
+)
+
+
+@dataclass
+class MonthArrays:
+    """Columnar month inputs; ``*_emp`` columns index into ``emp_ids`` (ascending)."""
+
+    emp_ids: np.ndarray
+    first_day: np.ndarray
+    last_day: np.ndarray
+    # 출퇴근 기록: 직원, 시각 순 정렬
+    punch_emp: np.ndarray
+    punch_minute: np.ndarray
+    punch_in: np.ndarray
+    # 직원별 근무일정 (기본 근무유형 대신 적용)
+    plan_emp: np.ndarray
+    plan_day: np.ndarray
+    plan_start: np.ndarray
+    plan_end: np.ndarray
+    plan_break: np.ndarray
+    # 승인 휴가: 일자 범위 [leave_lo, leave_hi]
+    leave_emp: np.ndarray
+    leave_lo: np.ndarray
+    leave_hi: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.emp_ids)
+
+
+def _ints(values) -> np.ndarray:
+    return np.fromiter(values, dtype=np.int64)
+
+
+def _floats(values) -> np.ndarray:
+    return np.fromiter(values, dtype=np.float64)
+
+
+def from_employee_months(cal: MonthCalendar, months: list[EmployeeMonth]) -> MonthArrays:
+    """Columnar form of the reference loader's output (used for parity checks and benchmarks)."""
+    months = sorted(months, key=lambda m: m.emp_id)
+    punches = [(i, m, kind == "IN") for i, emp in enumerate(months) for m, kind in emp.punches]
+    plans = [
+        (i, day, p.start, p.end, p.break_minutes)
+        for i, emp in enumerate(months)
+        for day, p in sorted(emp.plans.items())
+    ]
+    leaves = [(i, day) for i, emp in enumerate(months) for day in sorted(emp.leave_days)]
+    p_emp, p_min, p_in = zip(*punches) if punches else ((), (), ())
+    s_emp, s_day, s_start, s_end, s_brk = zip(*plans) if plans else ((), (), (), (), ())
+    l_emp, l_day = zip(*leaves) if leaves else ((), ())
+    return MonthArrays(
+        emp_ids=_ints(emp.emp_id for emp in months),
+        first_day=_ints(emp.first_day for emp in months),
+        last_day=_ints(emp.last_day for emp in months),
+        punch_emp=_ints(p_emp),
+        punch_minute=_floats(p_min),
+        punch_in=np.fromiter(p_in, dtype=bool),
+        plan_emp=_ints(s_emp),
+        plan_day=_ints(s_day),
+        plan_start=_floats(s_start),
+        plan_end=_floats(s_end),
+        plan_break=_floats(s_brk),
+        leave_emp=_ints(l_emp),
+        leave_lo=_ints(l_day),
+        leave_hi=_ints(l_day),
+    )
+
+
+def _rows(conn, stmt):
+    return conn.execute(stmt.execution_options(yield_per=STREAM_BATCH_SIZE))
+
+
+def load_month_arrays(db: Session, cal: MonthCalendar, emp_ids: list[int] | None = None) -> MonthArrays:
+    """Stream the month's inputs straight into columns (same statements as the reference loader)."""
+    conn = db.connection()
+    employees = conn.execute(_employees_in_month(cal, emp_ids).order_by(models.Employee.id)).all()
+    days = [_employed_days(cal, hired, terminated) for _, hired, terminated in employees]
+    ids = _ints(row[0] for row in employees)
+    start, last = cal.start, cal.days - 1
+    # 행을 바로 풀어 열 목록에 담음 (Row 를 zip(*rows) 로 전치하는 것보다 빠름)
+    p_emp, p_min, p_in = [], [], []
+    s_emp, s_day, s_start, s_end, s_brk = [], [], [], [], []
+    l_emp, l_lo, l_hi = [], [], []
+    if employees:
+        log_stmt, plan_stmt, leave_stmt = _month_statements(cal, employees, emp_ids)
+        for emp_id, ts, kind in _rows(conn, log_stmt):
+            p_emp.append(emp_id)
+            p_min.append((ts - start).total_seconds() / 60)
+            p_in.append(kind == "IN")
+        for emp_id, work_date, planned_start, planned_end, brk in _rows(conn, plan_stmt):
+            s_emp.append(emp_id)
+            s_day.append(cal.day_index(work_date))
+            s_start.append(cal.minutes(planned_start))
+            s_end.append(cal.minutes(planned_end))
+            s_brk.append(brk or 0)
+        for emp_id, l_start, l_end in _rows(conn, leave_stmt):
+            l_emp.append(emp_id)
+            l_lo.append(max(cal.day_index(l_start.date()), 0))
+            l_hi.append(min(cal.day_index(l_end.date()), last))
+
+    def index(emp_col: list) -> tuple[np.ndarray, np.ndarray]:
+        # id 범위 조회에는 해당 월 재직자가 아닌 직원의 행도 섞일 수 있어 걸러냄
+        emp = np.array(emp_col, dtype=np.int64)
+        if not ids.size:
+            return emp, np.zeros(len(emp), dtype=bool)
+        idx = np.minimum(np.searchsorted(ids, emp), len(ids) - 1)
+        return idx, ids[idx] == emp
+
+    p_idx, p_keep = index(p_emp)
+    s_idx, s_keep = index(s_emp)
+    l_idx, l_keep = index(l_emp)
+    return MonthArrays(
+        emp_ids=ids,
+        first_day=_ints(d[0] for d in days),
+        last_day=_ints(d[1] for d in days),
+        punch_emp=p_idx[p_keep],
+        punch_minute=np.array(p_min, dtype=np.float64)[p_keep],
+        punch_in=np.array(p_in, dtype=bool)[p_keep],
+        plan_emp=s_idx[s_keep],
+        plan_day=np.array(s_day, dtype=np.int64)[s_keep],
+        plan_start=np.array(s_start, dtype=np.float64)[s_keep],
+        plan_end=np.array(s_end, dtype=np.float64)[s_keep],
+        plan_break=np.array(s_brk, dtype=np.float64)[s_keep],
+        leave_emp=l_idx[l_keep],
+        leave_lo=np.array(l_lo, dtype=np.int64)[l_keep],
+        leave_hi=np.array(l_hi, dtype=np.int64)[l_keep],
+    )
+
+
+def _night_before(t: np.ndarray) -> np.ndarray:
+    # 월 시작부터 t 까지 누적된 야간(22:00-06:00) 분: 구간 [a, b) 의 야간 분 = N(b) - N(a)
+    width = _NIGHT_BEFORE + _NIGHT_AFTER
+    shifted = t + _NIGHT_BEFORE
+    k = np.floor_divide(shifted, DAY_MINUTES)
+    return k * width + np.minimum(shifted - k * DAY_MINUTES, width)
+
+
+def _runs(keys: np.ndarray) -> np.ndarray:
+    # 정렬된 키에서 같은 값이 시작되는 위치
+    return np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if keys.size else keys
+
+
+def summarize_month(cal: MonthCalendar, a: MonthArrays, grace: int = GRACE_MINUTES) -> dict[str, np.ndarray]:
+    """Month totals per employee (aligned with ``a.emp_ids``), keyed like ``MonthTotals`` fields."""
+    n, days = len(a), cal.days
+    cells = n * days
+    day = np.arange(days)
+
+    # 일자 격자: 기본 근무유형 일정 위에 직원별 일정을 덮어씀
+    off = np.array(cal.off, dtype=bool)
+    default = [(p.start, p.end, p.break_minutes) if p else (np.nan, np.nan, 0) for p in cal.default_plans]
+    d_start, d_end, d_break = (np.array(c, dtype=np.float64) for c in zip(*default))
+    has_plan = np.tile(~off, (n, 1))
+    plan_start = np.tile(d_start, (n, 1))
+    plan_end = np.tile(d_end, (n, 1))
+    plan_break = np.tile(d_break, (n, 1))
+    has_plan[a.plan_emp, a.plan_day] = True
+    plan_start[a.plan_emp, a.plan_day] = a.plan_start
+    plan_end[a.plan_emp, a.plan_day] = a.plan_end
+    plan_break[a.plan_emp, a.plan_day] = a.plan_break
+
+    employed = (day >= a.first_day[:, None]) & (day <= a.last_day[:, None])
+    leave = np.zeros((n, days), dtype=bool)
+    spans = np.maximum(a.leave_hi - a.leave_lo + 1, 0)
+    if spans.sum():
+        # 휴가 기간을 (직원, 일자) 칸으로 펼침
+        offsets = np.arange(spans.sum()) - np.repeat(np.cumsum(spans) - spans, spans)
+        leave[np.repeat(a.leave_emp, spans), np.repeat(a.leave_lo, spans) + offsets] = True
+
+    # 짝짓기: 같은 직원의 IN 바로 다음 OUT 이 한 근무 구간 (연속 IN 은 마지막 IN 기준)
+    emp, minute, is_in = a.punch_emp, a.punch_minute, a.punch_in
+    pair = (emp[1:] == emp[:-1]) & is_in[:-1] & ~is_in[1:]
+    s_emp, s_in, s_out = emp[1:][pair], minute[:-1][pair], minute[1:][pair]
+    s_day = np.floor_divide(s_in, DAY_MINUTES).astype(np.int64)
+    ok = (s_day >= 0) & (s_day < days)
+    s_emp, s_in, s_out, s_day = s_emp[ok], s_in[ok], s_out[ok], s_day[ok]
+    ok = employed[s_emp, s_day]
+    s_emp, s_in, s_out, s_day = s_emp[ok], s_in[ok], s_out[ok], s_day[ok]
+    s_cell = s_emp * days + s_day
+
+    gross = np.bincount(s_cell, weights=s_out - s_in, minlength=cells).reshape(n, days)
+    has_session = (np.bincount(s_cell, minlength=cells) > 0).reshape(n, days)
+    last_out = np.full(cells, -np.inf)
+    runs = _runs(s_cell)
+    if runs.size:
+        last_out[s_cell[runs]] = np.maximum.reduceat(s_out, runs)
+    last_out = last_out.reshape(n, days)
+    night = np.bincount(s_emp, weights=_night_before(s_out) - _night_before(s_in), minlength=n)
+
+    # 일자별 첫 출근 시각
+    in_emp, in_min = emp[is_in], minute[is_in]
+    in_day = np.floor_divide(in_min, DAY_MINUTES).astype(np.int64)
+    ok = (in_day >= 0) & (in_day < days)
+    in_cell = in_emp[ok] * days + in_day[ok]
+    in_min = in_min[ok]
+    first_in = np.full(cells, np.nan)
+    runs = _runs(in_cell)
+    first_in[in_cell[runs]] = in_min[runs]
+    first_in = first_in.reshape(n, days)
+    has_in = ~np.isnan(first_in)
+
+    brk = np.where(has_plan, plan_break, cal.default_break)
+    net = np.where(has_session, np.maximum(gross - brk, 0), 0)
+    planned = np.where(has_plan & employed, np.maximum(plan_end - plan_start - plan_break, 0), 0)
+    checked = has_plan & employed & ~leave
+    arrived = checked & has_in
+    with np.errstate(invalid="ignore"):
+        late = arrived & (first_in > plan_start + grace)
+        early = arrived & has_session & (last_out < plan_end - grace)
+    return {
+        "planned_minutes": planned.sum(axis=1),
+        "worked_minutes": net.sum(axis=1),
+        "overtime_minutes": np.where(checked & ~off, np.maximum(net - planned, 0), 0).sum(axis=1),
+        "night_minutes": night,
+        "holiday_minutes": np.where(off, net, 0).sum(axis=1),
+        "late_count": late.sum(axis=1),
+        "early_leave_count": early.sum(axis=1),
+        "absence_count": (checked & ~has_in).sum(axis=1),
+    }
+
+
+def iter_values(a: MonthArrays, totals: dict[str, np.ndarray]):
+    """``(emp_id, AttendanceMonthSummary values)`` per employee, rounded like ``MonthTotals.values``."""
+    hours = [
+        ([round(m / 60, 2) for m in totals[f"{k}_minutes"].tolist()], f"{k}_hours")
+        for k in ("planned", "worked", "overtime", "night", "holiday")
+    ]
+    counts = [(totals[k].tolist(), k) for k in ("late_count", "early_leave_count", "absence_count")]
+    columns = hours + counts
+    for i, emp_id in enumerate(a.emp_ids.tolist()):
+        yield emp_id, {key: col[i] for col, key in columns}
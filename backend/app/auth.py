@@ -1,3 +1,7 @@
+import os
+import threading
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 
 import bcrypt
@@ -5,10 +9,10 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
 
+from sqlalchemy import event, inspect, select
 from sqlalchemy.orm import Session
 
-from . import models
-from .database import get_db
+from . import database, models
 
 SECRET_KEY = "jscorp-hr-secret-key-change-in-production"
 ALGORITHM = "HS256"
@@ -16,6 +20,9 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7
 
 security = HTTPBearer(auto_error=False)
 
+# 토큰 subject 별 인증 주체 캐시 유지 시간(초). 변경은 같은 프로세스에서는 즉시, 다른 워커에는 TTL 내 반영
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "30"))
+
 _BCRYPT_MAX_BYTES = 72
 
 
@@ -54,10 +61,63 @@ def decode_token(token: str) -> str | None:
         return None
 
 
-def get_current_user(
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """Authenticated caller: the user row plus its linked employee (if any)."""
+
+    id: int
+    username: str
+    role: str
+    is_active: bool
+    email: str | None
+    email_verified: bool
+    emp_id: int | None
+    dept_id: int | None
+
+
+_principals: dict[str, tuple[float, Principal]] = {}
+_principals_lock = threading.Lock()
+
+
+def invalidate_principal(username: str | None = None) -> None:
+    """Drop one cached principal, or all of them when ``username`` is None."""
+    with _principals_lock:
+        if username is None:
+            _principals.clear()
+        else:
+            _principals.pop(username, None)
+
+
+async def _load_principal(username: str) -> Principal | None:
+    # 사용자 + 연결된 직원을 한 번에 조회, 조회하는 동안만 연결을 점유
+    async with database.AsyncReadSessionLocal() as db:
+        row = (
+            await db.execute(
+                select(models.User, models.Employee.id, models.Employee.dept_id)
+                .outerjoin(models.Employee, models.Employee.user_id == models.User.id)
+                .where(models.User.username == username)
+                .order_by(models.Employee.id)
+                .limit(1)
+            )
+        ).first()
+    if row is None:
+        return None
+    user, emp_id, dept_id = row
+    return Principal(
+        id=user.id,
+        username=user.username,
+        role=user.role,
+        is_active=bool(user.is_active),
+        email=user.email,
+        email_verified=bool(user.email_verified),
+        emp_id=emp_id,
+        dept_id=dept_id,
+    )
+
+
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials | None = Depends(security),
-    db: Session = Depends(get_db),
-) -> models.User:
+) -> Principal:
     if not credentials:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -71,19 +131,69 @@ def get_current_user(
             detail="Invalid or expired token",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    user = db.query(models.User).filter(models.User.username == username).first()
-    if not user or not user.is_active:
+    now = time.monotonic()
+    cached = _principals.get(username)
+    if cached and cached[0] > now:
+        return cached[1]
+    principal = await _load_principal(username)
+    if not principal or not principal.is_active:
+        invalidate_principal(username)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found or inactive",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    return user
+    if PRINCIPAL_CACHE_TTL_SECONDS > 0:
+        with _principals_lock:
+            _principals[username] = (now + PRINCIPAL_CACHE_TTL_SECONDS, principal)
+    return principal
+
+
+# ---- 인증 주체 캐시 무효화 ----
+# 역할/활성 여부/사용자명 변경, 직원-계정 연결 및 부서 변경이 커밋되면 캐시에서 제거
+_PRINCIPAL_USER_FIELDS = ("username", "role", "is_active", "email", "email_verified")
+_PRINCIPAL_EMPLOYEE_FIELDS = ("user_id", "dept_id")
+_ALL = "*"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_stale_principals(session: Session, flush_context) -> None:
+    stale = session.info.setdefault("stale_principals", set())
+    for obj in session.dirty | session.deleted:
+        if isinstance(obj, models.User):
+            state = inspect(obj)
+            changed = obj in session.deleted or any(
+                state.attrs[f].history.has_changes() for f in _PRINCIPAL_USER_FIELDS
+            )
+            if changed:
+                stale.add(obj.username)
+                stale.update(state.attrs.username.history.deleted or ())
+        elif isinstance(obj, models.Employee):
+            state = inspect(obj)
+            if obj in session.deleted or any(
+                state.attrs[f].history.has_changes() for f in _PRINCIPAL_EMPLOYEE_FIELDS
+            ):
+                stale.add(_ALL)
+    for obj in session.new:
+        if isinstance(obj, models.Employee) and obj.user_id is not None:
+            stale.add(_ALL)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_stale_principals(session: Session) -> None:
+    stale = session.info.pop("stale_principals", None)
+    if not stale:
+        return
+    if _ALL in stale:
+        invalidate_principal()
+    else:
+        for username in stale:
+            invalidate_principal(username)
 
 
 def get_current_admin(
-    current_user: models.User = Depends(get_current_user),
-) -> models.User:
+    current_user: Principal = Depends(get_current_user),
+) -> Principal:
     if getattr(current_user, "role", None) != "ADMIN":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -97,7 +207,7 @@ def require_roles(*allowed_roles: str):
     FastAPI dependency factory for simple role-based access control.
     """
 
-    def _dep(current_user: models.User = Depends(get_current_user)) -> models.User:
+    def _dep(current_user: Principal = Depends(get_current_user)) -> Principal:
         if getattr(current_user, "role", None) not in allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
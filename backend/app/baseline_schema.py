@@ -0,0 +1,466 @@
+"""Schema created by migration 1, frozen as the models stood before versioned migrations.
+
+Do not change these tables to follow ``models``: a fresh database and an upgraded one must
+take the same path, so every later schema change is its own migration in ``migrations``.
+"""
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    DECIMAL,
+    ForeignKey,
+    Integer,
+    MetaData,
+    String,
+    Table,
+)
+
+metadata = MetaData()
+
+Table(
+    "users",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("username", String(50), nullable=False, unique=True, index=True),
+    Column("password_hash", String(255), nullable=False),
+    Column("email", String(255), index=True),
+    Column("email_verified", Boolean, nullable=False),
+    Column("role", String(50), nullable=False),
+    Column("reset_token", String(255), index=True),
+    Column("reset_token_expires", DateTime),
+    Column("verification_token", String(255), index=True),
+    Column("is_active", Boolean, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+Table(
+    "departments",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("code", String(20), nullable=False, unique=True, index=True),
+    Column("name", String(100), nullable=False),
+    Column("parent_id", Integer, ForeignKey("departments.id")),
+    Column("effective_from", Date, nullable=False),
+    Column("effective_to", Date),
+    Column("headcount_limit", Integer),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+Table(
+    "employees",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("emp_no", String(20), nullable=False, unique=True, index=True),
+    Column("first_name", String(50), nullable=False),
+    Column("last_name", String(50), nullable=False),
+    Column("email", String(100), nullable=False, unique=True),
+    Column("phone", String(30)),
+    Column("hire_date", Date, nullable=False),
+    Column("terminate_date", Date),
+    Column("status", String(20), nullable=False),
+    Column("dept_id", Integer, ForeignKey("departments.id")),
+    Column("pay_group_id", Integer, ForeignKey("pay_groups.id")),
+    Column("user_id", Integer, ForeignKey("users.id"), index=True),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+Table(
+    "employee_job_histories",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("emp_id", Integer, ForeignKey("employees.id"), nullable=False),
+    Column("from_dept_id", Integer),
+    Column("to_dept_id", Integer),
+    Column("change_date", Date, nullable=False),
+    Column("reason", String(255)),
+    Column("created_at", DateTime, nullable=False),
+)
+
+Table(
+    "employee_status_histories",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("emp_id", Integer, ForeignKey("employees.id"), nullable=False),
+    Column("from_status", String(20)),
+    Column("to_status", String(20), nullable=False),
+    Column("change_date", Date, nullable=False),
+    Column("reason", String(255)),
+    Column("created_at", DateTime, nullable=False),
+)
+
+Table(
+    "work_calendars",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("work_date", Date, nullable=False, unique=True, index=True),
+    Column("is_workday", Boolean, nullable=False),
+    Column("is_holiday", Boolean, nullable=False),
+    Column("holiday_code", String(20)),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+Table(
+    "work_types",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("code", String(20), nullable=False, unique=True),
+    Column("name", String(100), nullable=False),
+    Column("start_time", String(5), nullable=False),
+    Column("end_time", String(5), nullable=False),
+    Column("break_minutes", Integer, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+Table(
+    "work_schedules",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("emp_id", Integer, ForeignKey("employees.id"), nullable=False),
+    Column("work_date", Date, nullable=False),
+    Column("work_type_id", Integer, ForeignKey("work_types.id"), nullable=False),
+    Column("planned_start", DateTime, nullable=False),
+    Column("planned_end", DateTime, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+Table(
+    "time_logs",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("emp_id", Integer, ForeignKey("employees.id"), nullable=False),
+    Column("log_datetime", DateTime, nullable=False),
+    Column("log_type", String(10), nullable=False),
+    Column("source", String(20), nullable=False),
+    Column("device_id", String(50)),
+    Column("created_at", DateTime, nullable=False),
+)
+
+Table(
+    "leave_requests",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("emp_id", Integer, ForeignKey("employees.id"), nullable=False),
+    Column("leave_type", String(20), nullable=False),
+    Column("start_datetime", DateTime, nullable=False),
+    Column("end_datetime", DateTime, nullable=False),
+    Column("hours", DECIMAL(5, 2), nullable=False),
+    Column("status", String(20), nullable=False),
+    Column("approver_emp_id", Integer, ForeignKey("employees.id")),
+    Column("approved_at", DateTime),
+    Column("reason", String(255)),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+Table(
+    "leave_balances",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("emp_id", Integer, ForeignKey("employees.id"), nullable=False),
+    Column("year", Integer, nullable=False),
+    Column("entitled_days", DECIMAL(5, 2), nullable=False),
+    Column("used_days", DECIMAL(5, 2), nullable=False),
+    Column("remaining_days", DECIMAL(5, 2), nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+Table(
+    "attendance_month_summaries",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("emp_id", Integer, ForeignKey("employees.id"), nullable=False),
+    Column("year_month", String(6), nullable=False, index=True),
+    Column("planned_hours", DECIMAL(7, 2), nullable=False),
+    Column("worked_hours", DECIMAL(7, 2), nullable=False),
+    Column("overtime_hours", DECIMAL(7, 2), nullable=False),
+    Column("night_hours", DECIMAL(7, 2), nullable=False),
+    Column("holiday_hours", DECIMAL(7, 2), nullable=False),
+    Column("late_count", Integer, nullable=False),
+    Column("early_leave_count", Integer, nullable=False),
+    Column("absence_count", Integer, nullable=False),
+    Column("is_locked", Boolean, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+Table(
+    "pay_groups",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("code", String(20), nullable=False, unique=True),
+    Column("name", String(100), nullable=False),
+    Column("pay_cycle", String(20), nullable=False),
+    Column("cutoff_day", Integer, nullable=False),
+    Column("pay_day", Integer, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+Table(
+    "pay_items",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("code", String(20), nullable=False, unique=True),
+    Column("name", String(100), nullable=False),
+    Column("item_type", String(20), nullable=False),
+    Column("taxable", Boolean, nullable=False),
+    Column("calculation_type", String(20), nullable=False),
+    Column("default_amount", DECIMAL(15, 2)),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+Table(
+    "pay_runs",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("pay_group_id", Integer, ForeignKey("pay_groups.id"), nullable=False),
+    Column("year_month", String(6), nullable=False, index=True),
+    Column("run_type", String(20), nullable=False),
+    Column("status", String(20), nullable=False),
+    Column("calculated_at", DateTime),
+    Column("paid_at", DateTime),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+Table(
+    "pay_results",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("pay_run_id", Integer, ForeignKey("pay_runs.id"), nullable=False),
+    Column("emp_id", Integer, ForeignKey("employees.id"), nullable=False),
+    Column("gross_amount", DECIMAL(15, 2), nullable=False),
+    Column("deduct_amount", DECIMAL(15, 2), nullable=False),
+    Column("net_amount", DECIMAL(15, 2), nullable=False),
+    Column("currency", String(10), nullable=False),
+    Column("status", String(20), nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+Table(
+    "pay_result_items",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("pay_result_id", Integer, ForeignKey("pay_results.id"), nullable=False),
+    Column("pay_item_id", Integer, ForeignKey("pay_items.id"), nullable=False),
+    Column("amount", DECIMAL(15, 2), nullable=False),
+    Column("quantity", DECIMAL(10, 2), nullable=False),
+    Column("rate", DECIMAL(10, 4)),
+    Column("memo", String(255)),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+Table(
+    "permission_requests",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("requester_user_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("target_user_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("requested_role", String(50), nullable=False),
+    Column("status", String(20), nullable=False),
+    Column("reason", String(255)),
+    Column("created_at", DateTime, nullable=False),
+    Column("decided_at", DateTime),
+    Column("decided_by_user_id", Integer, ForeignKey("users.id")),
+)
+
+Table(
+    "evaluation_plans",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String(100), nullable=False),
+    Column("year", Integer, nullable=False),
+    Column("status", String(20), nullable=False),
+    Column("start_date", Date),
+    Column("end_date", Date),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+Table(
+    "evaluation_items",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("plan_id", Integer, ForeignKey("evaluation_plans.id"), nullable=False),
+    Column("name", String(100), nullable=False),
+    Column("weight", DECIMAL(5, 2), nullable=False),
+    Column("category", String(20)),
+)
+
+Table(
+    "evaluation_results",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("plan_id", Integer, ForeignKey("evaluation_plans.id"), nullable=False),
+    Column("emp_id", Integer, ForeignKey("employees.id"), nullable=False),
+    Column("evaluator_emp_id", Integer, ForeignKey("employees.id")),
+    Column("score", DECIMAL(5, 2), nullable=False),
+    Column("comment", String(255)),
+    Column("grade", String(10)),
+    Column("is_promotion_candidate", Boolean, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+Table(
+    "evaluation_scores",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("result_id", Integer, ForeignKey("evaluation_results.id"), nullable=False),
+    Column("item_id", Integer, ForeignKey("evaluation_items.id"), nullable=False),
+    Column("score", DECIMAL(5, 2), nullable=False),
+    Column("comment", String(255)),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+Table(
+    "evaluation_targets",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("plan_id", Integer, ForeignKey("evaluation_plans.id"), nullable=False),
+    Column("emp_id", Integer, ForeignKey("employees.id"), nullable=False),
+    Column("status", String(20), nullable=False),
+)
+
+Table(
+    "evaluation_evaluators",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("target_id", Integer, ForeignKey("evaluation_targets.id"), nullable=False),
+    Column("evaluator_emp_id", Integer, ForeignKey("employees.id"), nullable=False),
+    Column("relation", String(20), nullable=False),
+    Column("status", String(20), nullable=False),
+)
+
+Table(
+    "grade_policies",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("plan_id", Integer, ForeignKey("evaluation_plans.id"), nullable=False),
+    Column("min_score", DECIMAL(5, 2), nullable=False),
+    Column("max_score", DECIMAL(5, 2), nullable=False),
+    Column("grade", String(10), nullable=False),
+    Column("is_promotion_candidate", Boolean, nullable=False),
+)
+
+Table(
+    "training_courses",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("code", String(50), nullable=False, unique=True, index=True),
+    Column("name", String(100), nullable=False),
+    Column("category", String(50)),
+    Column("is_active", Boolean, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+Table(
+    "training_sessions",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("course_id", Integer, ForeignKey("training_courses.id"), nullable=False),
+    Column("title", String(100), nullable=False),
+    Column("start_date", Date),
+    Column("end_date", Date),
+    Column("capacity", Integer),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+Table(
+    "training_enrollments",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("session_id", Integer, ForeignKey("training_sessions.id"), nullable=False),
+    Column("emp_id", Integer, ForeignKey("employees.id"), nullable=False),
+    Column("status", String(20), nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+Table(
+    "benefit_policies",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("code", String(50), nullable=False, unique=True, index=True),
+    Column("name", String(100), nullable=False),
+    Column("policy_type", String(20), nullable=False),
+    Column("default_points", DECIMAL(10, 2), nullable=False),
+    Column("is_active", Boolean, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+Table(
+    "point_balances",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("emp_id", Integer, ForeignKey("employees.id"), nullable=False),
+    Column("policy_id", Integer, ForeignKey("benefit_policies.id"), nullable=False),
+    Column("balance", DECIMAL(12, 2), nullable=False),
+    Column("year", Integer, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+Table(
+    "point_transactions",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("balance_id", Integer, ForeignKey("point_balances.id"), nullable=False),
+    Column("amount", DECIMAL(12, 2), nullable=False),
+    Column("txn_type", String(20), nullable=False),
+    Column("memo", String(255)),
+    Column("created_at", DateTime, nullable=False),
+)
+
+Table(
+    "code_groups",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("code", String(50), nullable=False, unique=True, index=True),
+    Column("name", String(100), nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+Table(
+    "codes",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("group_id", Integer, ForeignKey("code_groups.id"), nullable=False),
+    Column("code", String(50), nullable=False, index=True),
+    Column("name", String(100), nullable=False),
+    Column("sort_order", Integer, nullable=False),
+    Column("is_active", Boolean, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+Table(
+    "audit_logs",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("user_id", Integer, ForeignKey("users.id")),
+    Column("action", String(50), nullable=False),
+    Column("entity_type", String(50)),
+    Column("entity_id", Integer),
+    Column("old_value", String(1000)),
+    Column("new_value", String(1000)),
+    Column("ip_address", String(50)),
+    Column("created_at", DateTime, nullable=False),
+)
@@ -0,0 +1,110 @@
+"""Process-wide registry of common codes (``CodeGroup`` / ``Code``).
+
+All groups and codes are loaded once into an immutable snapshot. The snapshot is rebuilt
+when a commit changes either table (the ``codes`` version of ``refcache``) or after
+``REFERENCE_CACHE_TTL_SECONDS`` so other workers' changes are picked up, the same
+freshness rules as the cached reference responses.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel
+from sqlalchemy import select
+
+from . import database, models, refcache, schemas
+
+
+class UnknownCodeGroup(LookupError):
+    pass
+
+
+@dataclass(frozen=True)
+class CodeSnapshot:
+    version: int
+    expires: float
+    groups: dict[str, schemas.CodeGroupRead] = field(default_factory=dict)
+    # 그룹별 사용 중인 코드 (sort_order, code 순)
+    codes: dict[str, tuple[schemas.CodeRead, ...]] = field(default_factory=dict)
+    # 그룹별 코드값 -> 이름 (미사용 코드 포함: 과거 데이터 표시용)
+    names: dict[str, dict[str, str]] = field(default_factory=dict)
+
+    def active_codes(self, group_code: str) -> tuple[schemas.CodeRead, ...]:
+        if group_code not in self.groups:
+            raise UnknownCodeGroup(group_code)
+        return self.codes.get(group_code, ())
+
+    def name_of(self, group_code: str, code: str | None) -> str | None:
+        return self.names.get(group_code, {}).get(code) if code is not None else None
+
+
+def _load() -> CodeSnapshot:
+    current = refcache.version("codes")
+    db = database.ReadSessionLocal()
+    try:
+        groups = db.execute(select(models.CodeGroup).order_by(models.CodeGroup.code)).scalars().all()
+        rows = db.execute(
+            select(models.Code).order_by(models.Code.group_id, models.Code.sort_order, models.Code.code)
+        ).scalars().all()
+    finally:
+        db.close()
+    by_id = {g.id: g.code for g in groups}
+    codes: dict[str, list[schemas.CodeRead]] = {}
+    names: dict[str, dict[str, str]] = {}
+    for row in rows:
+        group_code = by_id.get(row.group_id)
+        if group_code is None:
+            continue
+        names.setdefault(group_code, {})[row.code] = row.name
+        if row.is_active:
+            codes.setdefault(group_code, []).append(schemas.CodeRead.model_validate(row))
+    return CodeSnapshot(
+        version=current,
+        expires=time.monotonic() + refcache.REFERENCE_CACHE_TTL_SECONDS,
+        groups={g.code: schemas.CodeGroupRead.model_validate(g) for g in groups},
+        codes={k: tuple(v) for k, v in codes.items()},
+        names=names,
+    )
+
+
+_snapshot: CodeSnapshot | None = None
+_lock = threading.Lock()
+
+
+def _is_fresh(snap: CodeSnapshot | None) -> bool:
+    return snap is not None and snap.version == refcache.version("codes") and snap.expires > time.monotonic()
+
+
+def snapshot() -> CodeSnapshot:
+    """Current registry contents; reloads (two queries) only when stale."""
+    global _snapshot
+    snap = _snapshot
+    if _is_fresh(snap):
+        return snap
+    with _lock:
+        if not _is_fresh(_snapshot):
+            _snapshot = _load()
+        return _snapshot
+
+
+async def snapshot_async() -> CodeSnapshot:
+    # 최신이면 바로 반환, 다시 읽어야 할 때만 스레드풀에서 조회
+    snap = _snapshot
+    return snap if _is_fresh(snap) else await run_in_threadpool(snapshot)
+
+
+def with_names(items, schema: type[BaseModel], snap: CodeSnapshot, **targets: tuple[str, str]) -> list:
+    """Serialize ``items`` as ``schema`` and fill code-name fields.
+
+    ``targets`` maps a name field to ``(group_code, code attribute)``, e.g.
+    ``leave_type_name=("LEAVE_TYPE", "leave_type")``.
+    """
+    out = []
+    for item in items:
+        obj = schema.model_validate(item)
+        for target, (group_code, attr) in targets.items():
+            setattr(obj, target, snap.name_of(group_code, getattr(obj, attr)))
+        out.append(obj)
+    return out
@@ -1,8 +1,11 @@
 import os
 from pathlib import Path
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
 
 
 class Base(DeclarativeBase):
@@ -12,14 +15,210 @@ class Base(DeclarativeBase):
 # DB 파일을 backend 폴더 기준으로 고정 (실행 경로에 상관없이 동일한 DB 사용)
 _db_dir = Path(__file__).resolve().parent.parent
 _db_path = _db_dir / "jscorp_hr.db"
-DATABASE_URL = f"sqlite:///{_db_path}"
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False},
+
+def _normalize_url(url: str) -> str:
+    # Render/Heroku 형식(postgres://)은 psycopg(3) 드라이버 URL 로 변환
+    if url.startswith("postgres://"):
+        url = "postgresql://" + url[len("postgres://"):]
+    if url.startswith("postgresql://"):
+        url = "postgresql+psycopg://" + url[len("postgresql://"):]
+    return url
+
+
+DATABASE_URL = _normalize_url(os.getenv("DATABASE_URL", f"sqlite:///{_db_path}"))
+
+# 커넥션 풀 설정 (SQLite 메모리 DB 에는 적용되지 않음)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "1") != "0"
+# 대량 INSERT 시 한 문장에 묶는 행 수 (insertmanyvalues)
+DB_INSERT_PAGE_SIZE = int(os.getenv("DB_INSERT_PAGE_SIZE", "1000"))
+
+# SQLite 파일 DB 프로필: production = WAL + pragma + BEGIN IMMEDIATE writer, basic = 드라이버 기본값
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "production")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "10000"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", str(64 * 1024)))
+
+# 조회(GET) 전용 복제본. 미설정 시 SQLite 파일은 query_only 연결 풀, 그 외에는 primary 를 사용
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+
+
+def is_sqlite_file(url: str) -> bool:
+    u = make_url(url)
+    return u.get_backend_name() == "sqlite" and u.database not in (None, "", ":memory:")
+
+
+def _apply_sqlite_pragmas(dbapi_conn, _record) -> None:
+    cur = dbapi_conn.cursor()
+    cur.execute("PRAGMA journal_mode=WAL")
+    cur.execute("PRAGMA synchronous=NORMAL")
+    cur.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cur.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    cur.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+    cur.execute("PRAGMA temp_store=MEMORY")
+    cur.close()
+
+
+def _disable_implicit_begin(dbapi_conn, _record) -> None:
+    # pysqlite 의 지연 BEGIN 대신 _begin_immediate 가 트랜잭션을 시작
+    dbapi_conn.isolation_level = None
+
+
+def _begin_immediate(conn) -> None:
+    # 쓰기 잠금을 트랜잭션 시작 시 잡아 writer 끼리는 busy_timeout 동안 대기하며 직렬화
+    # (읽다가 쓰기로 올라갈 때의 SQLITE_BUSY 없음)
+    conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def _apply_query_only(dbapi_conn, _record) -> None:
+    cur = dbapi_conn.cursor()
+    cur.execute("PRAGMA query_only=ON")
+    cur.close()
+
+
+def engine_options(url: str) -> dict:
+    backend = make_url(url).get_backend_name()
+    if backend == "sqlite":
+        opts: dict = {"connect_args": {"check_same_thread": False}}
+        if not is_sqlite_file(url):
+            opts["poolclass"] = StaticPool
+        else:
+            opts.update(pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW)
+        return opts
+    opts = {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "insertmanyvalues_page_size": DB_INSERT_PAGE_SIZE,
+    }
+    if backend == "postgresql":
+        opts["connect_args"] = {"application_name": "jscorp-hr"}
+    return opts
+
+
+def make_engine(url: str, writer: bool = False, sqlite_profile: str | None = None) -> Engine:
+    url = _normalize_url(url)
+    eng = create_engine(url, **engine_options(url))
+    if is_sqlite_file(url) and (sqlite_profile or SQLITE_PROFILE) == "production":
+        event.listen(eng, "connect", _apply_sqlite_pragmas)
+        if writer:
+            # 연결 하나짜리 풀 대신 SQLite 쓰기 잠금으로 직렬화: 쓰기가 끝난 트랜잭션을 열어 둔 세션이 있어도
+            # 다른 쓰기 세션(작업 상태 기록 등)이 풀 대기로 막히지 않음
+            event.listen(eng, "connect", _disable_implicit_begin)
+            event.listen(eng, "begin", _begin_immediate)
+    return eng
+
+
+# async 엔드포인트용 드라이버 (psycopg 는 같은 드라이버명으로 async 모드 지원)
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+psycopg"}
+
+
+def async_url(url: str) -> str:
+    u = make_url(_normalize_url(url))
+    return u.set(drivername=ASYNC_DRIVERS[u.get_backend_name()]).render_as_string(hide_password=False)
+
+
+def make_async_engine(url: str, query_only: bool = False, sqlite_profile: str | None = None) -> AsyncEngine:
+    url = _normalize_url(url)
+    opts = engine_options(url)
+    if is_sqlite_file(url):
+        opts["poolclass"] = AsyncAdaptedQueuePool
+    eng = create_async_engine(async_url(url), **opts)
+    if is_sqlite_file(url):
+        if (sqlite_profile or SQLITE_PROFILE) == "production":
+            event.listen(eng.sync_engine, "connect", _apply_sqlite_pragmas)
+        if query_only:
+            event.listen(eng.sync_engine, "connect", _apply_query_only)
+    return eng
+
+
+class RoutingSession(Session):
+    """Reads go to the shared reader pool; once a transaction writes it stays on the writer."""
+
+    def __init__(self, *args, writer: Engine | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._writer = writer
+        self._wrote = False
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._writer is None:
+            return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+        if self._wrote or self._flushing or getattr(clause, "is_dml", False):
+            self._wrote = True
+            return self._writer
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _reset_write_route(session, transaction) -> None:
+    if transaction.parent is None:
+        session._wrote = False
+
+
+def make_session_factory(reader: Engine, writer: Engine | None = None) -> sessionmaker:
+    return sessionmaker(
+        class_=RoutingSession,
+        autocommit=False,
+        autoflush=False,
+        bind=reader,
+        writer=writer,
+    )
+
+
+def make_read_engine(url: str, replica_url: str | None = None) -> Engine | None:
+    if replica_url:
+        return make_engine(replica_url)
+    if is_sqlite_file(url):
+        eng = make_engine(url)
+        event.listen(eng, "connect", _apply_query_only)
+        return eng
+    return None
+
+
+class ReadOnlySession(Session):
+    """Session for GET handlers; bound to the replica (if any) and refuses to flush changes."""
+
+
+@event.listens_for(ReadOnlySession, "before_flush")
+def _reject_flush(session, flush_context, instances) -> None:
+    raise RuntimeError("Read-only session cannot write; use get_db for write endpoints")
+
+
+def make_read_session_factory(reader: Engine) -> sessionmaker:
+    return sessionmaker(
+        class_=ReadOnlySession,
+        autoflush=False,
+        expire_on_commit=False,
+        bind=reader,
+    )
+
+
+engine = make_engine(DATABASE_URL)
+writer_engine = (
+    make_engine(DATABASE_URL, writer=True)
+    if is_sqlite_file(DATABASE_URL) and SQLITE_PROFILE == "production"
+    else None
 )
+read_engine = make_read_engine(DATABASE_URL, DATABASE_REPLICA_URL) or engine
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+async_read_engine = make_async_engine(
+    DATABASE_REPLICA_URL or DATABASE_URL,
+    query_only=not DATABASE_REPLICA_URL,
+)
+
+SessionLocal = make_session_factory(engine, writer_engine)
+ReadSessionLocal = make_read_session_factory(read_engine)
+AsyncReadSessionLocal = async_sessionmaker(
+    async_read_engine,
+    autoflush=False,
+    expire_on_commit=False,
+)
 
 
 def get_db():
@@ -30,76 +229,22 @@ def get_db():
         db.close()
 
 
+def get_read_db():
+    # 복제본은 지연이 있을 수 있으므로 쓰기 직후 같은 요청에서 다시 읽어야 하면 get_db 사용
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
 def init_db():
-    from . import models  # noqa: F401
-
-    Base.metadata.create_all(bind=engine)
-    _migrate_users_columns(engine)
-    _migrate_employees_user_column(engine)
-    _migrate_leave_request_columns(engine)
-    _migrate_evaluation_result_columns(engine)
-
-
-def _migrate_users_columns(eng):
-    from sqlalchemy import text
-    with eng.connect() as conn:
-        for col, typ in [
-            ("email", "VARCHAR(255)"),
-            ("email_verified", "INTEGER DEFAULT 0"),
-            ("role", "VARCHAR(50) DEFAULT 'EMPLOYEE'"),
-            ("reset_token", "VARCHAR(255)"),
-            ("reset_token_expires", "DATETIME"),
-            ("verification_token", "VARCHAR(255)"),
-        ]:
-            try:
-                conn.execute(text(f"ALTER TABLE users ADD COLUMN {col} {typ}"))
-                conn.commit()
-            except Exception:
-                conn.rollback()
-
-
-def _migrate_employees_user_column(eng):
-    from sqlalchemy import text
-
-    with eng.connect() as conn:
-        try:
-            conn.execute(text("ALTER TABLE employees ADD COLUMN user_id INTEGER"))
-            conn.commit()
-        except Exception:
-            conn.rollback()
-
-
-def _migrate_leave_request_columns(eng):
-    from sqlalchemy import text
-
-    with eng.connect() as conn:
-        for col, typ in [
-            ("approver_emp_id", "INTEGER"),
-            ("approved_at", "DATETIME"),
-        ]:
-            try:
-                conn.execute(
-                    text(f"ALTER TABLE leave_requests ADD COLUMN {col} {typ}")
-                )
-                conn.commit()
-            except Exception:
-                conn.rollback()
-
-
-def _migrate_evaluation_result_columns(eng):
-    from sqlalchemy import text
-
-    with eng.connect() as conn:
-        for col, typ in [
-            ("evaluator_emp_id", "INTEGER"),
-            ("grade", "VARCHAR(10)"),
-            ("is_promotion_candidate", "INTEGER DEFAULT 0"),
-        ]:
-            try:
-                conn.execute(
-                    text(f"ALTER TABLE evaluation_results ADD COLUMN {col} {typ}")
-                )
-                conn.commit()
-            except Exception:
-                conn.rollback()
+    from . import migrations
+
+    migrations.run_migrations(engine)
 
+
+async def get_async_read_db():
+    # async def 조회 엔드포인트용: 이벤트 루프를 막지 않으므로 스레드풀을 쓰지 않음
+    async with AsyncReadSessionLocal() as db:
+        yield db
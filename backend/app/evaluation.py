@@ -0,0 +1,155 @@
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from itertools import accumulate
+
+from sqlalchemy import exists, insert, literal, select, update
+from sqlalchemy.orm import Session
+
+from . import models, org
+
+
+def seed_targets(
+    db: Session,
+    plan_id: int,
+    dept_id: int | None = None,
+    pay_group_id: int | None = None,
+) -> dict[str, int]:
+    """Add every ACTIVE employee without a target in the plan, in one INSERT ... SELECT.
+
+    ``dept_id`` limits it to that department's subtree, ``pay_group_id`` to one pay group.
+    """
+    e = models.Employee
+    t = models.EvaluationTarget
+    stmt = select(literal(plan_id), e.id, literal("PENDING")).where(
+        e.status == "ACTIVE",
+        ~exists().where(t.plan_id == plan_id, t.emp_id == e.id),
+    )
+    if dept_id is not None:
+        stmt = stmt.where(e.dept_id.in_(org.subtree_ids(dept_id)))
+    if pay_group_id is not None:
+        stmt = stmt.where(e.pay_group_id == pay_group_id)
+    result = db.execute(
+        insert(t)
+        .from_select(["plan_id", "emp_id", "status"], stmt)
+        # INSERT 는 기본적으로 rowcount 를 보존하지 않음
+        .execution_options(preserve_rowcount=True)
+    )
+    db.commit()
+    return {"created": result.rowcount}
+
+
+class GradingError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class GradeTable:
+    """Grade policies of a plan compiled for binary search.
+
+    Policies are kept in ``(min_score, id)`` order. A score gets the first policy in that
+    order whose ``[min_score, max_score]`` contains it, so on a shared boundary (80~90,
+    90~100) the lower band wins, the same as a linear scan over the sorted policies.
+    """
+
+    lows: tuple[float, ...]
+    # highs 의 누적 최댓값: 점수를 포함할 수 있는 첫 정책 위치를 이분 탐색
+    reach: tuple[float, ...]
+    grades: tuple[str, ...]
+    promotions: tuple[bool, ...]
+
+    @classmethod
+    def compile(cls, policies) -> "GradeTable":
+        rows = sorted(
+            (float(p.min_score), p.id, float(p.max_score), p.grade, bool(p.is_promotion_candidate))
+            for p in policies
+        )
+        reach = tuple(accumulate((r[2] for r in rows), max))
+        return cls(
+            lows=tuple(r[0] for r in rows),
+            reach=reach,
+            grades=tuple(r[3] for r in rows),
+            promotions=tuple(r[4] for r in rows),
+        )
+
+    def index(self, score: float) -> int | None:
+        # first 이전 정책은 모두 max_score < score, first 의 max_score >= score.
+        # first 의 min_score 가 score 보다 크면 이후 정책도 모두 score 보다 위에서 시작
+        first = bisect_left(self.reach, score)
+        if first < len(self.lows) and self.lows[first] <= score:
+            return first
+        return None
+
+    def lookup(self, score: float) -> tuple[str | None, bool]:
+        i = self.index(score)
+        return (None, False) if i is None else (self.grades[i], self.promotions[i])
+
+    def ranked(self, distribution: dict[str, float]) -> list[tuple[str, bool]]:
+        """``(grade, promotion)`` from the best grade down, checking ``distribution`` (percent)."""
+        unknown = set(distribution) - set(self.grades)
+        if unknown:
+            raise GradingError(f"Unknown grade in distribution: {', '.join(sorted(unknown))}")
+        if any(v < 0 for v in distribution.values()) or abs(sum(distribution.values()) - 100) > 0.01:
+            raise GradingError("Distribution percentages must be non-negative and sum to 100")
+        # 높은 점수 구간의 등급부터
+        seen: dict[str, bool] = {}
+        for i in reversed(range(len(self.grades))):
+            seen.setdefault(self.grades[i], self.promotions[i])
+        return [(g, seen[g]) for g in seen if distribution.get(g)]
+
+
+def grade_by_score(table: GradeTable, rows) -> list[dict]:
+    """Grade ``(id, score)`` rows with the policy bands."""
+    out = []
+    lookup = table.lookup
+    for rid, score in rows:
+        grade, promo = lookup(float(score))
+        out.append({"id": rid, "grade": grade, "is_promotion_candidate": promo})
+    return out
+
+
+def grade_by_distribution(table: GradeTable, rows, distribution: dict[str, float]) -> list[dict]:
+    """Forced ranking: the top ``distribution[g]`` percent of scores get grade ``g``.
+
+    Grades are handed out from the best policy band down; equal scores share the better grade.
+    """
+    ranked = table.ranked(distribution)
+    rows = sorted(rows, key=lambda r: r[1], reverse=True)
+    n = len(rows)
+    # 순위 -> 등급: 누적 비율 경계를 이분 탐색
+    cutoffs = list(accumulate(distribution[g] for g, _ in ranked))
+    cutoffs = [round(n * c / 100) for c in cutoffs[:-1]]
+    out = []
+    prev_score = None
+    band = 0
+    for rank, (rid, score) in enumerate(rows):
+        if score != prev_score:
+            band = bisect_right(cutoffs, rank)
+            prev_score = score
+        grade, promo = ranked[band]
+        out.append({"id": rid, "grade": grade, "is_promotion_candidate": promo})
+    return out
+
+
+def aggregate_grades(
+    db: Session, plan_id: int, distribution: dict[str, float] | None = None
+) -> dict[str, int]:
+    """Grade every result of the plan and write the grades back in one bulk UPDATE.
+
+    Without ``distribution`` grades come from the score bands of the plan's policies;
+    with it (grade -> percent) results are force-ranked by score.
+    """
+    policies = db.scalars(
+        select(models.GradePolicy).where(models.GradePolicy.plan_id == plan_id)
+    ).all()
+    table = GradeTable.compile(policies)
+    r = models.EvaluationResult
+    rows = db.execute(select(r.id, r.score).where(r.plan_id == plan_id)).all()
+    if distribution:
+        graded = grade_by_distribution(table, rows, distribution)
+    else:
+        graded = grade_by_score(table, rows)
+    if graded:
+        # 기본키 기준 ORM 일괄 UPDATE (executemany 한 번)
+        db.execute(update(r), graded)
+    db.commit()
+    return {"updated": len(graded)}
@@ -0,0 +1,271 @@
+import json
+import logging
+import os
+import socket
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+
+from . import attendance, database, evaluation, models, payroll, stats
+
+logger = logging.getLogger(__name__)
+
+# HTTP 요청 스레드풀과 분리된 관리작업 전용 워커 수
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+# 실행 중인 작업의 리스(초). 소유 프로세스가 이 시간 동안 생존 신호를 남기지 않으면 다른 프로세스가 실패 처리
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "120"))
+JOB_HEARTBEAT_SECONDS = max(1, JOB_LEASE_SECONDS // 3)
+
+FINISHED_STATUSES = ("SUCCEEDED", "FAILED", "CANCELLED")
+
+
+class JobCancelled(Exception):
+    pass
+
+
+ProgressFn = Callable[[int], None]
+
+
+def _calculate_payroll(db: Session, params: dict, progress: ProgressFn) -> dict:
+    run = db.get(models.PayRun, params["run_id"])
+    if not run:
+        raise ValueError("Payroll run not found")
+    return payroll.calculate_pay_run(
+        db,
+        run,
+        batch_size=params.get("batch_size", payroll.DEFAULT_BATCH_SIZE),
+        chunks=params.get("chunks", payroll.DEFAULT_CHUNKS),
+        progress=progress,
+    )
+
+
+def _seed_evaluation_targets(db: Session, params: dict, progress: ProgressFn) -> dict:
+    return evaluation.seed_targets(
+        db,
+        params["plan_id"],
+        dept_id=params.get("dept_id"),
+        pay_group_id=params.get("pay_group_id"),
+    )
+
+
+def _aggregate_evaluation_plan(db: Session, params: dict, progress: ProgressFn) -> dict:
+    return evaluation.aggregate_grades(db, params["plan_id"], params.get("distribution"))
+
+
+def _close_attendance_month(db: Session, params: dict, progress: ProgressFn) -> dict:
+    return attendance.close_month(db, params["year_month"])
+
+
+def _aggregate_attendance_month(db: Session, params: dict, progress: ProgressFn) -> dict:
+    return attendance.aggregate_month(db, params["year_month"], progress=progress)
+
+
+def _refresh_attendance_summaries(db: Session, params: dict, progress: ProgressFn) -> dict:
+    keys = [(emp_id, ym) for emp_id, ym in params["keys"]]
+    return attendance.refresh_summary_batches(db, keys, progress=progress)
+
+
+def _reconcile_dashboard_stats(db: Session, params: dict, progress: ProgressFn) -> dict:
+    return {"drift": stats.reconcile(db)}
+
+
+HANDLERS: dict[str, Callable[[Session, dict, ProgressFn], dict]] = {
+    "PAYROLL_CALCULATE": _calculate_payroll,
+    "EVALUATION_SEED_TARGETS": _seed_evaluation_targets,
+    "EVALUATION_AGGREGATE": _aggregate_evaluation_plan,
+    "ATTENDANCE_CLOSE_MONTH": _close_attendance_month,
+    "ATTENDANCE_AGGREGATE_MONTH": _aggregate_attendance_month,
+    "ATTENDANCE_REFRESH_SUMMARIES": _refresh_attendance_summaries,
+    "DASHBOARD_RECONCILE": _reconcile_dashboard_stats,
+}
+
+_executor: ThreadPoolExecutor | None = None
+_futures: dict[int, Future] = {}
+# 이 프로세스가 RUNNING 으로 가져가 실행 중인 작업
+_running: set[int] = set()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix="hr-job")
+    return _executor
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def worker_id() -> str:
+    # fork 된 워커마다 다르도록 호출 시점의 pid 사용
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _set_job(job_id: int, **values) -> int:
+    """Update a job this process is running; returns 0 once it is no longer RUNNING here.
+
+    Status is written in its own short session, apart from the handler's transaction. A job
+    failed elsewhere after its lease expired is never moved back to another state.
+    """
+    db = database.SessionLocal()
+    try:
+        res = db.execute(
+            update(models.Job)
+            .where(
+                models.Job.id == job_id,
+                models.Job.status == "RUNNING",
+                models.Job.worker_id == worker_id(),
+            )
+            .values(**values)
+        )
+        db.commit()
+        return res.rowcount
+    finally:
+        db.close()
+
+
+def _is_cancel_requested(job_id: int) -> bool:
+    db = database.SessionLocal()
+    try:
+        job = db.get(models.Job, job_id)
+        return bool(job and job.cancel_requested)
+    finally:
+        db.close()
+
+
+def _dispatch(job_id: int) -> None:
+    fut = _get_executor().submit(run_job, job_id)
+    _futures[job_id] = fut
+    fut.add_done_callback(lambda _: _futures.pop(job_id, None))
+
+
+def submit_job(db: Session, job_type: str, params: dict, user_id: int | None = None) -> models.Job:
+    if job_type not in HANDLERS:
+        raise ValueError(f"Unknown job type: {job_type}")
+    job = models.Job(
+        job_type=job_type,
+        params=json.dumps(params),
+        created_by_user_id=user_id,
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    _dispatch(job.id)
+    return job
+
+
+def run_job(job_id: int) -> None:
+    # QUEUED -> RUNNING 으로 바꾼 워커만 실행 (다중 프로세스에서 중복 실행 방지)
+    db = database.SessionLocal()
+    try:
+        claimed = db.execute(
+            update(models.Job)
+            .where(
+                models.Job.id == job_id,
+                models.Job.status == "QUEUED",
+                models.Job.cancel_requested == False,  # noqa: E712
+            )
+            .values(status="RUNNING", started_at=_now(), worker_id=worker_id(), heartbeat_at=_now())
+        ).rowcount
+        db.commit()
+        if not claimed:
+            return
+        _running.add(job_id)
+        job = db.get(models.Job, job_id)
+        params = json.loads(job.params or "{}")
+        handler = HANDLERS[job.job_type]
+
+        def progress(pct: int) -> None:
+            if _is_cancel_requested(job_id):
+                raise JobCancelled()
+            # 리스를 잃은 작업(다른 프로세스가 실패 처리)은 더 진행하지 않음
+            if not _set_job(job_id, progress=max(0, min(100, int(pct))), heartbeat_at=_now()):
+                raise JobCancelled()
+
+        result = handler(db, params, progress)
+        _set_job(
+            job_id,
+            status="SUCCEEDED",
+            progress=100,
+            result=json.dumps(result),
+            finished_at=_now(),
+        )
+    except JobCancelled:
+        db.rollback()
+        _set_job(job_id, status="CANCELLED", finished_at=_now())
+    except Exception as e:
+        logger.exception("Job %s failed", job_id)
+        db.rollback()
+        _set_job(job_id, status="FAILED", error=str(e)[:1000], finished_at=_now())
+    finally:
+        _running.discard(job_id)
+        db.close()
+
+
+def cancel_job(db: Session, job: models.Job) -> models.Job:
+    if job.status in FINISHED_STATUSES:
+        return job
+    job.cancel_requested = True
+    if job.status == "QUEUED":
+        job.status = "CANCELLED"
+        job.finished_at = _now()
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def wait_for(job_id: int, timeout: float | None = None) -> None:
+    fut = _futures.get(job_id)
+    if fut is not None:
+        fut.result(timeout=timeout)
+
+
+def heartbeat() -> dict[str, int]:
+    """Renew the leases of jobs running in this process and fail RUNNING jobs whose lease expired."""
+    now = _now()
+    j = models.Job
+    db = database.SessionLocal()
+    try:
+        renewed = 0
+        if _running:
+            renewed = db.execute(
+                update(j)
+                .where(j.id.in_(list(_running)), j.status == "RUNNING", j.worker_id == worker_id())
+                .values(heartbeat_at=now)
+            ).rowcount
+            db.commit()
+        # 생존 신호가 끊긴 작업은 소유 프로세스가 종료된 것 (핸들러 트랜잭션은 이미 롤백됨).
+        # 리스 컬럼 이전에 시작된 작업은 시작 시각 기준
+        expired = db.execute(
+            update(j)
+            .where(
+                j.status == "RUNNING",
+                func.coalesce(j.heartbeat_at, j.started_at) < now - timedelta(seconds=JOB_LEASE_SECONDS),
+            )
+            .values(status="FAILED", error="Interrupted: worker lease expired", finished_at=now)
+        ).rowcount
+        db.commit()
+        if expired:
+            logger.warning("Marked %s job(s) with an expired lease as failed", expired)
+        return {"renewed": renewed, "expired": expired}
+    finally:
+        db.close()
+
+
+def resume_queued_jobs() -> None:
+    """Resubmit jobs left QUEUED by a previous process and fail RUNNING jobs whose lease expired."""
+    heartbeat()
+    db = database.SessionLocal()
+    try:
+        ids = [
+            row[0]
+            for row in db.query(models.Job.id).filter(models.Job.status == "QUEUED").all()
+        ]
+    finally:
+        db.close()
+    for job_id in ids:
+        if job_id not in _futures:
+            _dispatch(job_id)
@@ -1,19 +1,98 @@
+import asyncio
+import json
+import logging
+import os
 import secrets
+from contextlib import asynccontextmanager
 from datetime import date, datetime, timedelta, timezone
 
-from fastapi import Depends, FastAPI, HTTPException, Query
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from . import auth, database, models, schemas
+from . import (
+    attendance,
+    auth,
+    codes,
+    database,
+    evaluation,
+    export,
+    jobs,
+    models,
+    org,
+    pagination,
+    payroll,
+    refcache,
+    schemas,
+    scopes,
+    stats,
+)
 
-database.init_db()
+logger = logging.getLogger(__name__)
 
 REQUESTABLE_ROLES = {"MANAGER", "HR_ADMIN", "PAYROLL_ADMIN"}
 
+# 빈 DB 에 샘플 데이터/기본 계정을 넣을지 여부 ("0" 이면 시딩하지 않음)
+SEED_SAMPLE_DATA = os.getenv("SEED_SAMPLE_DATA", "1") != "0"
+
+# 출퇴근 일괄 등록 한 번에 받을 수 있는 최대 이벤트 수
+TIME_LOG_BATCH_MAX = int(os.getenv("TIME_LOG_BATCH_MAX", "10000"))
+
+
+def _reconcile_stats() -> None:
+    db = database.SessionLocal()
+    try:
+        drift = stats.reconcile(db)
+        if drift:
+            logger.warning("Dashboard stats drift corrected: %s", drift)
+    finally:
+        db.close()
+
+
+async def _reconcile_stats_periodically(interval: int) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await run_in_threadpool(_reconcile_stats)
+        except Exception:
+            logger.exception("Dashboard stats reconciliation failed")
+
+
+async def _job_heartbeat_periodically(interval: int) -> None:
+    # 실행 중인 작업의 리스 갱신 + 리스가 만료된 작업 실패 처리
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await run_in_threadpool(jobs.heartbeat)
+        except Exception:
+            logger.exception("Job heartbeat failed")
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    startup()
+    reconciler = (
+        asyncio.create_task(_reconcile_stats_periodically(stats.STATS_RECONCILE_SECONDS))
+        if stats.STATS_RECONCILE_SECONDS > 0
+        else None
+    )
+    job_heartbeat = asyncio.create_task(_job_heartbeat_periodically(jobs.JOB_HEARTBEAT_SECONDS))
+    yield
+    job_heartbeat.cancel()
+    if reconciler:
+        reconciler.cancel()
+    # async 커넥션은 이벤트 루프에 묶이므로 종료 시 반환
+    await database.async_read_engine.dispose()
+
+
 app = FastAPI(
     title="JSCORP HR System API",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -22,6 +101,7 @@ app.add_middleware(
     allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[pagination.NEXT_CURSOR_HEADER],
 )
 
 
@@ -33,6 +113,7 @@ def seed_sample_data(db: Session) -> None:
     pay_group = models.PayGroup(code="JSCORP_MONTHLY", name="JSCORP Monthly")
     db.add_all([dept, pay_group])
     db.flush()
+    org.add_department(db, dept)
 
     emp = models.Employee(
         emp_no="E0001",
@@ -86,19 +167,20 @@ def seed_sample_data(db: Session) -> None:
         )
         db.add(wt)
     if db.query(models.PayItem).count() == 0:
-        for code, name, itype, amt in [
-            ("BASE", "Base salary", "EARNING", 0),
-            ("OT", "Overtime", "EARNING", 0),
-            ("TAX", "Income tax", "DEDUCTION", 0),
-            ("INS", "Insurance", "DEDUCTION", 0),
+        for code, name, itype, calc, amt, formula in [
+            ("BASE", "Base salary", "EARNING", "RATE", 20000, "worked_hours"),
+            ("OT", "Overtime", "EARNING", "FIXED", 0, None),
+            ("TAX", "Income tax", "DEDUCTION", "FORMULA", None, "gross * 0.1"),
+            ("INS", "Insurance", "DEDUCTION", "FIXED", 0, None),
         ]:
             db.add(
                 models.PayItem(
                     code=code,
                     name=name,
                     item_type=itype,
-                    calculation_type="FIXED",
+                    calculation_type=calc,
                     default_amount=amt,
+                    formula=formula,
                 )
             )
 
@@ -155,6 +237,8 @@ def seed_sample_data(db: Session) -> None:
         ]:
             db.add(models.GradePolicy(plan_id=ep.id, min_score=min_s, max_score=max_s, grade=grade, is_promotion_candidate=promo))
 
+    db.flush()
+    stats.refresh(db)
     db.commit()
 
 
@@ -188,12 +272,15 @@ def seed_user(db: Session) -> None:
     db.commit()
 
 
-@app.on_event("startup")
-def on_startup() -> None:
+def seed_if_empty() -> bool:
+    # 사용자 계정이 하나도 없는 DB 에서만 시딩 (bcrypt 해시는 최초 1회만 계산)
     db = database.SessionLocal()
     try:
+        if db.query(models.User.id).first() is not None:
+            return False
         seed_sample_data(db)
         seed_user(db)
+        return True
     except Exception:
         db.rollback()
         raise
@@ -201,6 +288,16 @@ def on_startup() -> None:
         db.close()
 
 
+def startup() -> None:
+    # 1) 스키마 확인 (최신이면 schema_migrations 조회만 수행)
+    database.init_db()
+    # 2) 빈 DB 일 때만 시딩
+    if SEED_SAMPLE_DATA:
+        seed_if_empty()
+    # 3) 이전 프로세스가 남긴 대기 작업 재개 (리스가 만료된 실행 중 작업은 실패 처리)
+    jobs.resume_queued_jobs()
+
+
 @app.get("/health")
 def health() -> dict[str, str]:
     return {"status": "ok", "service": "JSCORP HR"}
@@ -292,7 +389,7 @@ def reset_password_by_token(
 
 @app.get("/api/auth/me", response_model=schemas.UserRead)
 def get_me(
-    current_user: models.User = Depends(auth.get_current_user),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> schemas.UserRead:
     return current_user
 
@@ -301,11 +398,11 @@ def get_me(
 def change_password(
     payload: schemas.ChangePasswordRequest,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> dict[str, str]:
-    if not auth.verify_password(payload.current_password, current_user.password_hash):
-        raise HTTPException(status_code=400, detail="Current password is wrong")
     user = db.query(models.User).filter(models.User.id == current_user.id).first()
+    if not auth.verify_password(payload.current_password, user.password_hash):
+        raise HTTPException(status_code=400, detail="Current password is wrong")
     user.password_hash = auth.get_password_hash(payload.new_password)
     db.commit()
     return {"message": "Password updated"}
@@ -313,17 +410,20 @@ def change_password(
 
 @app.get("/api/users", response_model=list[schemas.UserRead])
 def list_users(
-    db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_admin),
+    response: Response,
+    page: pagination.PageParams = Depends(pagination.page_params),
+    db: Session = Depends(database.get_read_db),
+    current_user: auth.Principal = Depends(auth.get_current_admin),
 ) -> list[schemas.UserRead]:
-    return db.query(models.User).order_by(models.User.username).all()
+    keys = pagination.Keyset((models.User.username,))
+    return keys.page(keys.apply(db.query(models.User), page), page, response)
 
 
 @app.post("/api/users", response_model=schemas.UserRead, status_code=201)
 def create_user(
     payload: schemas.UserCreate,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_admin),
+    current_user: auth.Principal = Depends(auth.get_current_admin),
 ) -> schemas.UserRead:
     if db.query(models.User).filter(models.User.username == payload.username).first():
         raise HTTPException(status_code=400, detail="Username already exists")
@@ -345,7 +445,7 @@ def reset_user_password(
     user_id: int,
     payload: schemas.ResetPasswordRequest,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_admin),
+    current_user: auth.Principal = Depends(auth.get_current_admin),
 ) -> dict[str, str]:
     user = db.get(models.User, user_id)
     if not user:
@@ -358,17 +458,27 @@ def reset_user_password(
 # ---- Departments (Organization) ----
 @app.get("/api/departments", response_model=list[schemas.DepartmentRead])
 def list_departments(
-    db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
-) -> list[schemas.DepartmentRead]:
-    return db.query(models.Department).order_by(models.Department.code).all()
+    request: Request,
+    response: Response,
+    page: pagination.PageParams = Depends(pagination.page_params),
+    db: Session = Depends(database.get_read_db),
+    current_user: auth.Principal = Depends(auth.get_current_user),
+) -> Response:
+    keys = pagination.Keyset((models.Department.code,))
+    return refcache.respond(
+        request,
+        ("departments", page.cursor, page.limit),
+        lambda: keys.page(keys.apply(db.query(models.Department), page), page, response),
+        list[schemas.DepartmentRead],
+        response,
+    )
 
 
 @app.get("/api/departments/{dept_id}", response_model=schemas.DepartmentRead)
 def get_department(
     dept_id: int,
-    db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+    db: Session = Depends(database.get_read_db),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> schemas.DepartmentRead:
     dept = db.get(models.Department, dept_id)
     if not dept:
@@ -376,16 +486,39 @@ def get_department(
     return dept
 
 
+@app.get("/api/departments/{dept_id}/subtree", response_model=list[schemas.DepartmentTreeNode])
+def get_department_subtree(
+    dept_id: int,
+    db: Session = Depends(database.get_read_db),
+    current_user: auth.Principal = Depends(auth.get_current_user),
+) -> list[schemas.DepartmentTreeNode]:
+    # 조직도: 부서와 모든 하위 부서를 클로저 테이블 한 번 조회로 반환
+    rows = db.execute(org.subtree(dept_id)).all()
+    if not rows:
+        raise HTTPException(status_code=404, detail="Department not found")
+    return [
+        schemas.DepartmentTreeNode(
+            id=d.id, code=d.code, name=d.name, parent_id=d.parent_id, depth=depth
+        )
+        for d, depth in rows
+    ]
+
+
 @app.post("/api/departments", response_model=schemas.DepartmentRead, status_code=201)
 def create_department(
     payload: schemas.DepartmentCreate,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> schemas.DepartmentRead:
     if db.query(models.Department).filter(models.Department.code == payload.code).first():
         raise HTTPException(status_code=400, detail="Department code already exists")
+    if payload.parent_id is not None and not db.get(models.Department, payload.parent_id):
+        raise HTTPException(status_code=400, detail="Parent department not found")
     dept = models.Department(**payload.model_dump())
     db.add(dept)
+    db.flush()
+    org.add_department(db, dept)
+    stats.bump(db, department_count=1)
     db.commit()
     db.refresh(dept)
     return dept
@@ -396,12 +529,19 @@ def update_department(
     dept_id: int,
     payload: schemas.DepartmentUpdate,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> schemas.DepartmentRead:
     dept = db.get(models.Department, dept_id)
     if not dept:
         raise HTTPException(status_code=404, detail="Department not found")
     data = payload.model_dump(exclude_unset=True)
+    if "parent_id" in data and data["parent_id"] != dept.parent_id:
+        if data["parent_id"] is not None and not db.get(models.Department, data["parent_id"]):
+            raise HTTPException(status_code=400, detail="Parent department not found")
+        try:
+            org.move_department(db, dept, data["parent_id"])
+        except org.HierarchyError as e:
+            raise HTTPException(status_code=400, detail=str(e))
     for k, v in data.items():
         setattr(dept, k, v)
     db.commit()
@@ -413,78 +553,57 @@ def update_department(
 def delete_department(
     dept_id: int,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> None:
     dept = db.get(models.Department, dept_id)
     if not dept:
         raise HTTPException(status_code=404, detail="Department not found")
     if db.query(models.Employee).filter(models.Employee.dept_id == dept_id).first():
         raise HTTPException(status_code=400, detail="Department has employees")
+    try:
+        org.remove_department(db, dept)
+    except org.HierarchyError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     db.delete(dept)
+    stats.bump(db, department_count=-1)
     db.commit()
 
 
 # ---- Employees ----
 @app.get("/api/employees", response_model=list[schemas.EmployeeRead])
-def list_employees(
-    db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+async def list_employees(
+    response: Response,
+    page: pagination.PageParams = Depends(pagination.page_params),
+    db: AsyncSession = Depends(database.get_async_read_db),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> list[schemas.EmployeeRead]:
-    # ADMIN / HR_ADMIN 은 전체 조회
-    if getattr(current_user, "role", None) in ("ADMIN", "HR_ADMIN"):
-        return db.query(models.Employee).order_by(models.Employee.emp_no).all()
-
-    # 나머지 역할은 기본적으로 자기 자신 또는 본인 조직만 조회
-    me_emp = (
-        db.query(models.Employee)
-        .filter(models.Employee.user_id == current_user.id)
-        .first()
-    )
-    if not me_emp:
+    # 역할별 데이터 스코프(본인/팀/조직/전체)로 제한
+    scope = scopes.scope_for(current_user)
+    if scope.is_empty:
         return []
-
-    q = db.query(models.Employee)
-    if getattr(current_user, "role", None) == "MANAGER":
-        # MANAGER 는 같은 부서(dept_id) 직원 조회
-        q = q.filter(models.Employee.dept_id == me_emp.dept_id)
-    else:
-        # 일반 직원은 자기 자신만
-        q = q.filter(models.Employee.id == me_emp.id)
-    return q.order_by(models.Employee.emp_no).all()
+    keys = pagination.Keyset((models.Employee.emp_no,))
+    stmt = keys.apply(
+        select(models.Employee).where(
+            scope.employee_clause(models.Employee.id, models.Employee.dept_id)
+        ),
+        page,
+    )
+    return keys.page(await db.scalars(stmt), page, response)
 
 
 @app.get("/api/employees/{emp_id}", response_model=schemas.EmployeeRead)
-def get_employee(
+async def get_employee(
     emp_id: int,
-    db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+    db: AsyncSession = Depends(database.get_async_read_db),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> schemas.EmployeeRead:
-    emp = db.get(models.Employee, emp_id)
+    emp = await db.get(models.Employee, emp_id)
     if not emp:
         raise HTTPException(status_code=404, detail="Employee not found")
 
-    # ADMIN / HR_ADMIN 은 상세 조회 허용
-    if getattr(current_user, "role", None) in ("ADMIN", "HR_ADMIN"):
-        return emp
-
-    # MANAGER / EMPLOYEE 는 스코프 체크
-    me_emp = (
-        db.query(models.Employee)
-        .filter(models.Employee.user_id == current_user.id)
-        .first()
-    )
-    if not me_emp:
+    scope = scopes.scope_for(current_user)
+    if not scope.is_all and await db.scalar(scope.contains(emp_id)) is None:
         raise HTTPException(status_code=403, detail="Not enough permissions")
-
-    if getattr(current_user, "role", None) == "MANAGER":
-        # 같은 부서이거나 본인인 경우만 허용
-        if emp.dept_id != me_emp.dept_id and emp.id != me_emp.id:
-            raise HTTPException(status_code=403, detail="Not enough permissions")
-    else:
-        # 일반 직원은 자기 자신만
-        if emp.id != me_emp.id:
-            raise HTTPException(status_code=403, detail="Not enough permissions")
-
     return emp
 
 
@@ -494,8 +613,8 @@ def get_employee(
 )
 def get_employee_job_history(
     emp_id: int,
-    db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
+    db: Session = Depends(database.get_read_db),
+    current_user: auth.Principal = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
 ) -> list[schemas.EmployeeJobHistoryRead]:
     if not db.get(models.Employee, emp_id):
         raise HTTPException(status_code=404, detail="Employee not found")
@@ -513,8 +632,8 @@ def get_employee_job_history(
 )
 def get_employee_status_history(
     emp_id: int,
-    db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
+    db: Session = Depends(database.get_read_db),
+    current_user: auth.Principal = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
 ) -> list[schemas.EmployeeStatusHistoryRead]:
     if not db.get(models.Employee, emp_id):
         raise HTTPException(status_code=404, detail="Employee not found")
@@ -530,7 +649,7 @@ def get_employee_status_history(
 def create_employee(
     payload: schemas.EmployeeCreate,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> schemas.EmployeeRead:
     exists = (
         db.query(models.Employee)
@@ -563,6 +682,7 @@ def create_employee(
         db.flush()
         emp.user_id = user.id
 
+    stats.bump(db, total_employees=1, active_employees=int(emp.status == "ACTIVE"))
     db.commit()
     db.refresh(emp)
     return emp
@@ -573,7 +693,7 @@ def update_employee(
     emp_id: int,
     payload: schemas.EmployeeUpdate,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> schemas.EmployeeRead:
     emp = db.get(models.Employee, emp_id)
     if not emp:
@@ -607,6 +727,7 @@ def update_employee(
             user = db.get(models.User, emp.user_id)
             if user:
                 user.is_active = False
+        stats.bump(db, active_employees=(data["status"] == "ACTIVE") - (old_status == "ACTIVE"))
 
     db.commit()
     db.refresh(emp)
@@ -617,7 +738,7 @@ def update_employee(
 def delete_employee(
     emp_id: int,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> None:
     emp = db.get(models.Employee, emp_id)
     if not emp:
@@ -630,23 +751,30 @@ def delete_employee(
             user.is_active = False
 
     db.delete(emp)
+    stats.bump(db, total_employees=-1, active_employees=-int(emp.status == "ACTIVE"))
     db.commit()
 
 
 # ---- Pay Groups (Organization) ----
 @app.get("/api/payroll/pay-groups", response_model=list[schemas.PayGroupRead])
 def list_pay_groups(
-    db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
-) -> list[schemas.PayGroupRead]:
-    return db.query(models.PayGroup).order_by(models.PayGroup.code).all()
+    request: Request,
+    db: Session = Depends(database.get_read_db),
+    current_user: auth.Principal = Depends(auth.get_current_user),
+) -> Response:
+    return refcache.respond(
+        request,
+        ("pay_groups",),
+        lambda: db.query(models.PayGroup).order_by(models.PayGroup.code).all(),
+        list[schemas.PayGroupRead],
+    )
 
 
 @app.get("/api/payroll/pay-groups/{pg_id}", response_model=schemas.PayGroupRead)
 def get_pay_group(
     pg_id: int,
-    db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+    db: Session = Depends(database.get_read_db),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> schemas.PayGroupRead:
     pg = db.get(models.PayGroup, pg_id)
     if not pg:
@@ -658,12 +786,13 @@ def get_pay_group(
 def create_pay_group(
     payload: schemas.PayGroupCreate,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> schemas.PayGroupRead:
     if db.query(models.PayGroup).filter(models.PayGroup.code == payload.code).first():
         raise HTTPException(status_code=400, detail="Pay group code already exists")
     pg = models.PayGroup(**payload.model_dump())
     db.add(pg)
+    stats.bump(db, pay_group_count=1)
     db.commit()
     db.refresh(pg)
     return pg
@@ -674,7 +803,7 @@ def update_pay_group(
     pg_id: int,
     payload: schemas.PayGroupUpdate,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> schemas.PayGroupRead:
     pg = db.get(models.PayGroup, pg_id)
     if not pg:
@@ -691,7 +820,7 @@ def update_pay_group(
 def delete_pay_group(
     pg_id: int,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> None:
     pg = db.get(models.PayGroup, pg_id)
     if not pg:
@@ -699,26 +828,44 @@ def delete_pay_group(
     if db.query(models.Employee).filter(models.Employee.pay_group_id == pg_id).first():
         raise HTTPException(status_code=400, detail="Pay group has employees")
     db.delete(pg)
+    stats.bump(db, pay_group_count=-1)
     db.commit()
 
 
 # ---- Pay Items ----
+def _validate_pay_item_rule(
+    code: str, item_type: str, calculation_type: str, formula: str | None
+) -> None:
+    # 지급 항목 산식은 gross 를 참조할 수 없음 (공제 항목만 가능)
+    try:
+        payroll.compile_pay_item(None, code, item_type, calculation_type, None, formula)
+    except payroll.FormulaError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @app.get("/api/payroll/pay-items", response_model=list[schemas.PayItemRead])
 def list_pay_items(
-    db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
-) -> list[schemas.PayItemRead]:
-    return db.query(models.PayItem).order_by(models.PayItem.code).all()
+    request: Request,
+    db: Session = Depends(database.get_read_db),
+    current_user: auth.Principal = Depends(auth.get_current_user),
+) -> Response:
+    return refcache.respond(
+        request,
+        ("pay_items",),
+        lambda: db.query(models.PayItem).order_by(models.PayItem.code).all(),
+        list[schemas.PayItemRead],
+    )
 
 
 @app.post("/api/payroll/pay-items", response_model=schemas.PayItemRead, status_code=201)
 def create_pay_item(
     payload: schemas.PayItemCreate,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> schemas.PayItemRead:
     if db.query(models.PayItem).filter(models.PayItem.code == payload.code).first():
         raise HTTPException(status_code=400, detail="Pay item code already exists")
+    _validate_pay_item_rule(payload.code, payload.item_type, payload.calculation_type, payload.formula)
     pi = models.PayItem(**payload.model_dump())
     db.add(pi)
     db.commit()
@@ -729,8 +876,8 @@ def create_pay_item(
 @app.get("/api/payroll/pay-items/{pi_id}", response_model=schemas.PayItemRead)
 def get_pay_item(
     pi_id: int,
-    db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+    db: Session = Depends(database.get_read_db),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> schemas.PayItemRead:
     pi = db.get(models.PayItem, pi_id)
     if not pi:
@@ -743,13 +890,14 @@ def update_pay_item(
     pi_id: int,
     payload: schemas.PayItemUpdate,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> schemas.PayItemRead:
     pi = db.get(models.PayItem, pi_id)
     if not pi:
         raise HTTPException(status_code=404, detail="Pay item not found")
     for k, v in payload.model_dump(exclude_unset=True).items():
         setattr(pi, k, v)
+    _validate_pay_item_rule(pi.code, pi.item_type, pi.calculation_type, pi.formula)
     db.commit()
     db.refresh(pi)
     return pi
@@ -759,7 +907,7 @@ def update_pay_item(
 def delete_pay_item(
     pi_id: int,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> None:
     pi = db.get(models.PayItem, pi_id)
     if not pi:
@@ -775,54 +923,41 @@ def delete_pay_item(
 )
 def list_attendance_monthly(
     year_month: str,
-    db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+    db: Session = Depends(database.get_read_db),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> list[schemas.AttendanceMonthSummaryRead]:
-    q = db.query(models.AttendanceMonthSummary).filter(
-        models.AttendanceMonthSummary.year_month == year_month
-    )
-
-    # ADMIN / HR_ADMIN 은 전체 월 근태 요약 조회
-    role = getattr(current_user, "role", None)
-    if role in ("ADMIN", "HR_ADMIN"):
-        return q.all()
-
-    # 나머지 역할은 Employee 스코프를 기준으로 제한
-    me_emp = (
-        db.query(models.Employee)
-        .filter(models.Employee.user_id == current_user.id)
-        .first()
-    )
-    if not me_emp:
-        return []
-
-    emp_q = db.query(models.Employee.id)
-    if role == "MANAGER":
-        emp_q = emp_q.filter(models.Employee.dept_id == me_emp.dept_id)
-    else:
-        emp_q = emp_q.filter(models.Employee.id == me_emp.id)
-
-    visible_emp_ids = [row[0] for row in emp_q.all()]
-    if not visible_emp_ids:
+    scope = scopes.scope_for(current_user)
+    if scope.is_empty:
         return []
-
-    q = q.filter(models.AttendanceMonthSummary.emp_id.in_(visible_emp_ids))
-    return q.all()
+    return (
+        db.query(models.AttendanceMonthSummary)
+        .filter(
+            models.AttendanceMonthSummary.year_month == year_month,
+            scope.employee_clause(models.AttendanceMonthSummary.emp_id),
+        )
+        .all()
+    )
 
 
 @app.get("/api/attendance/work-types", response_model=list[schemas.WorkTypeRead])
 def list_work_types(
-    db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
-) -> list[schemas.WorkTypeRead]:
-    return db.query(models.WorkType).order_by(models.WorkType.code).all()
+    request: Request,
+    db: Session = Depends(database.get_read_db),
+    current_user: auth.Principal = Depends(auth.get_current_user),
+) -> Response:
+    return refcache.respond(
+        request,
+        ("work_types",),
+        lambda: db.query(models.WorkType).order_by(models.WorkType.code).all(),
+        list[schemas.WorkTypeRead],
+    )
 
 
 @app.post("/api/attendance/work-types", response_model=schemas.WorkTypeRead, status_code=201)
 def create_work_type(
     payload: schemas.WorkTypeCreate,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> schemas.WorkTypeRead:
     if db.query(models.WorkType).filter(models.WorkType.code == payload.code).first():
         raise HTTPException(status_code=400, detail="Work type code already exists")
@@ -838,7 +973,7 @@ def update_work_type(
     wt_id: int,
     payload: schemas.WorkTypeUpdate,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> schemas.WorkTypeRead:
     wt = db.get(models.WorkType, wt_id)
     if not wt:
@@ -854,7 +989,7 @@ def update_work_type(
 def delete_work_type(
     wt_id: int,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> None:
     wt = db.get(models.WorkType, wt_id)
     if not wt:
@@ -863,53 +998,42 @@ def delete_work_type(
     db.commit()
 
 
+def _leave_reads(rows, snap: codes.CodeSnapshot) -> list[schemas.LeaveRequestRead]:
+    # 휴가유형 코드값에 공통코드 이름을 붙여 응답
+    return codes.with_names(
+        rows, schemas.LeaveRequestRead, snap, leave_type_name=("LEAVE_TYPE", "leave_type")
+    )
+
+
 @app.get("/api/attendance/leave-requests", response_model=list[schemas.LeaveRequestRead])
-def list_leave_requests(
+async def list_leave_requests(
+    response: Response,
     emp_id: int | None = Query(None),
     status: str | None = Query(None),
-    db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+    page: pagination.PageParams = Depends(pagination.page_params),
+    db: AsyncSession = Depends(database.get_async_read_db),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> list[schemas.LeaveRequestRead]:
-    role = getattr(current_user, "role", None)
-    q = db.query(models.LeaveRequest)
-
+    scope = scopes.scope_for(current_user)
+    if scope.is_empty:
+        return []
+    stmt = select(models.LeaveRequest).where(scope.employee_clause(models.LeaveRequest.emp_id))
     if emp_id is not None:
-        q = q.filter(models.LeaveRequest.emp_id == emp_id)
+        stmt = stmt.where(models.LeaveRequest.emp_id == emp_id)
     if status is not None:
-        q = q.filter(models.LeaveRequest.status == status)
-
-    # ADMIN / HR_ADMIN 은 필터 조건만 적용
-    if role in ("ADMIN", "HR_ADMIN"):
-        return q.order_by(models.LeaveRequest.start_datetime.desc()).all()
-
-    # 나머지 역할은 Employee 스코프 기준으로 제한
-    me_emp = (
-        db.query(models.Employee)
-        .filter(models.Employee.user_id == current_user.id)
-        .first()
+        stmt = stmt.where(models.LeaveRequest.status == status)
+    keys = pagination.Keyset(
+        (models.LeaveRequest.start_datetime, models.LeaveRequest.id), descending=True
     )
-    if not me_emp:
-        return []
-
-    emp_q = db.query(models.Employee.id)
-    if role == "MANAGER":
-        emp_q = emp_q.filter(models.Employee.dept_id == me_emp.dept_id)
-    else:
-        emp_q = emp_q.filter(models.Employee.id == me_emp.id)
-
-    visible_emp_ids = [row[0] for row in emp_q.all()]
-    if not visible_emp_ids:
-        return []
-
-    q = q.filter(models.LeaveRequest.emp_id.in_(visible_emp_ids))
-    return q.order_by(models.LeaveRequest.start_datetime.desc()).all()
+    rows = keys.page(await db.scalars(keys.apply(stmt, page)), page, response)
+    return _leave_reads(rows, await codes.snapshot_async())
 
 
 @app.post("/api/attendance/leave-requests", response_model=schemas.LeaveRequestRead, status_code=201)
 def create_leave_request(
     payload: schemas.LeaveRequestCreate,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> schemas.LeaveRequestRead:
     if not db.get(models.Employee, payload.emp_id):
         raise HTTPException(status_code=404, detail="Employee not found")
@@ -922,9 +1046,10 @@ def create_leave_request(
         reason=payload.reason,
     )
     db.add(lr)
+    stats.bump(db, leave_requests_pending=1)
     db.commit()
     db.refresh(lr)
-    return lr
+    return _leave_reads([lr], codes.snapshot())[0]
 
 
 @app.post(
@@ -934,7 +1059,7 @@ def create_leave_request(
 def approve_leave_request(
     leave_id: int,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.require_roles("ADMIN", "HR_ADMIN", "MANAGER")),
+    current_user: auth.Principal = Depends(auth.require_roles("ADMIN", "HR_ADMIN", "MANAGER")),
 ) -> schemas.LeaveRequestRead:
     lr = db.get(models.LeaveRequest, leave_id)
     if not lr:
@@ -942,32 +1067,23 @@ def approve_leave_request(
     if lr.status != "REQUESTED":
         raise HTTPException(status_code=400, detail="Leave request is not pending")
 
-    # MANAGER 인 경우, 본인 부서 직원만 승인 가능
-    role = getattr(current_user, "role", None)
-    if role == "MANAGER":
-        me_emp = (
-            db.query(models.Employee)
-            .filter(models.Employee.user_id == current_user.id)
-            .first()
-        )
-        if not me_emp:
-            raise HTTPException(status_code=403, detail="Not enough permissions")
-        target_emp = db.get(models.Employee, lr.emp_id)
-        if not target_emp or target_emp.dept_id != me_emp.dept_id:
-            raise HTTPException(status_code=403, detail="Not enough permissions")
-
-    approver_emp = (
-        db.query(models.Employee)
-        .filter(models.Employee.user_id == current_user.id)
-        .first()
-    )
+    # 승인자 데이터 스코프(MANAGER 는 본인 부서) 안의 직원만 승인/반려 가능
+    scope = scopes.scope_for(current_user)
+    if not scope.is_all and db.scalar(scope.contains(lr.emp_id)) is None:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
 
     lr.status = "APPROVED"
     lr.approved_at = datetime.now(timezone.utc)
-    lr.approver_emp_id = approver_emp.id if approver_emp else None
+    lr.approver_emp_id = current_user.emp_id
+    db.flush()
+    stats.bump(db, leave_requests_pending=-1)
+    # 승인된 휴가일은 결근에서 빠지므로 해당 월 근태요약 갱신
+    attendance.refresh_summaries(
+        db, {(lr.emp_id, ym) for ym in attendance.months_between(lr.start_datetime, lr.end_datetime)}
+    )
     db.commit()
     db.refresh(lr)
-    return lr
+    return _leave_reads([lr], codes.snapshot())[0]
 
 
 @app.post(
@@ -977,7 +1093,7 @@ def approve_leave_request(
 def reject_leave_request(
     leave_id: int,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.require_roles("ADMIN", "HR_ADMIN", "MANAGER")),
+    current_user: auth.Principal = Depends(auth.require_roles("ADMIN", "HR_ADMIN", "MANAGER")),
 ) -> schemas.LeaveRequestRead:
     lr = db.get(models.LeaveRequest, leave_id)
     if not lr:
@@ -985,81 +1101,86 @@ def reject_leave_request(
     if lr.status != "REQUESTED":
         raise HTTPException(status_code=400, detail="Leave request is not pending")
 
-    role = getattr(current_user, "role", None)
-    if role == "MANAGER":
-        me_emp = (
-            db.query(models.Employee)
-            .filter(models.Employee.user_id == current_user.id)
-            .first()
-        )
-        if not me_emp:
-            raise HTTPException(status_code=403, detail="Not enough permissions")
-        target_emp = db.get(models.Employee, lr.emp_id)
-        if not target_emp or target_emp.dept_id != me_emp.dept_id:
-            raise HTTPException(status_code=403, detail="Not enough permissions")
-
-    approver_emp = (
-        db.query(models.Employee)
-        .filter(models.Employee.user_id == current_user.id)
-        .first()
-    )
+    # 승인자 데이터 스코프(MANAGER 는 본인 부서) 안의 직원만 승인/반려 가능
+    scope = scopes.scope_for(current_user)
+    if not scope.is_all and db.scalar(scope.contains(lr.emp_id)) is None:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
 
     lr.status = "REJECTED"
     lr.approved_at = datetime.now(timezone.utc)
-    lr.approver_emp_id = approver_emp.id if approver_emp else None
+    lr.approver_emp_id = current_user.emp_id
+    stats.bump(db, leave_requests_pending=-1)
     db.commit()
     db.refresh(lr)
-    return lr
+    return _leave_reads([lr], codes.snapshot())[0]
 
 
-@app.post("/api/attendance/close-month")
+@app.post("/api/attendance/aggregate-month", response_model=schemas.JobRead, status_code=202)
+def aggregate_attendance_month(
+    year_month: str = Query(..., pattern=r"^\d{6}$"),
+    db: Session = Depends(database.get_db),
+    current_user: auth.Principal = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
+) -> schemas.JobRead:
+    """Recompute the month's AttendanceMonthSummary rows from time logs (closed rows are kept)."""
+    job = jobs.submit_job(
+        db, "ATTENDANCE_AGGREGATE_MONTH", {"year_month": year_month}, current_user.id
+    )
+    return _job_read(job)
+
+
+@app.post("/api/attendance/close-month", response_model=schemas.JobRead, status_code=202)
 def close_attendance_month(
     year_month: str,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
-) -> dict[str, int]:
-    q = db.query(models.AttendanceMonthSummary).filter(
-        models.AttendanceMonthSummary.year_month == year_month
+    current_user: auth.Principal = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
+) -> schemas.JobRead:
+    job = jobs.submit_job(
+        db, "ATTENDANCE_CLOSE_MONTH", {"year_month": year_month}, current_user.id
     )
-    updated = q.update({models.AttendanceMonthSummary.is_locked: True})
-    db.commit()
-    return {"locked_rows": updated}
+    return _job_read(job)
 
 
 @app.get("/api/dashboard/stats", response_model=schemas.DashboardStats)
-def get_dashboard_stats(
-    db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+async def get_dashboard_stats(
+    db: AsyncSession = Depends(database.get_async_read_db),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> schemas.DashboardStats:
-    total = db.query(models.Employee).count()
-    active = db.query(models.Employee).filter(models.Employee.status == "ACTIVE").count()
-    dept_count = db.query(models.Department).count()
-    pg_count = db.query(models.PayGroup).count()
-    run_count = db.query(models.PayRun).count()
-    leave_pending = db.query(models.LeaveRequest).filter(
-        models.LeaveRequest.status == "REQUESTED"
-    ).count()
+    s = models.DashboardStat
+    row = (
+        await db.execute(select(*(getattr(s, k) for k in stats.COUNTERS)).where(s.id == stats.STATS_ID))
+    ).first()
+    if row is None:
+        # 집계 행이 생기기 전(정합성 작업 전)에는 SQL 집계로 직접 계산
+        row = (await db.execute(stats.aggregate_stmt())).one()
+    values = row._mapping
+    total, active = values["total_employees"], values["active_employees"]
     turnover_rate = (total - active) / total if total > 0 else 0.0
-    total_payroll = sum(
-        float(r.net_amount) for r in db.query(models.PayResult).all()
-    )
     return schemas.DashboardStats(
         total_employees=total,
         active_employees=active,
-        department_count=dept_count,
-        pay_group_count=pg_count,
-        pay_run_count=run_count,
-        leave_requests_pending=leave_pending,
+        department_count=values["department_count"],
+        pay_group_count=values["pay_group_count"],
+        pay_run_count=values["pay_run_count"],
+        leave_requests_pending=values["leave_requests_pending"],
         turnover_rate=round(turnover_rate * 100, 1),
-        total_payroll=total_payroll,
+        total_payroll=float(values["total_payroll"] or 0),
     )
 
 
+@app.post("/api/dashboard/stats/reconcile", response_model=schemas.JobRead, status_code=202)
+def reconcile_dashboard_stats(
+    db: Session = Depends(database.get_db),
+    current_user: auth.Principal = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
+) -> schemas.JobRead:
+    job = jobs.submit_job(db, "DASHBOARD_RECONCILE", {}, current_user.id)
+    return _job_read(job)
+
+
 # ---- Payroll runs ----
 @app.get("/api/payroll/runs", response_model=list[schemas.PayRunRead])
 def list_pay_runs(
-    db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+    db: Session = Depends(database.get_read_db),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> list[schemas.PayRunRead]:
     runs = db.query(models.PayRun).order_by(
         models.PayRun.year_month.desc(), models.PayRun.id.desc()
@@ -1071,13 +1192,14 @@ def list_pay_runs(
 def create_pay_run(
     payload: schemas.PayRunCreate,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> schemas.PayRunRead:
     pg = db.get(models.PayGroup, payload.pay_group_id)
     if not pg:
         raise HTTPException(status_code=404, detail="Pay group not found")
     run = models.PayRun(**payload.model_dump())
     db.add(run)
+    stats.bump(db, pay_run_count=1)
     db.commit()
     db.refresh(run)
     return run
@@ -1089,111 +1211,106 @@ def create_pay_run(
 )
 def list_pay_results_by_run(
     run_id: int,
-    db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+    response: Response,
+    page: pagination.PageParams = Depends(pagination.page_params),
+    db: Session = Depends(database.get_read_db),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> list[schemas.PayResultRead]:
     run = db.get(models.PayRun, run_id)
     if not run:
         raise HTTPException(status_code=404, detail="Payroll run not found")
 
-    role = getattr(current_user, "role", None)
-    q = db.query(models.PayResult).filter(models.PayResult.pay_run_id == run_id)
-
-    # ADMIN / HR_ADMIN 은 전체 결과 조회
-    if role in ("ADMIN", "HR_ADMIN"):
-        return list(q)
-
-    # 나머지 역할은 Employee 스코프 기준으로 제한
-    me_emp = (
-        db.query(models.Employee)
-        .filter(models.Employee.user_id == current_user.id)
-        .first()
-    )
-    if not me_emp:
-        return []
-
-    emp_q = db.query(models.Employee.id)
-    if role == "MANAGER":
-        emp_q = emp_q.filter(models.Employee.dept_id == me_emp.dept_id)
-    else:
-        emp_q = emp_q.filter(models.Employee.id == me_emp.id)
-
-    visible_emp_ids = [row[0] for row in emp_q.all()]
-    if not visible_emp_ids:
+    scope = scopes.scope_for(current_user)
+    if scope.is_empty:
         return []
-
-    q = q.filter(models.PayResult.emp_id.in_(visible_emp_ids))
-    return list(q)
+    q = db.query(models.PayResult).filter(
+        models.PayResult.pay_run_id == run_id,
+        scope.employee_clause(models.PayResult.emp_id),
+    )
+    # (pay_run_id, emp_id) 유니크 인덱스 순서
+    keys = pagination.Keyset((models.PayResult.emp_id,))
+    return keys.page(keys.apply(q, page), page, response)
 
 
-@app.post("/api/payroll/runs/{run_id}/calculate")
+@app.post(
+    "/api/payroll/runs/{run_id}/calculate",
+    response_model=schemas.JobRead,
+    status_code=202,
+)
 def calculate_payroll_run(
     run_id: int,
+    batch_size: int = Query(payroll.DEFAULT_BATCH_SIZE, ge=1, le=10000),
+    chunks: int = Query(payroll.DEFAULT_CHUNKS, ge=1, le=64),
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
-) -> dict[str, int]:
+    current_user: auth.Principal = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
+) -> schemas.JobRead:
     run = db.get(models.PayRun, run_id)
     if not run:
         raise HTTPException(status_code=404, detail="Payroll run not found")
 
-    # 같은 급여그룹의 ACTIVE 직원 대상
-    employees = (
-        db.query(models.Employee)
-        .filter(
-            models.Employee.pay_group_id == run.pay_group_id,
-            models.Employee.status == "ACTIVE",
-        )
-        .all()
+    # 같은 급여그룹의 ACTIVE 직원 대상 계산은 작업 큐에서 실행 (급여항목 산식은 실행당 한 번만 컴파일)
+    job = jobs.submit_job(
+        db,
+        "PAYROLL_CALCULATE",
+        {"run_id": run_id, "batch_size": batch_size, "chunks": chunks},
+        current_user.id,
+    )
+    return _job_read(job)
+
+
+# ---- Jobs (장시간 관리작업) ----
+def _job_read(job: models.Job) -> schemas.JobRead:
+    return schemas.JobRead(
+        id=job.id,
+        job_type=job.job_type,
+        status=job.status,
+        progress=job.progress or 0,
+        result=json.loads(job.result) if job.result else None,
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
     )
 
-    created = 0
-    updated = 0
-    for emp in employees:
-        summary = (
-            db.query(models.AttendanceMonthSummary)
-            .filter(
-                models.AttendanceMonthSummary.emp_id == emp.id,
-                models.AttendanceMonthSummary.year_month == run.year_month,
-            )
-            .first()
-        )
-        worked_hours = float(summary.worked_hours) if summary else 0.0
 
-        # 매우 단순한 예시 계산 로직 (시급 20,000원 가정)
-        gross = worked_hours * 20000
-        deduct = gross * 0.1  # 10% 공제 가정
-        net = gross - deduct
+@app.get("/api/jobs/{job_id}", response_model=schemas.JobRead)
+def get_job(
+    job_id: int,
+    db: Session = Depends(database.get_read_db),
+    current_user: auth.Principal = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
+) -> schemas.JobRead:
+    job = db.get(models.Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _job_read(job)
 
-        pr = (
-            db.query(models.PayResult)
-            .filter(
-                models.PayResult.pay_run_id == run.id,
-                models.PayResult.emp_id == emp.id,
-            )
-            .first()
-        )
-        if pr:
-            pr.gross_amount = gross
-            pr.deduct_amount = deduct
-            pr.net_amount = net
-            pr.status = "CALCULATED"
-            updated += 1
-        else:
-            pr = models.PayResult(
-                pay_run_id=run.id,
-                emp_id=emp.id,
-                gross_amount=gross,
-                deduct_amount=deduct,
-                net_amount=net,
-                status="CALCULATED",
-            )
-            db.add(pr)
-            created += 1
 
-    run.status = "CALCULATED"
-    run.calculated_at = datetime.now(timezone.utc)
-    db.commit()
-    return {"created": created, "updated": updated}
+@app.get("/api/jobs/{job_id}/result")
+def get_job_result(
+    job_id: int,
+    db: Session = Depends(database.get_read_db),
+    current_user: auth.Principal = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
+) -> dict:
+    job = db.get(models.Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status == "FAILED":
+        raise HTTPException(status_code=409, detail=job.error or "Job failed")
+    if job.status != "SUCCEEDED":
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    return json.loads(job.result) if job.result else {}
+
+
+@app.post("/api/jobs/{job_id}/cancel", response_model=schemas.JobRead)
+def cancel_job(
+    job_id: int,
+    db: Session = Depends(database.get_db),
+    current_user: auth.Principal = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
+) -> schemas.JobRead:
+    job = db.get(models.Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _job_read(jobs.cancel_job(db, job))
 
 
 # ---- Permission requests ----
@@ -1205,7 +1322,7 @@ def calculate_payroll_run(
 def create_permission_request(
     payload: schemas.PermissionRequestCreate,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> schemas.PermissionRequestRead:
     requested_role = payload.requested_role
     if requested_role not in REQUESTABLE_ROLES:
@@ -1233,8 +1350,8 @@ def create_permission_request(
     response_model=list[schemas.PermissionRequestRead],
 )
 def list_my_permission_requests(
-    db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+    db: Session = Depends(database.get_read_db),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> list[schemas.PermissionRequestRead]:
     return (
         db.query(models.PermissionRequest)
@@ -1249,14 +1366,19 @@ def list_my_permission_requests(
     response_model=list[schemas.PermissionRequestRead],
 )
 def list_permission_requests(
+    response: Response,
     status: str | None = Query(None),
-    db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
+    page: pagination.PageParams = Depends(pagination.page_params),
+    db: Session = Depends(database.get_read_db),
+    current_user: auth.Principal = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
 ) -> list[schemas.PermissionRequestRead]:
     q = db.query(models.PermissionRequest)
     if status is not None:
         q = q.filter(models.PermissionRequest.status == status)
-    return q.order_by(models.PermissionRequest.created_at.desc()).all()
+    keys = pagination.Keyset(
+        (models.PermissionRequest.created_at, models.PermissionRequest.id), descending=True
+    )
+    return keys.page(keys.apply(q, page), page, response)
 
 
 @app.post(
@@ -1266,7 +1388,7 @@ def list_permission_requests(
 def approve_permission_request(
     req_id: int,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
+    current_user: auth.Principal = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
 ) -> schemas.PermissionRequestRead:
     pr = db.get(models.PermissionRequest, req_id)
     if not pr:
@@ -1294,7 +1416,7 @@ def approve_permission_request(
 def reject_permission_request(
     req_id: int,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
+    current_user: auth.Principal = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
 ) -> schemas.PermissionRequestRead:
     pr = db.get(models.PermissionRequest, req_id)
     if not pr:
@@ -1313,8 +1435,8 @@ def reject_permission_request(
 # ---- Evaluation ----
 @app.get("/api/evaluations/plans", response_model=list[schemas.EvaluationPlanRead])
 def list_evaluation_plans(
-    db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+    db: Session = Depends(database.get_read_db),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> list[schemas.EvaluationPlanRead]:
     return (
         db.query(models.EvaluationPlan)
@@ -1331,7 +1453,7 @@ def list_evaluation_plans(
 def create_evaluation_plan(
     payload: schemas.EvaluationPlanCreate,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
+    current_user: auth.Principal = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
 ) -> schemas.EvaluationPlanRead:
     plan = models.EvaluationPlan(**payload.model_dump())
     db.add(plan)
@@ -1345,7 +1467,7 @@ def update_evaluation_plan(
     plan_id: int,
     payload: schemas.EvaluationPlanUpdate,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
+    current_user: auth.Principal = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
 ) -> schemas.EvaluationPlanRead:
     plan = db.get(models.EvaluationPlan, plan_id)
     if not plan:
@@ -1364,21 +1486,16 @@ def update_evaluation_plan(
 )
 def get_my_evaluation_result(
     plan_id: int,
-    db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+    db: Session = Depends(database.get_read_db),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> schemas.EvaluationResultRead | None:
-    me_emp = (
-        db.query(models.Employee)
-        .filter(models.Employee.user_id == current_user.id)
-        .first()
-    )
-    if not me_emp:
+    if current_user.emp_id is None:
         return None
     res = (
         db.query(models.EvaluationResult)
         .filter(
             models.EvaluationResult.plan_id == plan_id,
-            models.EvaluationResult.emp_id == me_emp.id,
+            models.EvaluationResult.emp_id == current_user.emp_id,
         )
         .first()
     )
@@ -1393,14 +1510,9 @@ def get_my_evaluation_result(
 def upsert_my_evaluation_result(
     payload: schemas.EvaluationResultCreate,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> schemas.EvaluationResultRead:
-    me_emp = (
-        db.query(models.Employee)
-        .filter(models.Employee.user_id == current_user.id)
-        .first()
-    )
-    if not me_emp:
+    if current_user.emp_id is None:
         raise HTTPException(status_code=400, detail="Employee profile not linked")
 
     plan = db.get(models.EvaluationPlan, payload.plan_id)
@@ -1413,7 +1525,7 @@ def upsert_my_evaluation_result(
         db.query(models.EvaluationResult)
         .filter(
             models.EvaluationResult.plan_id == payload.plan_id,
-            models.EvaluationResult.emp_id == me_emp.id,
+            models.EvaluationResult.emp_id == current_user.emp_id,
             models.EvaluationResult.evaluator_emp_id.is_(None),
         )
         .first()
@@ -1424,7 +1536,7 @@ def upsert_my_evaluation_result(
     else:
         res = models.EvaluationResult(
             plan_id=payload.plan_id,
-            emp_id=me_emp.id,
+            emp_id=current_user.emp_id,
             evaluator_emp_id=None,
             score=float(payload.score),
             comment=payload.comment,
@@ -1441,8 +1553,8 @@ def upsert_my_evaluation_result(
 )
 def list_evaluation_items(
     plan_id: int,
-    db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+    db: Session = Depends(database.get_read_db),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> list[schemas.EvaluationItemRead]:
     if not db.get(models.EvaluationPlan, plan_id):
         raise HTTPException(status_code=404, detail="Plan not found")
@@ -1462,7 +1574,7 @@ def list_evaluation_items(
 def create_evaluation_item(
     payload: schemas.EvaluationItemCreate,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
+    current_user: auth.Principal = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
 ) -> schemas.EvaluationItemRead:
     if not db.get(models.EvaluationPlan, payload.plan_id):
         raise HTTPException(status_code=404, detail="Plan not found")
@@ -1481,7 +1593,7 @@ def update_evaluation_item(
     item_id: int,
     payload: schemas.EvaluationItemUpdate,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
+    current_user: auth.Principal = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
 ) -> schemas.EvaluationItemRead:
     item = db.get(models.EvaluationItem, item_id)
     if not item:
@@ -1499,15 +1611,10 @@ def update_evaluation_item(
 )
 def get_my_evaluation_scores(
     plan_id: int,
-    db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+    db: Session = Depends(database.get_read_db),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> list[schemas.EvaluationItemWithMyScore]:
-    me_emp = (
-        db.query(models.Employee)
-        .filter(models.Employee.user_id == current_user.id)
-        .first()
-    )
-    if not me_emp:
+    if current_user.emp_id is None:
         return []
     items = (
         db.query(models.EvaluationItem)
@@ -1519,7 +1626,7 @@ def get_my_evaluation_scores(
         db.query(models.EvaluationResult)
         .filter(
             models.EvaluationResult.plan_id == plan_id,
-            models.EvaluationResult.emp_id == me_emp.id,
+            models.EvaluationResult.emp_id == current_user.emp_id,
             models.EvaluationResult.evaluator_emp_id.is_(None),
         )
         .first()
@@ -1555,14 +1662,9 @@ def get_my_evaluation_scores(
 def upsert_my_evaluation_scores(
     payload: schemas.MyEvaluationUpsertRequest,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> list[schemas.EvaluationItemWithMyScore]:
-    me_emp = (
-        db.query(models.Employee)
-        .filter(models.Employee.user_id == current_user.id)
-        .first()
-    )
-    if not me_emp:
+    if current_user.emp_id is None:
         raise HTTPException(status_code=400, detail="Employee profile not linked")
     plan = db.get(models.EvaluationPlan, payload.plan_id)
     if not plan:
@@ -1574,7 +1676,7 @@ def upsert_my_evaluation_scores(
         db.query(models.EvaluationResult)
         .filter(
             models.EvaluationResult.plan_id == payload.plan_id,
-            models.EvaluationResult.emp_id == me_emp.id,
+            models.EvaluationResult.emp_id == current_user.emp_id,
             models.EvaluationResult.evaluator_emp_id.is_(None),
         )
         .first()
@@ -1582,7 +1684,7 @@ def upsert_my_evaluation_scores(
     if not res:
         res = models.EvaluationResult(
             plan_id=payload.plan_id,
-            emp_id=me_emp.id,
+            emp_id=current_user.emp_id,
             evaluator_emp_id=None,
             score=0,
             comment=None,
@@ -1664,14 +1766,9 @@ def _build_item_scores_for_result(
 def upsert_team_evaluation_scores(
     payload: schemas.TeamEvaluationUpsertRequest,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.require_roles("ADMIN", "HR_ADMIN", "MANAGER")),
+    current_user: auth.Principal = Depends(auth.require_roles("ADMIN", "HR_ADMIN", "MANAGER")),
 ) -> list[schemas.EvaluationItemWithMyScore]:
-    me_emp = (
-        db.query(models.Employee)
-        .filter(models.Employee.user_id == current_user.id)
-        .first()
-    )
-    if not me_emp:
+    if current_user.emp_id is None:
         raise HTTPException(status_code=400, detail="Employee profile not linked")
     plan = db.get(models.EvaluationPlan, payload.plan_id)
     if not plan:
@@ -1682,8 +1779,8 @@ def upsert_team_evaluation_scores(
     target_emp = db.get(models.Employee, payload.target_emp_id)
     if not target_emp:
         raise HTTPException(status_code=404, detail="Target employee not found")
-    role = getattr(current_user, "role", None)
-    if role == "MANAGER" and target_emp.dept_id != me_emp.dept_id:
+    scope = scopes.scope_for(current_user)
+    if not scope.is_all and db.scalar(scope.contains(target_emp.id)) is None:
         raise HTTPException(status_code=403, detail="Not enough permissions")
 
     res = (
@@ -1691,7 +1788,7 @@ def upsert_team_evaluation_scores(
         .filter(
             models.EvaluationResult.plan_id == payload.plan_id,
             models.EvaluationResult.emp_id == payload.target_emp_id,
-            models.EvaluationResult.evaluator_emp_id == me_emp.id,
+            models.EvaluationResult.evaluator_emp_id == current_user.emp_id,
         )
         .first()
     )
@@ -1699,7 +1796,7 @@ def upsert_team_evaluation_scores(
         res = models.EvaluationResult(
             plan_id=payload.plan_id,
             emp_id=payload.target_emp_id,
-            evaluator_emp_id=me_emp.id,
+            evaluator_emp_id=current_user.emp_id,
             score=0,
             comment=None,
         )
@@ -1742,40 +1839,33 @@ def upsert_team_evaluation_scores(
     return _build_item_scores_for_result(db, payload.plan_id, res.id)
 
 
-@app.post("/api/evaluations/plans/{plan_id}/targets/seed")
+@app.post(
+    "/api/evaluations/plans/{plan_id}/targets/seed",
+    response_model=schemas.JobRead,
+    status_code=202,
+)
 def seed_evaluation_targets(
     plan_id: int,
+    dept_id: int | None = Query(None, description="Only this department and its sub-departments"),
+    pay_group_id: int | None = Query(None),
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
-) -> dict[str, int]:
+    current_user: auth.Principal = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
+) -> schemas.JobRead:
     plan = db.get(models.EvaluationPlan, plan_id)
     if not plan:
         raise HTTPException(status_code=404, detail="Plan not found")
-    employees = (
-        db.query(models.Employee)
-        .filter(models.Employee.status == "ACTIVE")
-        .all()
+    if dept_id is not None and not db.get(models.Department, dept_id):
+        raise HTTPException(status_code=404, detail="Department not found")
+    if pay_group_id is not None and not db.get(models.PayGroup, pay_group_id):
+        raise HTTPException(status_code=404, detail="Pay group not found")
+    params = {"plan_id": plan_id, "dept_id": dept_id, "pay_group_id": pay_group_id}
+    job = jobs.submit_job(
+        db,
+        "EVALUATION_SEED_TARGETS",
+        {k: v for k, v in params.items() if v is not None},
+        current_user.id,
     )
-    created = 0
-    for emp in employees:
-        if (
-            db.query(models.EvaluationTarget)
-            .filter(
-                models.EvaluationTarget.plan_id == plan_id,
-                models.EvaluationTarget.emp_id == emp.id,
-            )
-            .first()
-        ):
-            continue
-        target = models.EvaluationTarget(
-            plan_id=plan_id,
-            emp_id=emp.id,
-            status="PENDING",
-        )
-        db.add(target)
-        created += 1
-    db.commit()
-    return {"created": created}
+    return _job_read(job)
 
 
 @app.get(
@@ -1784,8 +1874,8 @@ def seed_evaluation_targets(
 )
 def list_grade_policies(
     plan_id: int,
-    db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+    db: Session = Depends(database.get_read_db),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> list[schemas.GradePolicyRead]:
     if not db.get(models.EvaluationPlan, plan_id):
         raise HTTPException(status_code=404, detail="Plan not found")
@@ -1806,7 +1896,7 @@ def create_grade_policy(
     plan_id: int,
     payload: schemas.GradePolicyCreate,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
+    current_user: auth.Principal = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
 ) -> schemas.GradePolicyRead:
     if not db.get(models.EvaluationPlan, plan_id):
         raise HTTPException(status_code=404, detail="Plan not found")
@@ -1823,41 +1913,32 @@ def create_grade_policy(
     return gp
 
 
-@app.post("/api/evaluations/plans/{plan_id}/aggregate")
+@app.post(
+    "/api/evaluations/plans/{plan_id}/aggregate",
+    response_model=schemas.JobRead,
+    status_code=202,
+)
 def aggregate_evaluation_plan(
     plan_id: int,
+    payload: schemas.GradeAggregateRequest | None = None,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
-) -> dict[str, int]:
+    current_user: auth.Principal = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
+) -> schemas.JobRead:
     plan = db.get(models.EvaluationPlan, plan_id)
     if not plan:
         raise HTTPException(status_code=404, detail="Plan not found")
-    policies = (
-        db.query(models.GradePolicy)
-        .filter(models.GradePolicy.plan_id == plan_id)
-        .order_by(models.GradePolicy.min_score)
-        .all()
-    )
-    results = (
-        db.query(models.EvaluationResult)
-        .filter(models.EvaluationResult.plan_id == plan_id)
-        .all()
-    )
-    updated = 0
-    for res in results:
-        score = float(res.score)
-        grade = None
-        is_promo = False
-        for gp in policies:
-            if gp.min_score <= score <= gp.max_score:
-                grade = gp.grade
-                is_promo = gp.is_promotion_candidate
-                break
-        res.grade = grade
-        res.is_promotion_candidate = is_promo
-        updated += 1
-    db.commit()
-    return {"updated": updated}
+    params: dict = {"plan_id": plan_id}
+    if payload is not None and payload.distribution:
+        policies = db.scalars(
+            select(models.GradePolicy).where(models.GradePolicy.plan_id == plan_id)
+        ).all()
+        try:
+            evaluation.GradeTable.compile(policies).ranked(payload.distribution)
+        except evaluation.GradingError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        params["distribution"] = payload.distribution
+    job = jobs.submit_job(db, "EVALUATION_AGGREGATE", params, current_user.id)
+    return _job_read(job)
 
 
 @app.get(
@@ -1866,8 +1947,8 @@ def aggregate_evaluation_plan(
 )
 def list_promotion_candidates(
     plan_id: int,
-    db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
+    db: Session = Depends(database.get_read_db),
+    current_user: auth.Principal = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
 ) -> list[schemas.EmployeeRead]:
     if not db.get(models.EvaluationPlan, plan_id):
         raise HTTPException(status_code=404, detail="Plan not found")
@@ -1889,8 +1970,8 @@ def list_promotion_candidates(
 # ---- Education / Training ----
 @app.get("/api/education/courses", response_model=list[schemas.TrainingCourseRead])
 def list_training_courses(
-    db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+    db: Session = Depends(database.get_read_db),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> list[schemas.TrainingCourseRead]:
     return (
         db.query(models.TrainingCourse)
@@ -1907,7 +1988,7 @@ def list_training_courses(
 def create_training_course(
     payload: schemas.TrainingCourseCreate,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
+    current_user: auth.Principal = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
 ) -> schemas.TrainingCourseRead:
     if db.query(models.TrainingCourse).filter(models.TrainingCourse.code == payload.code).first():
         raise HTTPException(status_code=400, detail="Course code already exists")
@@ -1926,7 +2007,7 @@ def update_training_course(
     course_id: int,
     payload: schemas.TrainingCourseUpdate,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
+    current_user: auth.Principal = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
 ) -> schemas.TrainingCourseRead:
     course = db.get(models.TrainingCourse, course_id)
     if not course:
@@ -1942,8 +2023,8 @@ def update_training_course(
 @app.get("/api/education/sessions", response_model=list[schemas.TrainingSessionRead])
 def list_training_sessions(
     course_id: int | None = Query(None),
-    db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+    db: Session = Depends(database.get_read_db),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> list[schemas.TrainingSessionRead]:
     q = db.query(models.TrainingSession)
     if course_id is not None:
@@ -1959,7 +2040,7 @@ def list_training_sessions(
 def create_training_session(
     payload: schemas.TrainingSessionCreate,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
+    current_user: auth.Principal = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
 ) -> schemas.TrainingSessionRead:
     if not db.get(models.TrainingCourse, payload.course_id):
         raise HTTPException(status_code=404, detail="Course not found")
@@ -1978,7 +2059,7 @@ def update_training_session(
     session_id: int,
     payload: schemas.TrainingSessionUpdate,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
+    current_user: auth.Principal = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
 ) -> schemas.TrainingSessionRead:
     session = db.get(models.TrainingSession, session_id)
     if not session:
@@ -1996,19 +2077,14 @@ def update_training_session(
     response_model=list[schemas.TrainingEnrollmentRead],
 )
 def list_my_enrollments(
-    db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+    db: Session = Depends(database.get_read_db),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> list[schemas.TrainingEnrollmentRead]:
-    me_emp = (
-        db.query(models.Employee)
-        .filter(models.Employee.user_id == current_user.id)
-        .first()
-    )
-    if not me_emp:
+    if current_user.emp_id is None:
         return []
     return (
         db.query(models.TrainingEnrollment)
-        .filter(models.TrainingEnrollment.emp_id == me_emp.id)
+        .filter(models.TrainingEnrollment.emp_id == current_user.emp_id)
         .order_by(models.TrainingEnrollment.created_at.desc())
         .all()
     )
@@ -2022,14 +2098,9 @@ def list_my_enrollments(
 def enroll_training(
     payload: schemas.TrainingEnrollmentCreate,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> schemas.TrainingEnrollmentRead:
-    me_emp = (
-        db.query(models.Employee)
-        .filter(models.Employee.user_id == current_user.id)
-        .first()
-    )
-    if not me_emp:
+    if current_user.emp_id is None:
         raise HTTPException(status_code=400, detail="Employee profile not linked")
     session = db.get(models.TrainingSession, payload.session_id)
     if not session:
@@ -2039,7 +2110,7 @@ def enroll_training(
         db.query(models.TrainingEnrollment)
         .filter(
             models.TrainingEnrollment.session_id == payload.session_id,
-            models.TrainingEnrollment.emp_id == me_emp.id,
+            models.TrainingEnrollment.emp_id == current_user.emp_id,
         )
         .first()
     )
@@ -2048,7 +2119,7 @@ def enroll_training(
 
     enr = models.TrainingEnrollment(
         session_id=payload.session_id,
-        emp_id=me_emp.id,
+        emp_id=current_user.emp_id,
         status="REQUESTED",
     )
     db.add(enr)
@@ -2065,7 +2136,7 @@ def update_training_enrollment(
     enrollment_id: int,
     payload: schemas.EnrollmentStatusUpdate,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
+    current_user: auth.Principal = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
 ) -> schemas.TrainingEnrollmentRead:
     enr = db.get(models.TrainingEnrollment, enrollment_id)
     if not enr:
@@ -2081,14 +2152,20 @@ def update_training_enrollment(
 # ---- Benefits ----
 @app.get("/api/benefits/policies", response_model=list[schemas.BenefitPolicyRead])
 def list_benefit_policies(
-    db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
-) -> list[schemas.BenefitPolicyRead]:
-    return (
-        db.query(models.BenefitPolicy)
-        .filter(models.BenefitPolicy.is_active == True)
-        .order_by(models.BenefitPolicy.code)
-        .all()
+    request: Request,
+    db: Session = Depends(database.get_read_db),
+    current_user: auth.Principal = Depends(auth.get_current_user),
+) -> Response:
+    return refcache.respond(
+        request,
+        ("benefit_policies",),
+        lambda: (
+            db.query(models.BenefitPolicy)
+            .filter(models.BenefitPolicy.is_active == True)
+            .order_by(models.BenefitPolicy.code)
+            .all()
+        ),
+        list[schemas.BenefitPolicyRead],
     )
 
 
@@ -2100,7 +2177,7 @@ def list_benefit_policies(
 def create_benefit_policy(
     payload: schemas.BenefitPolicyCreate,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
+    current_user: auth.Principal = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
 ) -> schemas.BenefitPolicyRead:
     if db.query(models.BenefitPolicy).filter(models.BenefitPolicy.code == payload.code).first():
         raise HTTPException(status_code=400, detail="Policy code already exists")
@@ -2119,7 +2196,7 @@ def create_benefit_policy(
 def create_point_balance(
     payload: schemas.PointBalanceCreate,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
+    current_user: auth.Principal = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
 ) -> schemas.PointBalanceRead:
     if not db.get(models.Employee, payload.emp_id):
         raise HTTPException(status_code=404, detail="Employee not found")
@@ -2154,17 +2231,12 @@ def create_point_balance(
 )
 def list_my_point_balances(
     year: int | None = Query(None),
-    db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+    db: Session = Depends(database.get_read_db),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> list[schemas.PointBalanceRead]:
-    me_emp = (
-        db.query(models.Employee)
-        .filter(models.Employee.user_id == current_user.id)
-        .first()
-    )
-    if not me_emp:
+    if current_user.emp_id is None:
         return []
-    q = db.query(models.PointBalance).filter(models.PointBalance.emp_id == me_emp.id)
+    q = db.query(models.PointBalance).filter(models.PointBalance.emp_id == current_user.emp_id)
     if year is not None:
         q = q.filter(models.PointBalance.year == year)
     return q.all()
@@ -2178,7 +2250,7 @@ def list_my_point_balances(
 def create_point_transaction(
     payload: schemas.PointTransactionCreate,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
+    current_user: auth.Principal = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
 ) -> schemas.PointTransactionRead:
     bal = db.get(models.PointBalance, payload.balance_id)
     if not bal:
@@ -2208,84 +2280,109 @@ def create_point_transaction(
 # ---- Common Codes ----
 @app.get("/api/codes/groups", response_model=list[schemas.CodeGroupRead])
 def list_code_groups(
-    db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
-) -> list[schemas.CodeGroupRead]:
-    return db.query(models.CodeGroup).order_by(models.CodeGroup.code).all()
+    request: Request,
+    current_user: auth.Principal = Depends(auth.get_current_user),
+) -> Response:
+    return refcache.respond(
+        request,
+        ("code_groups",),
+        lambda: list(codes.snapshot().groups.values()),
+        list[schemas.CodeGroupRead],
+    )
+
+
+def _active_codes(snap: codes.CodeSnapshot, group_code: str) -> list[schemas.CodeRead]:
+    try:
+        return list(snap.active_codes(group_code))
+    except codes.UnknownCodeGroup:
+        raise HTTPException(status_code=404, detail=f"Code group not found: {group_code}")
 
 
 @app.get("/api/codes/groups/{group_code}/codes", response_model=list[schemas.CodeRead])
 def list_codes_by_group(
     group_code: str,
-    db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
-) -> list[schemas.CodeRead]:
-    grp = db.query(models.CodeGroup).filter(models.CodeGroup.code == group_code).first()
-    if not grp:
-        raise HTTPException(status_code=404, detail="Code group not found")
-    return (
-        db.query(models.Code)
-        .filter(models.Code.group_id == grp.id, models.Code.is_active == True)
-        .order_by(models.Code.sort_order, models.Code.code)
-        .all()
+    request: Request,
+    current_user: auth.Principal = Depends(auth.get_current_user),
+) -> Response:
+    return refcache.respond(
+        request,
+        ("codes", group_code),
+        lambda: _active_codes(codes.snapshot(), group_code),
+        list[schemas.CodeRead],
+    )
+
+
+@app.get("/api/codes", response_model=dict[str, list[schemas.CodeRead]])
+def list_codes_bulk(
+    request: Request,
+    groups: list[str] = Query(..., description="Group codes, repeated or comma-separated"),
+    current_user: auth.Principal = Depends(auth.get_current_user),
+) -> Response:
+    # 화면의 여러 드롭다운 코드를 한 번에 조회
+    wanted = tuple(dict.fromkeys(g.strip() for value in groups for g in value.split(",") if g.strip()))
+
+    def load() -> dict[str, list[schemas.CodeRead]]:
+        snap = codes.snapshot()
+        return {g: _active_codes(snap, g) for g in wanted}
+
+    return refcache.respond(
+        request, ("codes", "*bulk", wanted), load, dict[str, list[schemas.CodeRead]]
     )
 
 
 # ---- Audit Log ----
 @app.get("/api/audit-logs", response_model=list[schemas.AuditLogRead])
 def list_audit_logs(
+    response: Response,
     entity_type: str | None = Query(None),
-    limit: int = Query(100, le=500),
-    db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
+    page: pagination.PageParams = Depends(pagination.page_params),
+    db: Session = Depends(database.get_read_db),
+    current_user: auth.Principal = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
 ) -> list[schemas.AuditLogRead]:
     q = db.query(models.AuditLog)
     if entity_type:
         q = q.filter(models.AuditLog.entity_type == entity_type)
-    return q.order_by(models.AuditLog.created_at.desc()).limit(limit).all()
+    keys = pagination.Keyset((models.AuditLog.created_at, models.AuditLog.id), descending=True)
+    return keys.page(keys.apply(q, page), page, response)
 
 
 # ---- Time Log (출퇴근) ----
+def _month_range(year_month: str) -> tuple[datetime, datetime]:
+    y, m = int(year_month[:4]), int(year_month[4:6])
+    start = datetime(y, m, 1)
+    end = datetime(y, m + 1, 1) if m < 12 else datetime(y + 1, 1, 1)
+    return start, end
+
+
 @app.get("/api/attendance/time-logs", response_model=list[schemas.TimeLogRead])
-def list_time_logs(
+async def list_time_logs(
+    response: Response,
     emp_id: int | None = Query(None),
     year_month: str | None = Query(None),
-    db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+    page: pagination.PageParams = Depends(pagination.page_params),
+    db: AsyncSession = Depends(database.get_async_read_db),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> list[schemas.TimeLogRead]:
-    role = getattr(current_user, "role", None)
-    me_emp = (
-        db.query(models.Employee)
-        .filter(models.Employee.user_id == current_user.id)
-        .first()
-    )
-    if not me_emp and role not in ("ADMIN", "HR_ADMIN"):
+    scope = scopes.scope_for(current_user)
+    if scope.is_empty:
         return []
-    q = db.query(models.TimeLog)
+    stmt = select(models.TimeLog)
     if emp_id is not None:
-        if role in ("ADMIN", "HR_ADMIN"):
-            pass
-        elif role == "MANAGER":
-            target = db.get(models.Employee, emp_id)
-            if not me_emp or not target or target.dept_id != me_emp.dept_id:
-                return []
-        else:
-            if not me_emp or emp_id != me_emp.id:
-                return []
-        q = q.filter(models.TimeLog.emp_id == emp_id)
-    else:
-        if role not in ("ADMIN", "HR_ADMIN"):
-            q = q.filter(models.TimeLog.emp_id == me_emp.id)
+        stmt = stmt.where(
+            models.TimeLog.emp_id == emp_id,
+            scope.employee_clause(models.TimeLog.emp_id),
+        )
+    elif not scope.is_all:
+        # 대상 직원을 지정하지 않으면 본인 기록만
+        stmt = stmt.where(models.TimeLog.emp_id == current_user.emp_id)
     if year_month:
-        from datetime import datetime as dt
-        y, m = int(year_month[:4]), int(year_month[4:6])
-        start = dt(y, m, 1)
-        end = dt(y, m + 1, 1) if m < 12 else dt(y + 1, 1, 1)
-        q = q.filter(
+        start, end = _month_range(year_month)
+        stmt = stmt.where(
             models.TimeLog.log_datetime >= start,
             models.TimeLog.log_datetime < end,
         )
-    return q.order_by(models.TimeLog.log_datetime.desc()).limit(500).all()
+    keys = pagination.Keyset((models.TimeLog.log_datetime, models.TimeLog.id), descending=True)
+    return keys.page(await db.scalars(keys.apply(stmt, page)), page, response)
 
 
 @app.post(
@@ -2296,17 +2393,12 @@ def list_time_logs(
 def create_time_log(
     payload: schemas.TimeLogCreate,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(auth.get_current_user),
+    current_user: auth.Principal = Depends(auth.get_current_user),
 ) -> schemas.TimeLogRead:
-    me_emp = (
-        db.query(models.Employee)
-        .filter(models.Employee.user_id == current_user.id)
-        .first()
-    )
-    if not me_emp:
+    if current_user.emp_id is None:
         raise HTTPException(status_code=400, detail="Employee profile not linked")
-    emp_id = payload.emp_id if payload.emp_id is not None else me_emp.id
-    if emp_id != me_emp.id:
+    emp_id = payload.emp_id if payload.emp_id is not None else current_user.emp_id
+    if emp_id != current_user.emp_id:
         role = getattr(current_user, "role", None)
         if role not in ("ADMIN", "HR_ADMIN"):
             raise HTTPException(status_code=403, detail="Not enough permissions")
@@ -2316,8 +2408,125 @@ def create_time_log(
         log_type=payload.log_type,
         source=payload.source,
     )
+    if attendance.closed_months(db, {(emp_id, tl.log_datetime.strftime("%Y%m"))}):
+        raise HTTPException(status_code=409, detail="Attendance month is closed")
     db.add(tl)
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Duplicate time log")
+    # 해당 직원의 월 근태요약을 같은 트랜잭션에서 갱신 (/api/attendance/monthly 즉시 반영)
+    attendance.refresh_summaries(
+        db, {(emp_id, ym) for ym in attendance.months_for_punch(tl.log_datetime)}
+    )
     db.commit()
     db.refresh(tl)
     return tl
 
+
+def _parse_time_log_body(body: bytes, content_type: str) -> list:
+    try:
+        if "ndjson" in content_type:
+            return [json.loads(line) for line in body.splitlines() if line.strip()]
+        events = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid JSON body")
+    if not isinstance(events, list):
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+    return events
+
+
+@app.post(
+    "/api/attendance/time-logs/batch",
+    response_model=schemas.TimeLogBatchResult,
+)
+async def ingest_time_logs(
+    request: Request,
+    source: str = Query("DEVICE", max_length=20),
+    device_id: str | None = Query(None, max_length=50),
+    db: Session = Depends(database.get_db),
+    current_user: auth.Principal = Depends(auth.require_roles("ADMIN", "HR_ADMIN")),
+) -> schemas.TimeLogBatchResult:
+    """Bulk clock events from devices: a JSON array or NDJSON (``application/x-ndjson``)."""
+    events = _parse_time_log_body(await request.body(), request.headers.get("content-type", ""))
+    if len(events) > TIME_LOG_BATCH_MAX:
+        raise HTTPException(status_code=413, detail=f"At most {TIME_LOG_BATCH_MAX} events per batch")
+    # 검증·INSERT 는 동기 세션이므로 스레드풀에서 실행
+    result = await run_in_threadpool(
+        attendance.ingest_time_logs, db, events, source=source, device_id=device_id
+    )
+    # 근태요약은 커밋 뒤 큐 작업으로 갱신 (배치 등록이 쓰기 잠금을 오래 잡지 않도록)
+    keys = result.pop("refresh")
+    if keys:
+        job = await run_in_threadpool(
+            jobs.submit_job, db, "ATTENDANCE_REFRESH_SUMMARIES", {"keys": keys}, current_user.id
+        )
+        result["refresh_job_id"] = job.id
+    return result
+
+
+# ---- Export (NDJSON / CSV 스트리밍) ----
+@app.get("/api/export/employees")
+def export_employees(
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    current_user: auth.Principal = Depends(auth.get_current_user),
+):
+    scope = scopes.scope_for(current_user)
+    e = models.Employee
+    stmt = (
+        select(
+            e.id, e.emp_no, e.first_name, e.last_name, e.email, e.phone,
+            e.hire_date, e.terminate_date, e.status, e.dept_id, e.pay_group_id,
+        )
+        .where(scope.employee_clause(e.id, e.dept_id))
+        .order_by(e.emp_no)
+    )
+    return export.stream(stmt, fmt, "employees")
+
+
+@app.get("/api/export/attendance/time-logs")
+def export_time_logs(
+    year_month: str = Query(..., pattern=r"^\d{6}$"),
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    current_user: auth.Principal = Depends(auth.get_current_user),
+):
+    scope = scopes.scope_for(current_user)
+    start, end = _month_range(year_month)
+    t = models.TimeLog
+    stmt = (
+        select(t.id, t.emp_id, models.Employee.emp_no, t.log_datetime, t.log_type, t.source, t.device_id)
+        .join(models.Employee, models.Employee.id == t.emp_id)
+        .where(
+            t.log_datetime >= start,
+            t.log_datetime < end,
+            scope.employee_clause(t.emp_id),
+        )
+        .order_by(t.log_datetime, t.id)
+    )
+    return export.stream(stmt, fmt, f"time_logs_{year_month}")
+
+
+@app.get("/api/export/payroll/runs/{run_id}/results")
+def export_pay_results(
+    run_id: int,
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    db: Session = Depends(database.get_read_db),
+    current_user: auth.Principal = Depends(auth.get_current_user),
+):
+    run = db.get(models.PayRun, run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Payroll run not found")
+
+    scope = scopes.scope_for(current_user)
+    r = models.PayResult
+    stmt = (
+        select(
+            r.emp_id, models.Employee.emp_no, models.Employee.last_name, models.Employee.first_name,
+            r.gross_amount, r.deduct_amount, r.net_amount, r.currency, r.status,
+        )
+        .join(models.Employee, models.Employee.id == r.emp_id)
+        .where(r.pay_run_id == run_id, scope.employee_clause(r.emp_id))
+        .order_by(r.emp_id)
+    )
+    return export.stream(stmt, fmt, f"pay_results_{run.year_month}_{run.id}")
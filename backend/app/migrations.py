@@ -0,0 +1,460 @@
+"""Versioned schema migrations.
+
+Applied versions are recorded in ``schema_migrations``; when the schema is current
+``run_migrations`` only reads that table. Run offline before a deploy with::
+
+    python -m app.migrations             # apply pending migrations
+    python -m app.migrations status      # list applied / pending versions
+    python -m app.migrations duplicates  # rows that block a unique key
+    python -m app.migrations dedupe      # keep the newest row of each duplicate key
+
+Migrations never delete data: a unique key that existing rows violate fails its migration
+(it stays pending) until the duplicates are resolved by hand or with ``dedupe``.
+"""
+
+import logging
+import sys
+from datetime import datetime
+from typing import Callable
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    func,
+    inspect,
+    select,
+    text,
+)
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import IntegrityError
+
+from .database import Base
+
+logger = logging.getLogger(__name__)
+
+
+class MigrationError(RuntimeError):
+    pass
+
+_meta = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _meta,
+    Column("version", Integer, primary_key=True),
+    Column("name", String(100)),
+    Column("applied_at", DateTime, default=datetime.utcnow),
+)
+
+
+def _add_missing_columns(conn: Connection, table: str, columns: list[tuple[str, str]]) -> None:
+    existing = {c["name"] for c in inspect(conn).get_columns(table)}
+    for col, typ in columns:
+        if col not in existing:
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {col} {typ}"))
+
+
+def _initial_schema(conn: Connection) -> None:
+    from . import baseline_schema
+
+    # 버전 관리 이전 스키마 그대로 생성 (이후 추가된 테이블/컬럼/인덱스는 각 버전에서 생성)
+    baseline_schema.metadata.create_all(bind=conn)
+
+
+def _users_auth_columns(conn: Connection) -> None:
+    _add_missing_columns(
+        conn,
+        "users",
+        [
+            ("email", "VARCHAR(255)"),
+            ("email_verified", "INTEGER DEFAULT 0"),
+            ("role", "VARCHAR(50) DEFAULT 'EMPLOYEE'"),
+            ("reset_token", "VARCHAR(255)"),
+            ("reset_token_expires", "DATETIME"),
+            ("verification_token", "VARCHAR(255)"),
+        ],
+    )
+
+
+def _employees_user_id(conn: Connection) -> None:
+    _add_missing_columns(conn, "employees", [("user_id", "INTEGER")])
+
+
+def _leave_request_approval_columns(conn: Connection) -> None:
+    _add_missing_columns(
+        conn,
+        "leave_requests",
+        [("approver_emp_id", "INTEGER"), ("approved_at", "DATETIME")],
+    )
+
+
+def _evaluation_result_grade_columns(conn: Connection) -> None:
+    _add_missing_columns(
+        conn,
+        "evaluation_results",
+        [
+            ("evaluator_emp_id", "INTEGER"),
+            ("grade", "VARCHAR(10)"),
+            ("is_promotion_candidate", "INTEGER DEFAULT 0"),
+        ],
+    )
+
+
+def _pay_item_formula(conn: Connection) -> None:
+    _add_missing_columns(conn, "pay_items", [("formula", "VARCHAR(500)")])
+
+
+def _delete_rows(conn: Connection, table: Table, ids: list[int]) -> None:
+    # 이 행을 참조하는 하위 행부터 삭제 (예: pay_results -> pay_result_items)
+    for child in Base.metadata.sorted_tables:
+        for fk in child.foreign_keys:
+            if fk.column is not table.c.id or child is table:
+                continue
+            for i in range(0, len(ids), 500):
+                parents = fk.parent.in_(ids[i : i + 500])
+                if "id" not in child.c:
+                    conn.execute(child.delete().where(parents))
+                    continue
+                child_ids = list(conn.execute(select(child.c.id).where(parents)).scalars())
+                if child_ids:
+                    _delete_rows(conn, child, child_ids)
+    for i in range(0, len(ids), 500):
+        conn.execute(table.delete().where(table.c.id.in_(ids[i : i + 500])))
+
+
+def _duplicate_keys(conn: Connection, index) -> list[tuple]:
+    key = list(index.expressions)
+    return [tuple(r) for r in conn.execute(select(*key).group_by(*key).having(func.count() > 1))]
+
+
+def find_duplicates(conn: Connection) -> dict[str, list[tuple[tuple, list[int]]]]:
+    """Rows violating a unique key of the current models: index name -> [(key, row ids)]."""
+    from . import models  # noqa: F401
+
+    insp = inspect(conn)
+    existing = set(insp.get_table_names())
+    found: dict[str, list[tuple[tuple, list[int]]]] = {}
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing:
+            continue
+        columns = {c["name"] for c in insp.get_columns(table.name)}
+        for index in sorted(table.indexes, key=lambda i: i.name):
+            # 아직 컬럼이 추가되지 않은 키는 해당 마이그레이션 이후에 확인
+            if not index.unique or not set(index.columns.keys()) <= columns:
+                continue
+            key = list(index.expressions)
+            for values in _duplicate_keys(conn, index):
+                ids = conn.execute(
+                    select(table.c.id)
+                    .where(*(k.is_not_distinct_from(v) for k, v in zip(key, values)))
+                    .order_by(table.c.id)
+                ).scalars().all()
+                found.setdefault(index.name, []).append((values, list(ids)))
+    return found
+
+
+def dedupe(conn: Connection) -> dict[str, int]:
+    """Offline cleanup: keep the newest (max id) row of each duplicate key and delete the rest.
+
+    Child rows referencing a deleted row are deleted with it and the dashboard counters are
+    recomputed. Returns the number of deleted rows per index.
+    """
+    from . import stats
+
+    deleted: dict[str, int] = {}
+    for name, groups in find_duplicates(conn).items():
+        table = next(i.table for t in Base.metadata.sorted_tables for i in t.indexes if i.name == name)
+        ids = [i for _, group in groups for i in group[:-1]]
+        _delete_rows(conn, table, ids)
+        deleted[name] = len(ids)
+        logger.warning("Deleted %s duplicate %s row(s) for %s", len(ids), table.name, name)
+    if deleted and inspect(conn).has_table("dashboard_stats"):
+        stats.refresh(conn)
+    return deleted
+
+
+def _has_index(conn: Connection, table: str, name: str) -> bool:
+    if conn.dialect.name == "sqlite":
+        # SQLite 리플렉션은 식 인덱스를 건너뛰므로 카탈로그를 직접 조회
+        found = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = :name"), {"name": name}
+        )
+        return found.first() is not None
+    return inspect(conn).has_index(table, name)
+
+
+def _create_index(conn: Connection, index) -> None:
+    if _has_index(conn, index.table.name, index.name):
+        return
+    # UNIQUE 키를 어기는 행이 있으면 삭제하지 않고 실패 (마이그레이션이 롤백되어 미적용으로 남음)
+    if index.unique:
+        keys = _duplicate_keys(conn, index)
+        if keys:
+            sample = ", ".join(map(str, keys[:5]))
+            raise MigrationError(
+                f"{len(keys)} duplicate key(s) in {index.table.name} block unique index {index.name} "
+                f"(e.g. {sample}). List them with `python -m app.migrations duplicates`, resolve them "
+                "or keep only the newest row with `python -m app.migrations dedupe`, then migrate again."
+            )
+    index.create(bind=conn)
+
+
+def _index(conn: Connection, table: str, name: str, *columns, unique: bool = False) -> Index:
+    """Index on the table as it exists in the database; ``columns`` are names or ``fn(t) -> expression``."""
+    t = Table(table, MetaData(), autoload_with=conn)
+    return Index(name, *(t.c[c] if isinstance(c, str) else c(t) for c in columns), unique=unique)
+
+
+# v7 에서 만드는 (테이블, 인덱스, 컬럼, UNIQUE 여부)
+_HOT_PATH_INDEXES = [
+    ("employees", "ix_employees_dept_id", ("dept_id",), False),
+    ("employees", "ix_employees_pay_group_id_status", ("pay_group_id", "status"), False),
+    ("employee_job_histories", "ix_employee_job_histories_emp_id_change_date", ("emp_id", "change_date"), False),
+    ("employee_status_histories", "ix_employee_status_histories_emp_id_change_date", ("emp_id", "change_date"), False),
+    ("work_schedules", "ix_work_schedules_emp_id_work_date", ("emp_id", "work_date"), False),
+    ("time_logs", "ix_time_logs_emp_id_log_datetime", ("emp_id", "log_datetime"), False),
+    ("time_logs", "ix_time_logs_log_datetime", ("log_datetime",), False),
+    ("leave_requests", "ix_leave_requests_emp_id_start_datetime", ("emp_id", "start_datetime"), False),
+    ("leave_requests", "ix_leave_requests_status", ("status",), False),
+    ("leave_requests", "ix_leave_requests_start_datetime", ("start_datetime",), False),
+    ("leave_balances", "ix_leave_balances_emp_id_year", ("emp_id", "year"), False),
+    ("attendance_month_summaries", "uq_attendance_month_summaries_emp_id_year_month", ("emp_id", "year_month"), True),
+    ("pay_results", "uq_pay_results_pay_run_id_emp_id", ("pay_run_id", "emp_id"), True),
+    ("pay_result_items", "ix_pay_result_items_pay_result_id", ("pay_result_id",), False),
+    ("permission_requests", "ix_permission_requests_status_created_at", ("status", "created_at"), False),
+    ("permission_requests", "ix_permission_requests_requester_user_id_created_at", ("requester_user_id", "created_at"), False),
+    ("permission_requests", "ix_permission_requests_created_at", ("created_at",), False),
+    ("evaluation_plans", "ix_evaluation_plans_year", ("year",), False),
+    ("evaluation_items", "ix_evaluation_items_plan_id", ("plan_id",), False),
+    (
+        "evaluation_results",
+        "uq_evaluation_results_plan_id_emp_id_evaluator_emp_id",
+        ("plan_id", "emp_id", "evaluator_emp_id"),
+        True,
+    ),
+    ("evaluation_scores", "uq_evaluation_scores_result_id_item_id", ("result_id", "item_id"), True),
+    ("grade_policies", "ix_grade_policies_plan_id_min_score", ("plan_id", "min_score"), False),
+    ("training_sessions", "ix_training_sessions_course_id_start_date", ("course_id", "start_date"), False),
+    ("training_sessions", "ix_training_sessions_start_date", ("start_date",), False),
+    ("training_enrollments", "ix_training_enrollments_session_id_emp_id", ("session_id", "emp_id"), False),
+    ("training_enrollments", "ix_training_enrollments_emp_id_created_at", ("emp_id", "created_at"), False),
+    ("point_balances", "ix_point_balances_emp_id_policy_id_year", ("emp_id", "policy_id", "year"), False),
+    ("codes", "ix_codes_group_id_sort_order_code", ("group_id", "sort_order", "code"), False),
+    ("audit_logs", "ix_audit_logs_entity_type_created_at", ("entity_type", "created_at"), False),
+    ("audit_logs", "ix_audit_logs_created_at", ("created_at",), False),
+]
+
+
+# v9 / v11 에서 만드는 UNIQUE 키 (테이블, 인덱스, 컬럼)
+_TIME_LOG_KEY = ("time_logs", "uq_time_logs_emp_id_log_datetime_log_type", ("emp_id", "log_datetime", "log_type"))
+_EVALUATION_TARGET_KEY = ("evaluation_targets", "uq_evaluation_targets_plan_id_emp_id", ("plan_id", "emp_id"))
+
+
+def _create_named_index(conn: Connection, table: str, name: str, columns: tuple, unique: bool = False) -> None:
+    # 이미 있으면 테이블 리플렉션도 생략
+    if not _has_index(conn, table, name):
+        _create_index(conn, _index(conn, table, name, *columns, unique=unique))
+
+
+def _create_unique_key(conn: Connection, table: str, name: str, columns: tuple) -> None:
+    _create_named_index(conn, table, name, columns, unique=True)
+
+
+def _hot_path_indexes(conn: Connection) -> None:
+    for index in _HOT_PATH_INDEXES:
+        _create_named_index(conn, *index)
+
+
+def _department_closure(conn: Connection) -> None:
+    from . import models, org
+
+    models.DepartmentClosure.__table__.create(bind=conn, checkfirst=True)
+    org.rebuild_closure(conn)
+
+
+def _time_log_dedup_key(conn: Connection) -> None:
+    _create_unique_key(conn, *_TIME_LOG_KEY)
+    conn.execute(text("DROP INDEX IF EXISTS ix_time_logs_emp_id_log_datetime"))
+
+
+def _dashboard_stats(conn: Connection) -> None:
+    from . import models, stats
+
+    models.DashboardStat.__table__.create(bind=conn, checkfirst=True)
+    stats.refresh(conn)
+
+
+def _evaluation_target_key(conn: Connection) -> None:
+    _create_unique_key(conn, *_EVALUATION_TARGET_KEY)
+
+
+def _legacy_pay_item_rules(conn: Connection) -> None:
+    from . import models, payroll
+
+    # 초기 버전 시딩 항목(BASE/OT/TAX/INS 모두 FIXED 0)이 손대지 않은 그대로일 때만
+    # 현재 기본 규칙(시급 x 근무시간, 지급 합계의 10% 공제)으로 변경. 항목을 설정한 DB 는 그대로 둠
+    pi = models.PayItem.__table__
+    rows = conn.execute(select(pi.c.code, pi.c.calculation_type, pi.c.default_amount, pi.c.formula)).all()
+    untouched = {
+        code
+        for code, calc, amount, formula in rows
+        if calc == "FIXED" and not amount and not formula
+    }
+    if not rows or len(untouched) != len(rows) or not {"BASE", "TAX"} <= untouched:
+        return
+    conn.execute(
+        pi.update()
+        .where(pi.c.code == "BASE")
+        .values(calculation_type="RATE", default_amount=payroll.HOURLY_RATE, formula="worked_hours")
+    )
+    conn.execute(
+        pi.update()
+        .where(pi.c.code == "TAX")
+        .values(calculation_type="FORMULA", default_amount=None, formula=f"gross * {payroll.DEDUCTION_RATE}")
+    )
+
+
+def _unique_keys(conn: Connection) -> None:
+    # 평가결과 키를 NULL(본인 평가)까지 막는 식 인덱스로 교체하고,
+    # 이전 버전에서 중복 데이터 때문에 건너뛴 UNIQUE 인덱스를 정리 후 생성
+    conn.execute(text("DROP INDEX IF EXISTS uq_evaluation_results_plan_id_emp_id_evaluator_emp_id"))
+    keys = [
+        *((t, n, c) for t, n, c, unique in _HOT_PATH_INDEXES if unique and t != "evaluation_results"),
+        _TIME_LOG_KEY,
+        _EVALUATION_TARGET_KEY,
+        (
+            "evaluation_results",
+            "uq_evaluation_results_plan_id_emp_id_evaluator",
+            ("plan_id", "emp_id", lambda t: func.coalesce(t.c.evaluator_emp_id, 0)),
+        ),
+    ]
+    for key in keys:
+        _create_unique_key(conn, *key)
+
+
+def _jobs(conn: Connection) -> None:
+    from . import models
+
+    # 작업 큐 테이블 (버전 관리 이전 v1 이 모델 전체를 만들던 DB 에는 이미 있음)
+    models.Job.__table__.create(bind=conn, checkfirst=True)
+
+
+def _job_lease_columns(conn: Connection) -> None:
+    _add_missing_columns(
+        conn,
+        "jobs",
+        [("worker_id", "VARCHAR(100)"), ("heartbeat_at", DateTime().compile(dialect=conn.dialect))],
+    )
+
+
+def _attendance_month_closes(conn: Connection) -> None:
+    from . import models
+
+    c, s = models.AttendanceMonthClose.__table__, models.AttendanceMonthSummary.__table__
+    c.create(bind=conn, checkfirst=True)
+    # 이전에는 마감을 요약 행 잠금으로만 기록했으므로 잠긴 행이 있는 월을 마감 월로 등록
+    conn.execute(
+        c.insert().from_select(
+            ["year_month", "closed_at"],
+            select(s.c.year_month, func.max(s.c.updated_at))
+            .where(s.c.is_locked == True, s.c.year_month.not_in(select(c.c.year_month)))  # noqa: E712
+            .group_by(s.c.year_month),
+        )
+    )
+
+
+MIGRATIONS: list[tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "initial_schema", _initial_schema),
+    (2, "users_auth_columns", _users_auth_columns),
+    (3, "employees_user_id", _employees_user_id),
+    (4, "leave_request_approval_columns", _leave_request_approval_columns),
+    (5, "evaluation_result_grade_columns", _evaluation_result_grade_columns),
+    (6, "pay_item_formula", _pay_item_formula),
+    (7, "hot_path_indexes", _hot_path_indexes),
+    (8, "department_closure", _department_closure),
+    (9, "time_log_dedup_key", _time_log_dedup_key),
+    (10, "dashboard_stats", _dashboard_stats),
+    (11, "evaluation_target_key", _evaluation_target_key),
+    (12, "legacy_pay_item_rules", _legacy_pay_item_rules),
+    (13, "unique_keys", _unique_keys),
+    (14, "jobs", _jobs),
+    (15, "job_lease_columns", _job_lease_columns),
+    (16, "attendance_month_closes", _attendance_month_closes),
+]
+
+
+def applied_versions(eng: Engine) -> set[int]:
+    with eng.connect() as conn:
+        if not inspect(conn).has_table("schema_migrations"):
+            return set()
+        return set(conn.execute(select(schema_migrations.c.version)).scalars())
+
+
+def pending_migrations(eng: Engine) -> list[tuple[int, str, Callable[[Connection], None]]]:
+    applied = applied_versions(eng)
+    return [m for m in MIGRATIONS if m[0] not in applied]
+
+
+def run_migrations(eng: Engine) -> list[int]:
+    """Apply pending migrations in order; returns the versions applied by this call."""
+    pending = pending_migrations(eng)
+    if not pending:
+        return []
+    _meta.create_all(bind=eng, checkfirst=True)
+
+    done = []
+    for version, name, fn in pending:
+        with eng.connect() as conn, conn.begin() as trans:
+            # 버전 행을 먼저 기록해 다른 워커와의 동시 실행을 직렬화 (PK 충돌이면 이미 적용된 것)
+            try:
+                conn.execute(schema_migrations.insert().values(version=version, name=name))
+            except IntegrityError:
+                trans.rollback()
+                logger.info("Migration %s already applied by another process", version)
+                continue
+            # 마이그레이션 본문의 오류는 그대로 전파 (롤백되어 이 버전과 이후 버전은 미적용으로 남음)
+            fn(conn)
+        logger.info("Applied migration %s_%s", version, name)
+        done.append(version)
+    return done
+
+
+def main(argv: list[str]) -> int:
+    from .database import engine
+
+    logging.basicConfig(level=logging.INFO)
+    cmd = argv[0] if argv else "upgrade"
+    if cmd == "status":
+        applied = applied_versions(engine)
+        for version, name, _ in MIGRATIONS:
+            print(f"{version:4d} {name:40s} {'applied' if version in applied else 'pending'}")
+        return 0
+    if cmd == "upgrade":
+        applied = run_migrations(engine)
+        print(f"Applied {len(applied)} migration(s)" if applied else "Schema is up to date")
+        return 0
+    if cmd == "duplicates":
+        with engine.connect() as conn:
+            found = find_duplicates(conn)
+        for name, groups in found.items():
+            print(f"{name}: {len(groups)} duplicate key(s)")
+            for values, ids in groups:
+                print(f"  {values} ids={ids}")
+        return 1 if found else 0
+    if cmd == "dedupe":
+        with engine.begin() as conn:
+            deleted = dedupe(conn)
+        for name, n in deleted.items():
+            print(f"{name}: deleted {n} row(s)")
+        print("No duplicate keys" if not deleted else "Run `python -m app.migrations` to apply pending migrations")
+        return 0
+    print(f"Unknown command: {cmd}", file=sys.stderr)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
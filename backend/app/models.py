@@ -6,8 +6,11 @@ from sqlalchemy import (
     DateTime,
     DECIMAL,
     ForeignKey,
+    Index,
     Integer,
     String,
+    Text,
+    func,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -53,8 +56,28 @@ class Department(Base):
     parent: Mapped["Department"] = relationship(remote_side=[id])
 
 
+class DepartmentClosure(Base):
+    # 부서 트리의 모든 (상위, 하위) 쌍. 자기 자신은 depth=0 으로 포함
+    __tablename__ = "department_closure"
+    __table_args__ = (
+        Index("ix_department_closure_descendant_id", "descendant_id", "depth"),
+    )
+
+    ancestor_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("departments.id"), primary_key=True
+    )
+    descendant_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("departments.id"), primary_key=True
+    )
+    depth: Mapped[int] = mapped_column(Integer, default=0)
+
+
 class Employee(Base):
     __tablename__ = "employees"
+    __table_args__ = (
+        Index("ix_employees_dept_id", "dept_id"),
+        Index("ix_employees_pay_group_id_status", "pay_group_id", "status"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     emp_no: Mapped[str] = mapped_column(String(20), unique=True, index=True)
@@ -85,6 +108,9 @@ class Employee(Base):
 
 class EmployeeJobHistory(Base):
     __tablename__ = "employee_job_histories"
+    __table_args__ = (
+        Index("ix_employee_job_histories_emp_id_change_date", "emp_id", "change_date"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     emp_id: Mapped[int] = mapped_column(Integer, ForeignKey("employees.id"))
@@ -99,6 +125,9 @@ class EmployeeJobHistory(Base):
 
 class EmployeeStatusHistory(Base):
     __tablename__ = "employee_status_histories"
+    __table_args__ = (
+        Index("ix_employee_status_histories_emp_id_change_date", "emp_id", "change_date"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     emp_id: Mapped[int] = mapped_column(Integer, ForeignKey("employees.id"))
@@ -142,6 +171,9 @@ class WorkType(Base):
 
 class WorkSchedule(Base):
     __tablename__ = "work_schedules"
+    __table_args__ = (
+        Index("ix_work_schedules_emp_id_work_date", "emp_id", "work_date"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     emp_id: Mapped[int] = mapped_column(Integer, ForeignKey("employees.id"))
@@ -160,6 +192,15 @@ class WorkSchedule(Base):
 
 class TimeLog(Base):
     __tablename__ = "time_logs"
+    __table_args__ = (
+        # 단말 재전송 중복 방지 키 (직원 + 시각 조회 인덱스 겸용)
+        Index(
+            "uq_time_logs_emp_id_log_datetime_log_type",
+            "emp_id", "log_datetime", "log_type",
+            unique=True,
+        ),
+        Index("ix_time_logs_log_datetime", "log_datetime"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     emp_id: Mapped[int] = mapped_column(Integer, ForeignKey("employees.id"))
@@ -174,6 +215,11 @@ class TimeLog(Base):
 
 class LeaveRequest(Base):
     __tablename__ = "leave_requests"
+    __table_args__ = (
+        Index("ix_leave_requests_emp_id_start_datetime", "emp_id", "start_datetime"),
+        Index("ix_leave_requests_status", "status"),
+        Index("ix_leave_requests_start_datetime", "start_datetime"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     emp_id: Mapped[int] = mapped_column(Integer, ForeignKey("employees.id"))
@@ -198,6 +244,9 @@ class LeaveRequest(Base):
 
 class LeaveBalance(Base):
     __tablename__ = "leave_balances"
+    __table_args__ = (
+        Index("ix_leave_balances_emp_id_year", "emp_id", "year"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     emp_id: Mapped[int] = mapped_column(Integer, ForeignKey("employees.id"))
@@ -215,6 +264,9 @@ class LeaveBalance(Base):
 
 class AttendanceMonthSummary(Base):
     __tablename__ = "attendance_month_summaries"
+    __table_args__ = (
+        Index("uq_attendance_month_summaries_emp_id_year_month", "emp_id", "year_month", unique=True),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     emp_id: Mapped[int] = mapped_column(Integer, ForeignKey("employees.id"))
@@ -236,6 +288,14 @@ class AttendanceMonthSummary(Base):
     employee: Mapped["Employee"] = relationship()
 
 
+class AttendanceMonthClose(Base):
+    # 마감된 근태 월. 요약 행이 아직 없는 직원의 출퇴근/요약 생성도 월 단위로 막음
+    __tablename__ = "attendance_month_closes"
+
+    year_month: Mapped[str] = mapped_column(String(6), primary_key=True)
+    closed_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
 class PayGroup(Base):
     __tablename__ = "pay_groups"
 
@@ -263,6 +323,8 @@ class PayItem(Base):
         String(20), default="FIXED"
     )  # FIXED / RATE / FORMULA
     default_amount: Mapped[float | None] = mapped_column(DECIMAL(15, 2), nullable=True)
+    # RATE: 수량 산식 (기본 worked_hours, 단가 = default_amount) / FORMULA: 금액 산식
+    formula: Mapped[str | None] = mapped_column(String(500), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
@@ -289,6 +351,9 @@ class PayRun(Base):
 
 class PayResult(Base):
     __tablename__ = "pay_results"
+    __table_args__ = (
+        Index("uq_pay_results_pay_run_id_emp_id", "pay_run_id", "emp_id", unique=True),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     pay_run_id: Mapped[int] = mapped_column(Integer, ForeignKey("pay_runs.id"))
@@ -309,6 +374,9 @@ class PayResult(Base):
 
 class PayResultItem(Base):
     __tablename__ = "pay_result_items"
+    __table_args__ = (
+        Index("ix_pay_result_items_pay_result_id", "pay_result_id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     pay_result_id: Mapped[int] = mapped_column(Integer, ForeignKey("pay_results.id"))
@@ -328,6 +396,11 @@ class PayResultItem(Base):
 
 class PermissionRequest(Base):
     __tablename__ = "permission_requests"
+    __table_args__ = (
+        Index("ix_permission_requests_status_created_at", "status", "created_at"),
+        Index("ix_permission_requests_requester_user_id_created_at", "requester_user_id", "created_at"),
+        Index("ix_permission_requests_created_at", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     requester_user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"))
@@ -344,6 +417,9 @@ class PermissionRequest(Base):
 
 class EvaluationPlan(Base):
     __tablename__ = "evaluation_plans"
+    __table_args__ = (
+        Index("ix_evaluation_plans_year", "year"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String(100))
@@ -359,6 +435,9 @@ class EvaluationPlan(Base):
 
 class EvaluationItem(Base):
     __tablename__ = "evaluation_items"
+    __table_args__ = (
+        Index("ix_evaluation_items_plan_id", "plan_id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     plan_id: Mapped[int] = mapped_column(Integer, ForeignKey("evaluation_plans.id"))
@@ -392,8 +471,22 @@ class EvaluationResult(Base):
     evaluator: Mapped["Employee"] = relationship(foreign_keys=[evaluator_emp_id])
 
 
+# 본인 평가(evaluator_emp_id NULL)도 중복되지 않도록 NULL 을 0 으로 묶은 식 인덱스
+# (UNIQUE 인덱스는 NULL 끼리 서로 다른 값으로 취급)
+Index(
+    "uq_evaluation_results_plan_id_emp_id_evaluator",
+    EvaluationResult.plan_id,
+    EvaluationResult.emp_id,
+    func.coalesce(EvaluationResult.evaluator_emp_id, 0),
+    unique=True,
+)
+
+
 class EvaluationScore(Base):
     __tablename__ = "evaluation_scores"
+    __table_args__ = (
+        Index("uq_evaluation_scores_result_id_item_id", "result_id", "item_id", unique=True),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     result_id: Mapped[int] = mapped_column(Integer, ForeignKey("evaluation_results.id"))
@@ -411,6 +504,10 @@ class EvaluationScore(Base):
 
 class EvaluationTarget(Base):
     __tablename__ = "evaluation_targets"
+    __table_args__ = (
+        # 계획별 대상자 중복 방지 (대상자 생성 시 anti-join 키 겸용)
+        Index("uq_evaluation_targets_plan_id_emp_id", "plan_id", "emp_id", unique=True),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     plan_id: Mapped[int] = mapped_column(Integer, ForeignKey("evaluation_plans.id"))
@@ -436,6 +533,9 @@ class EvaluationEvaluator(Base):
 
 class GradePolicy(Base):
     __tablename__ = "grade_policies"
+    __table_args__ = (
+        Index("ix_grade_policies_plan_id_min_score", "plan_id", "min_score"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     plan_id: Mapped[int] = mapped_column(Integer, ForeignKey("evaluation_plans.id"))
@@ -463,6 +563,10 @@ class TrainingCourse(Base):
 
 class TrainingSession(Base):
     __tablename__ = "training_sessions"
+    __table_args__ = (
+        Index("ix_training_sessions_course_id_start_date", "course_id", "start_date"),
+        Index("ix_training_sessions_start_date", "start_date"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     course_id: Mapped[int] = mapped_column(Integer, ForeignKey("training_courses.id"))
@@ -480,6 +584,10 @@ class TrainingSession(Base):
 
 class TrainingEnrollment(Base):
     __tablename__ = "training_enrollments"
+    __table_args__ = (
+        Index("ix_training_enrollments_session_id_emp_id", "session_id", "emp_id"),
+        Index("ix_training_enrollments_emp_id_created_at", "emp_id", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     session_id: Mapped[int] = mapped_column(Integer, ForeignKey("training_sessions.id"))
@@ -513,6 +621,9 @@ class BenefitPolicy(Base):
 
 class PointBalance(Base):
     __tablename__ = "point_balances"
+    __table_args__ = (
+        Index("ix_point_balances_emp_id_policy_id_year", "emp_id", "policy_id", "year"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     emp_id: Mapped[int] = mapped_column(Integer, ForeignKey("employees.id"))
@@ -555,6 +666,9 @@ class CodeGroup(Base):
 
 class Code(Base):
     __tablename__ = "codes"
+    __table_args__ = (
+        Index("ix_codes_group_id_sort_order_code", "group_id", "sort_order", "code"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     group_id: Mapped[int] = mapped_column(Integer, ForeignKey("code_groups.id"))
@@ -572,6 +686,10 @@ class Code(Base):
 
 class AuditLog(Base):
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        Index("ix_audit_logs_entity_type_created_at", "entity_type", "created_at"),
+        Index("ix_audit_logs_created_at", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     user_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("users.id"), nullable=True)
@@ -585,3 +703,48 @@ class AuditLog(Base):
 
     user: Mapped["User"] = relationship()
 
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    job_type: Mapped[str] = mapped_column(String(50))
+    status: Mapped[str] = mapped_column(
+        String(20), default="QUEUED", index=True
+    )  # QUEUED / RUNNING / SUCCEEDED / FAILED / CANCELLED
+    progress: Mapped[int] = mapped_column(Integer, default=0)
+    params: Mapped[str | None] = mapped_column(Text, nullable=True)
+    result: Mapped[str | None] = mapped_column(Text, nullable=True)
+    error: Mapped[str | None] = mapped_column(String(1000), nullable=True)
+    cancel_requested: Mapped[bool] = mapped_column(Boolean, default=False)
+    created_by_user_id: Mapped[int | None] = mapped_column(
+        Integer, ForeignKey("users.id"), nullable=True
+    )
+    started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    # 실행 중인 작업의 소유 프로세스(host:pid)와 마지막 생존 신호. 리스가 만료된 작업만 실패 처리
+    worker_id: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+
+class DashboardStat(Base):
+    # 대시보드 집계값 (id=1 단일 행). 쓰기 경로가 증감하고 정합성 작업이 주기적으로 재계산
+    __tablename__ = "dashboard_stats"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    total_employees: Mapped[int] = mapped_column(Integer, default=0)
+    active_employees: Mapped[int] = mapped_column(Integer, default=0)
+    department_count: Mapped[int] = mapped_column(Integer, default=0)
+    pay_group_count: Mapped[int] = mapped_column(Integer, default=0)
+    pay_run_count: Mapped[int] = mapped_column(Integer, default=0)
+    leave_requests_pending: Mapped[int] = mapped_column(Integer, default=0)
+    total_payroll: Mapped[float] = mapped_column(DECIMAL(18, 2), default=0)
+    reconciled_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
@@ -0,0 +1,111 @@
+"""Department hierarchy kept as a closure table (``department_closure``).
+
+Every (ancestor, descendant) pair is stored with its depth, so "department plus all
+sub-departments" is a single indexed lookup instead of a recursive walk.
+"""
+
+from sqlalchemy import Select, delete, insert, literal, select, true
+from sqlalchemy.orm import Session, aliased
+
+from . import models
+
+Closure = models.DepartmentClosure
+
+
+class HierarchyError(ValueError):
+    pass
+
+
+def subtree_ids(dept_id: int) -> Select:
+    """Ids of ``dept_id`` and all of its descendants."""
+    return select(Closure.descendant_id).where(Closure.ancestor_id == dept_id)
+
+
+def subtree(dept_id: int) -> Select:
+    """Departments under ``dept_id`` (inclusive) ordered by depth, with the depth as 2nd column."""
+    return (
+        select(models.Department, Closure.depth)
+        .join(Closure, Closure.descendant_id == models.Department.id)
+        .where(Closure.ancestor_id == dept_id)
+        .order_by(Closure.depth, models.Department.code)
+    )
+
+
+def add_department(db: Session, dept: models.Department) -> None:
+    """Insert closure rows for a new (already flushed) department."""
+    db.add(Closure(ancestor_id=dept.id, descendant_id=dept.id, depth=0))
+    if dept.parent_id is not None:
+        db.execute(
+            insert(Closure).from_select(
+                ["ancestor_id", "descendant_id", "depth"],
+                select(Closure.ancestor_id, literal(dept.id), Closure.depth + 1).where(
+                    Closure.descendant_id == dept.parent_id
+                ),
+            )
+        )
+
+
+def move_department(db: Session, dept: models.Department, new_parent_id: int | None) -> None:
+    """Re-parent ``dept`` with its whole subtree; call before changing ``dept.parent_id``."""
+    if new_parent_id is not None and db.scalar(
+        select(Closure.depth).where(
+            Closure.ancestor_id == dept.id, Closure.descendant_id == new_parent_id
+        )
+    ) is not None:
+        raise HierarchyError("Department cannot be moved under itself")
+
+    # 기존 상위 부서들과 이 서브트리 사이의 연결만 제거 (서브트리 내부 연결은 유지)
+    db.execute(
+        delete(Closure)
+        .where(
+            Closure.descendant_id.in_(subtree_ids(dept.id)),
+            Closure.ancestor_id.in_(
+                select(Closure.ancestor_id).where(
+                    Closure.descendant_id == dept.id, Closure.ancestor_id != dept.id
+                )
+            ),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if new_parent_id is not None:
+        up = aliased(Closure)
+        down = aliased(Closure)
+        db.execute(
+            insert(Closure).from_select(
+                ["ancestor_id", "descendant_id", "depth"],
+                # 새 상위 부서의 조상들 x 이동하는 서브트리 (의도된 교차곱)
+                select(up.ancestor_id, down.descendant_id, up.depth + down.depth + 1)
+                .select_from(up)
+                .join(down, true())
+                .where(up.descendant_id == new_parent_id, down.ancestor_id == dept.id),
+            )
+        )
+
+
+def remove_department(db: Session, dept: models.Department) -> None:
+    """Delete closure rows of a leaf department."""
+    if db.scalar(
+        select(models.Department.id).where(models.Department.parent_id == dept.id).limit(1)
+    ) is not None:
+        raise HierarchyError("Department has sub-departments")
+    db.execute(
+        delete(Closure)
+        .where(Closure.descendant_id == dept.id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def rebuild_closure(db) -> int:
+    """Recompute the whole closure table from ``parent_id`` (migration / repair); returns row count."""
+    parents = dict(db.execute(select(models.Department.id, models.Department.parent_id)).all())
+    rows = []
+    for dept_id in parents:
+        node, depth, seen = dept_id, 0, set()
+        while node is not None and node in parents and node not in seen:
+            rows.append({"ancestor_id": node, "descendant_id": dept_id, "depth": depth})
+            seen.add(node)
+            node, depth = parents[node], depth + 1
+    db.execute(delete(Closure))
+    if rows:
+        db.execute(insert(Closure), rows)
+    return len(rows)
@@ -0,0 +1,87 @@
+"""Keyset (cursor) pagination shared by the list endpoints.
+
+The response body stays a plain JSON list; the cursor for the next page is returned in
+the ``X-Next-Cursor`` header and is absent on the last page.
+"""
+
+import base64
+import json
+import os
+from dataclasses import dataclass
+from datetime import date, datetime
+
+from fastapi import HTTPException, Query, Response
+from sqlalchemy import tuple_
+
+PAGE_SIZE_DEFAULT = int(os.getenv("PAGE_SIZE_DEFAULT", "100"))
+PAGE_SIZE_MAX = int(os.getenv("PAGE_SIZE_MAX", "500"))
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+@dataclass(frozen=True)
+class PageParams:
+    cursor: str | None
+    limit: int
+
+
+def page_params(
+    cursor: str | None = Query(None, description="Value of X-Next-Cursor from the previous page"),
+    limit: int = Query(PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX),
+) -> PageParams:
+    return PageParams(cursor=cursor, limit=limit)
+
+
+def _encode(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _decode(value, column):
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
+
+
+@dataclass(frozen=True)
+class Keyset:
+    """Sort key for a list endpoint: non-null columns whose combination is unique, in index order."""
+
+    columns: tuple
+    descending: bool = False
+
+    def apply(self, stmt, page: PageParams):
+        """Order, seek past ``page.cursor`` and fetch one extra row to detect the next page."""
+        order = [c.desc() if self.descending else c.asc() for c in self.columns]
+        stmt = stmt.order_by(None).order_by(*order)
+        if page.cursor:
+            values = self._decode_cursor(page.cursor)
+            key = tuple_(*self.columns)
+            bound = tuple_(*values)
+            stmt = stmt.where(key < bound if self.descending else key > bound)
+        return stmt.limit(page.limit + 1)
+
+    def page(self, rows, page: PageParams, response: Response) -> list:
+        """Trim the look-ahead row and expose the next cursor."""
+        rows = list(rows)
+        if len(rows) > page.limit:
+            rows = rows[: page.limit]
+            last = rows[-1]
+            values = [_encode(getattr(last, c.key)) for c in self.columns]
+            raw = json.dumps(values, separators=(",", ":")).encode()
+            response.headers[NEXT_CURSOR_HEADER] = base64.urlsafe_b64encode(raw).decode()
+        return rows
+
+    def _decode_cursor(self, cursor: str) -> list:
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if not isinstance(values, list) or len(values) != len(self.columns):
+                raise ValueError(cursor)
+            return [_decode(v, c) for v, c in zip(values, self.columns)]
+        except (ValueError, TypeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
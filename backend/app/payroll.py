@@ -0,0 +1,386 @@
+import ast
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from types import CodeType
+from typing import Callable
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from . import models, stats
+
+# 한 번에 INSERT/UPDATE 하는 PayResult 행 수
+DEFAULT_BATCH_SIZE = int(os.getenv("PAYROLL_BATCH_SIZE", "1000"))
+# 병렬 계산 시 직원 목록을 나누는 청크 수 (1 이면 단일 프로세스 계산)
+DEFAULT_CHUNKS = int(os.getenv("PAYROLL_CHUNKS", "1"))
+
+# 급여항목이 하나도 없을 때 사용하는 기본 계산 (시급 20,000원, 10% 공제 가정)
+HOURLY_RATE = 20000
+DEDUCTION_RATE = 0.1
+
+# 급여 산식에서 참조할 수 있는 근태요약 필드
+ATTENDANCE_FIELDS = (
+    "planned_hours",
+    "worked_hours",
+    "overtime_hours",
+    "night_hours",
+    "holiday_hours",
+    "late_count",
+    "early_leave_count",
+    "absence_count",
+)
+FORMULA_NAMES = frozenset(ATTENDANCE_FIELDS)
+# 공제(DEDUCTION) 항목 산식에서는 지급 합계(gross)도 참조 가능 (지급 항목 계산 후 평가)
+DEDUCTION_FORMULA_NAMES = FORMULA_NAMES | {"gross"}
+FORMULA_FUNCS = {"min": min, "max": max, "abs": abs, "round": round}
+
+_ALLOWED_NODES = (
+    ast.Expression,
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.BoolOp,
+    ast.Compare,
+    ast.IfExp,
+    ast.Call,
+    ast.Name,
+    ast.Load,
+    ast.Constant,
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.Div,
+    ast.FloorDiv,
+    ast.Mod,
+    ast.UAdd,
+    ast.USub,
+    ast.Not,
+    ast.And,
+    ast.Or,
+    ast.Eq,
+    ast.NotEq,
+    ast.Lt,
+    ast.LtE,
+    ast.Gt,
+    ast.GtE,
+)
+
+
+class FormulaError(ValueError):
+    pass
+
+
+def compile_formula(expr: str, names: frozenset[str] = FORMULA_NAMES) -> CodeType:
+    """Validate a pay formula against a small arithmetic whitelist and compile it.
+
+    ``names`` are the variables the formula may use.
+    """
+    try:
+        tree = ast.parse(expr.strip(), mode="eval")
+    except SyntaxError as e:
+        raise FormulaError(f"Invalid formula: {expr}") from e
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise FormulaError(f"Unsupported syntax in formula: {type(node).__name__}")
+        if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float)):
+            raise FormulaError("Only numeric constants are allowed")
+        if isinstance(node, ast.Name) and node.id not in names and node.id not in FORMULA_FUNCS:
+            raise FormulaError(f"Unknown name in formula: {node.id}")
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in FORMULA_FUNCS or node.keywords:
+                raise FormulaError("Only min/max/abs/round calls are allowed")
+    return compile(tree, "<pay-formula>", "eval")
+
+
+@dataclass(frozen=True)
+class PayInput:
+    emp_id: int
+    variables: dict[str, float]
+
+
+@dataclass(frozen=True)
+class PayLine:
+    pay_item_id: int | None
+    amount: float
+    quantity: float = 1
+    rate: float | None = None
+
+
+@dataclass(frozen=True)
+class PayAmount:
+    emp_id: int
+    gross_amount: float
+    deduct_amount: float
+    net_amount: float
+    lines: tuple[PayLine, ...] = ()
+
+
+@dataclass(frozen=True)
+class CompiledPayItem:
+    pay_item_id: int | None
+    code: str
+    item_type: str
+    calculation_type: str
+    amount: float
+    formula: str | None = None
+    code_obj: CodeType | None = None
+
+    def __reduce__(self):
+        # 코드 객체는 pickle 되지 않으므로 워커 프로세스에서 산식을 다시 컴파일
+        return (
+            compile_pay_item,
+            (self.pay_item_id, self.code, self.item_type, self.calculation_type, self.amount, self.formula),
+        )
+
+    def evaluate(self, env: dict) -> PayLine:
+        if self.calculation_type == "FIXED":
+            return PayLine(self.pay_item_id, self.amount)
+        try:
+            value = float(eval(self.code_obj, env))
+        except (ArithmeticError, NameError, TypeError, ValueError) as e:
+            raise FormulaError(f"{self.code}: {e}") from e
+        if self.calculation_type == "RATE":
+            # RATE: 산식 값 = 수량, default_amount = 단가
+            return PayLine(self.pay_item_id, value * self.amount, quantity=value, rate=self.amount)
+        return PayLine(self.pay_item_id, value)
+
+
+@dataclass(frozen=True)
+class PayPlan:
+    """Pay items compiled once per run; earnings are evaluated before deductions."""
+
+    earnings: tuple[CompiledPayItem, ...]
+    deductions: tuple[CompiledPayItem, ...]
+
+    def evaluate(self, emp_id: int, variables: dict[str, float]) -> PayAmount:
+        env = {"__builtins__": {}, **FORMULA_FUNCS, **variables}
+        lines = []
+        gross = 0.0
+        for item in self.earnings:
+            line = item.evaluate(env)
+            gross += line.amount
+            lines.append(line)
+        env["gross"] = gross
+        deduct = 0.0
+        for item in self.deductions:
+            line = item.evaluate(env)
+            deduct += line.amount
+            lines.append(line)
+        return PayAmount(
+            emp_id=emp_id,
+            gross_amount=gross,
+            deduct_amount=deduct,
+            net_amount=gross - deduct,
+            lines=tuple(lines),
+        )
+
+
+def compile_pay_item(
+    pay_item_id: int | None,
+    code: str,
+    item_type: str,
+    calculation_type: str,
+    default_amount,
+    formula: str | None,
+) -> CompiledPayItem:
+    amount = float(default_amount) if default_amount is not None else 0.0
+    code_obj = None
+    names = DEDUCTION_FORMULA_NAMES if item_type == "DEDUCTION" else FORMULA_NAMES
+    if calculation_type == "RATE":
+        code_obj = compile_formula(formula or "worked_hours", names)
+    elif calculation_type == "FORMULA":
+        if not formula:
+            raise FormulaError(f"{code}: formula is required")
+        code_obj = compile_formula(formula, names)
+    elif calculation_type != "FIXED":
+        raise FormulaError(f"{code}: unknown calculation_type {calculation_type}")
+    return CompiledPayItem(pay_item_id, code, item_type, calculation_type, amount, formula, code_obj)
+
+
+# 급여항목이 등록되지 않은 경우의 기본 계획 (PayResultItem 은 기록하지 않음)
+LEGACY_PLAN = PayPlan(
+    earnings=(compile_pay_item(None, "BASE", "EARNING", "RATE", HOURLY_RATE, "worked_hours"),),
+    deductions=(compile_pay_item(None, "TAX", "DEDUCTION", "FORMULA", None, f"gross * {DEDUCTION_RATE}"),),
+)
+
+
+def compile_pay_plan(db: Session) -> PayPlan:
+    """PayItem 은 급여그룹과 연결되어 있지 않으므로 전체 항목을 한 번 컴파일해 사용."""
+    items = db.execute(
+        select(
+            models.PayItem.id,
+            models.PayItem.code,
+            models.PayItem.item_type,
+            models.PayItem.calculation_type,
+            models.PayItem.default_amount,
+            models.PayItem.formula,
+        ).order_by(models.PayItem.code)
+    ).all()
+    if not items:
+        return LEGACY_PLAN
+    compiled = [compile_pay_item(*row) for row in items]
+    return PayPlan(
+        earnings=tuple(c for c in compiled if c.item_type != "DEDUCTION"),
+        deductions=tuple(c for c in compiled if c.item_type == "DEDUCTION"),
+    )
+
+
+def load_pay_inputs(db: Session, run: models.PayRun) -> list[PayInput]:
+    """Preload the ACTIVE employees of the run's pay group with their month summary."""
+    summary_cols = [getattr(models.AttendanceMonthSummary, f) for f in ATTENDANCE_FIELDS]
+    rows = db.execute(
+        select(models.Employee.id, *summary_cols)
+        .outerjoin(
+            models.AttendanceMonthSummary,
+            (models.AttendanceMonthSummary.emp_id == models.Employee.id)
+            & (models.AttendanceMonthSummary.year_month == run.year_month),
+        )
+        .where(
+            models.Employee.pay_group_id == run.pay_group_id,
+            models.Employee.status == "ACTIVE",
+        )
+        .order_by(models.Employee.id, models.AttendanceMonthSummary.id)
+    ).all()
+
+    # 요약이 중복된 경우 첫 행만 사용
+    inputs: dict[int, PayInput] = {}
+    for emp_id, *values in rows:
+        if emp_id in inputs:
+            continue
+        inputs[emp_id] = PayInput(
+            emp_id=emp_id,
+            variables={
+                f: float(v) if v is not None else 0.0
+                for f, v in zip(ATTENDANCE_FIELDS, values)
+            },
+        )
+    return list(inputs.values())
+
+
+def compute_pay_amounts(plan: PayPlan, inputs: list[PayInput]) -> list[PayAmount]:
+    return [plan.evaluate(inp.emp_id, inp.variables) for inp in inputs]
+
+
+def _mp_context():
+    # 서버 프로세스는 멀티스레드(요청 스레드풀, 작업 워커)이므로 fork 로 잡힌 락을 복사하지 않도록
+    # forkserver(미지원 플랫폼은 spawn)로 워커 생성. PayPlan 은 pickle 로 전달됨
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _compute_chunk(args: tuple[PayPlan, list[PayInput]]) -> list[PayAmount]:
+    plan, inputs = args
+    return compute_pay_amounts(plan, inputs)
+
+
+def compute_pay_amounts_parallel(
+    plan: PayPlan,
+    inputs: list[PayInput],
+    chunks: int,
+) -> list[PayAmount]:
+    """Compute chunks in worker processes; results are merged back in input order."""
+    chunks = min(chunks, len(inputs))
+    if chunks <= 1:
+        return compute_pay_amounts(plan, inputs)
+    size = -(-len(inputs) // chunks)
+    parts = [(plan, inputs[i : i + size]) for i in range(0, len(inputs), size)]
+    workers = min(len(parts), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_mp_context()) as pool:
+        return [a for part in pool.map(_compute_chunk, parts) for a in part]
+
+
+def load_existing_result_ids(db: Session, run_id: int) -> dict[int, int]:
+    rows = db.execute(
+        select(models.PayResult.emp_id, models.PayResult.id)
+        .where(models.PayResult.pay_run_id == run_id)
+        .order_by(models.PayResult.id)
+    ).all()
+    existing: dict[int, int] = {}
+    for emp_id, pr_id in rows:
+        existing.setdefault(emp_id, pr_id)
+    return existing
+
+
+def run_net_total(db: Session, run_id: int):
+    return db.scalar(
+        select(func.coalesce(func.sum(models.PayResult.net_amount), 0))
+        .where(models.PayResult.pay_run_id == run_id)
+    )
+
+
+def write_pay_results(
+    db: Session,
+    run_id: int,
+    amounts: list[PayAmount],
+    existing: dict[int, int],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> tuple[int, int]:
+    """Bulk insert/update PayResult rows and replace their PayResultItem lines. Returns (created, updated)."""
+    inserts = []
+    updates = []
+    for a in amounts:
+        values = {
+            "gross_amount": a.gross_amount,
+            "deduct_amount": a.deduct_amount,
+            "net_amount": a.net_amount,
+            "status": "CALCULATED",
+        }
+        pr_id = existing.get(a.emp_id)
+        if pr_id is not None:
+            updates.append({"id": pr_id, **values})
+        else:
+            inserts.append({"pay_run_id": run_id, "emp_id": a.emp_id, **values})
+
+    for i in range(0, len(inserts), batch_size):
+        db.execute(insert(models.PayResult), inserts[i : i + batch_size])
+    for i in range(0, len(updates), batch_size):
+        db.execute(update(models.PayResult), updates[i : i + batch_size])
+
+    # 항목별 내역은 재계산 시 전부 교체
+    run_result_ids = select(models.PayResult.id).where(models.PayResult.pay_run_id == run_id)
+    db.execute(
+        delete(models.PayResultItem).where(models.PayResultItem.pay_result_id.in_(run_result_ids))
+    )
+    result_ids = load_existing_result_ids(db, run_id) if inserts else existing
+    item_rows = [
+        {
+            "pay_result_id": result_ids[a.emp_id],
+            "pay_item_id": line.pay_item_id,
+            "amount": line.amount,
+            "quantity": line.quantity,
+            "rate": line.rate,
+        }
+        for a in amounts
+        for line in a.lines
+        if line.pay_item_id is not None
+    ]
+    for i in range(0, len(item_rows), batch_size):
+        db.execute(insert(models.PayResultItem), item_rows[i : i + batch_size])
+    return len(inserts), len(updates)
+
+
+def calculate_pay_run(
+    db: Session,
+    run: models.PayRun,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    chunks: int = DEFAULT_CHUNKS,
+    progress: Callable[[int], None] | None = None,
+) -> dict[str, int]:
+    report = progress or (lambda pct: None)
+    plan = compile_pay_plan(db)
+    inputs = load_pay_inputs(db, run)
+    existing = load_existing_result_ids(db, run.id)
+    report(20)
+    amounts = compute_pay_amounts_parallel(plan, inputs, chunks)
+    report(70)
+    before = run_net_total(db, run.id)
+    created, updated = write_pay_results(db, run.id, amounts, existing, batch_size)
+    # 대시보드 총 지급액은 이 회차 합계의 변화분만 반영
+    stats.bump(db, total_payroll=run_net_total(db, run.id) - before)
+
+    run.status = "CALCULATED"
+    run.calculated_at = datetime.now(timezone.utc)
+    db.commit()
+    return {"created": created, "updated": updated}
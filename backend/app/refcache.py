@@ -0,0 +1,150 @@
+"""HTTP response cache for rarely changing reference data.
+
+Each reference resource has an in-process version that is bumped when a commit inserts,
+updates or deletes one of its rows (same session events as the principal cache). Responses
+are kept as serialized JSON bytes with a strong ETag (hash of the bytes), so repeat loads
+skip the query and serialization, and a matching ``If-None-Match`` gets an empty 304.
+Other worker processes pick up a change within ``REFERENCE_CACHE_TTL_SECONDS``.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from . import models
+
+# 캐시 항목 유지 시간(초): 다른 워커의 변경은 이 시간 안에 반영. 0 이면 캐시 안 함
+REFERENCE_CACHE_TTL_SECONDS = float(os.getenv("REFERENCE_CACHE_TTL_SECONDS", "30"))
+# 브라우저가 재검증 없이 재사용할 시간(초). 0 이면 매번 If-None-Match 로 확인
+REFERENCE_MAX_AGE_SECONDS = int(os.getenv("REFERENCE_MAX_AGE_SECONDS", "0"))
+REFERENCE_CACHE_MAX_ENTRIES = 512
+
+# 모델별로 무효화되는 리소스 (공통코드 목록은 그룹과 코드 둘 다에 의존)
+RESOURCES: dict[type, tuple[str, ...]] = {
+    models.Department: ("departments",),
+    models.WorkType: ("work_types",),
+    models.PayGroup: ("pay_groups",),
+    models.PayItem: ("pay_items",),
+    models.CodeGroup: ("code_groups", "codes"),
+    models.Code: ("codes",),
+    models.BenefitPolicy: ("benefit_policies",),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class _Entry:
+    version: int
+    expires: float
+    body: bytes
+    etag: str
+    headers: tuple[tuple[str, str], ...]
+
+
+_versions: dict[str, int] = {}
+_entries: dict[tuple, _Entry] = {}
+_adapters: dict[Any, TypeAdapter] = {}
+_lock = threading.Lock()
+
+
+def version(resource: str) -> int:
+    return _versions.get(resource, 0)
+
+
+def invalidate(*resources: str) -> None:
+    """Bump the given resources' versions (all cached responses when none are given)."""
+    with _lock:
+        if not resources:
+            _entries.clear()
+            return
+        for resource in resources:
+            _versions[resource] = _versions.get(resource, 0) + 1
+
+
+def _adapter(schema) -> TypeAdapter:
+    adapter = _adapters.get(schema)
+    if adapter is None:
+        adapter = _adapters[schema] = TypeAdapter(schema)
+    return adapter
+
+
+def _cache_control() -> str:
+    if REFERENCE_MAX_AGE_SECONDS > 0:
+        return f"private, max-age={REFERENCE_MAX_AGE_SECONDS}"
+    return "private, no-cache"
+
+
+def _matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    # If-None-Match 는 약한 비교 (W/ 접두어 무시)
+    tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+
+def _build(key: tuple, load: Callable[[], Any], schema, response: Response | None) -> _Entry:
+    current = version(key[0])
+    body = _adapter(schema).dump_json(load(), by_alias=True)
+    etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+    # 목록 함수가 응답 객체에 넣은 헤더(X-Next-Cursor 등)도 함께 보관
+    headers = tuple(
+        (k, v)
+        for k, v in (response.headers.items() if response is not None else ())
+        if k not in ("content-length", "content-type")
+    )
+    return _Entry(current, time.monotonic() + REFERENCE_CACHE_TTL_SECONDS, body, etag, headers)
+
+
+def respond(
+    request: Request,
+    key: tuple,
+    load: Callable[[], Any],
+    schema,
+    response: Response | None = None,
+) -> Response:
+    """Serve ``load()`` serialized as ``schema`` from the cache; ``key[0]`` names the resource.
+
+    ``load`` only runs on a miss. Pass the endpoint's injected ``response`` when ``load``
+    sets headers on it so they are replayed on hits.
+    """
+    entry = _entries.get(key)
+    if entry is None or entry.version != version(key[0]) or entry.expires <= time.monotonic():
+        entry = _build(key, load, schema, response)
+        if REFERENCE_CACHE_TTL_SECONDS > 0:
+            with _lock:
+                if len(_entries) >= REFERENCE_CACHE_MAX_ENTRIES:
+                    _entries.pop(next(iter(_entries)))
+                _entries[key] = entry
+    headers = {"ETag": entry.etag, "Cache-Control": _cache_control(), **dict(entry.headers)}
+    if _matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+# ---- 커밋 시 버전 증가 ----
+@event.listens_for(Session, "after_flush")
+def _collect_changed_resources(session: Session, flush_context) -> None:
+    changed = session.info.setdefault("changed_reference_resources", set())
+    for obj in session.new | session.dirty | session.deleted:
+        resources = RESOURCES.get(type(obj))
+        if resources and (obj not in session.dirty or session.is_modified(obj)):
+            changed.update(resources)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_changed_resources(session: Session) -> None:
+    changed = session.info.pop("changed_reference_resources", None)
+    if changed:
+        invalidate(*changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_resources(session: Session) -> None:
+    session.info.pop("changed_reference_resources", None)
@@ -59,6 +59,7 @@ class ResetPasswordByTokenRequest(BaseModel):
 class DepartmentBase(BaseModel):
     code: str
     name: str
+    parent_id: int | None = None
 
 
 class DepartmentCreate(DepartmentBase):
@@ -68,6 +69,15 @@ class DepartmentCreate(DepartmentBase):
 class DepartmentUpdate(BaseModel):
     code: str | None = None
     name: str | None = None
+    parent_id: int | None = None
+
+
+class DepartmentTreeNode(BaseModel):
+    id: int
+    code: str
+    name: str
+    parent_id: int | None = None
+    depth: int
 
 
 class DepartmentRead(DepartmentBase):
@@ -159,6 +169,8 @@ class LeaveRequestRead(BaseModel):
     reason: str | None = None
     approver_emp_id: int | None = None
     approved_at: datetime | None = None
+    # 공통코드(LEAVE_TYPE) 이름
+    leave_type_name: str | None = None
 
     class Config:
         from_attributes = True
@@ -171,6 +183,7 @@ class PayItemBase(BaseModel):
     taxable: bool = True
     calculation_type: str = "FIXED"
     default_amount: Decimal | None = None
+    formula: str | None = None
 
 
 class PayItemCreate(PayItemBase):
@@ -184,6 +197,7 @@ class PayItemUpdate(BaseModel):
     taxable: bool | None = None
     calculation_type: str | None = None
     default_amount: Decimal | None = None
+    formula: str | None = None
 
 
 class PayItemRead(PayItemBase):
@@ -402,6 +416,11 @@ class GradePolicyRead(GradePolicyBase):
         from_attributes = True
 
 
+class GradeAggregateRequest(BaseModel):
+    # 등급 -> 비율(%) (강제 배분). 없으면 등급 정책의 점수 구간 적용
+    distribution: dict[str, float] | None = None
+
+
 class EvaluationResultCreate(BaseModel):
     plan_id: int
     score: Decimal
@@ -625,6 +644,28 @@ class TimeLogCreate(BaseModel):
     source: str = "WEB"
 
 
+class TimeLogEvent(BaseModel):
+    emp_id: int
+    log_datetime: datetime
+    log_type: str  # IN / OUT
+    source: str | None = None
+    device_id: str | None = None
+
+
+class TimeLogRejected(BaseModel):
+    index: int
+    reason: str
+
+
+class TimeLogBatchResult(BaseModel):
+    received: int
+    inserted: int
+    rejected: int
+    errors: list[TimeLogRejected]
+    # 등록된 직원-월 근태요약을 다시 계산하는 작업 (등록 건이 없으면 None)
+    refresh_job_id: int | None = None
+
+
 class TimeLogRead(BaseModel):
     id: int
     emp_id: int
@@ -635,3 +676,15 @@ class TimeLogRead(BaseModel):
     class Config:
         from_attributes = True
 
+
+
+class JobRead(BaseModel):
+    id: int
+    job_type: str
+    status: str
+    progress: int
+    result: dict | None = None
+    error: str | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
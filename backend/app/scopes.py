@@ -0,0 +1,85 @@
+"""Row-level data scopes (SELF / TEAM / ORG / ALL, see ``auth_data_scopes.csv``).
+
+A scope is resolved once per principal and turned into SQL predicates, so the visible
+employee set is always a subquery and never a Python list of ids.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+from sqlalchemy import ColumnElement, Select, false, select, true
+
+from . import models, org
+from .auth import Principal
+
+SELF = "SELF"
+TEAM = "TEAM"
+ORG = "ORG"
+ALL = "ALL"
+
+# 역할별 기본 데이터 스코프 (auth_roles.csv 의 기본데이터스코프 + 현재 앱 역할)
+# MANAGER 는 기존과 같이 본인 부서(TEAM), PAYROLL_ADMIN 의 급여 전체 조회는 엔드포인트 역할 체크로 부여
+ROLE_SCOPES: dict[str, str] = {
+    "ADMIN": ALL,
+    "SYSTEM_ADMIN": ALL,
+    "HR_ADMIN": ALL,
+    "MANAGER": TEAM,
+    "PLANT_MANAGER": ORG,
+    "PRODUCTION_MANAGER": ORG,
+    "QUALITY_MANAGER": ORG,
+    "MAINT_MANAGER": ORG,
+    "WAREHOUSE_MANAGER": ORG,
+    "SALES_MANAGER": ORG,
+    "EMPLOYEE": SELF,
+}
+
+
+@dataclass(frozen=True)
+class DataScope:
+    kind: str
+    emp_id: int | None = None
+    dept_id: int | None = None
+
+    @property
+    def is_all(self) -> bool:
+        return self.kind == ALL
+
+    @property
+    def is_empty(self) -> bool:
+        # 직원 프로필이 연결되지 않은 계정은 ALL 이 아니면 아무것도 볼 수 없음
+        return not self.is_all and self.emp_id is None
+
+    def dept_clause(self, dept_id_col) -> ColumnElement[bool]:
+        if self.kind == TEAM:
+            return dept_id_col == self.dept_id
+        return dept_id_col.in_(org.subtree_ids(self.dept_id))
+
+    def employee_clause(self, emp_id_col, dept_id_col=None) -> ColumnElement[bool]:
+        """Predicate on an ``emp_id`` column; pass ``dept_id_col`` when filtering ``employees`` itself."""
+        if self.is_all:
+            return true()
+        if self.is_empty:
+            return false()
+        if self.kind == SELF:
+            return emp_id_col == self.emp_id
+        if dept_id_col is not None:
+            return self.dept_clause(dept_id_col)
+        return emp_id_col.in_(
+            select(models.Employee.id).where(self.dept_clause(models.Employee.dept_id))
+        )
+
+    def contains(self, emp_id: int) -> Select:
+        """Returns a row iff ``emp_id`` is visible in this scope."""
+        return select(models.Employee.id).where(
+            models.Employee.id == emp_id,
+            self.employee_clause(models.Employee.id, models.Employee.dept_id),
+        )
+
+
+@lru_cache(maxsize=4096)
+def scope_for(principal: Principal) -> DataScope:
+    kind = ROLE_SCOPES.get(principal.role, SELF)
+    # 부서가 없는 관리자는 본인 데이터만
+    if kind in (TEAM, ORG) and principal.dept_id is None:
+        kind = SELF
+    return DataScope(kind=kind, emp_id=principal.emp_id, dept_id=principal.dept_id)
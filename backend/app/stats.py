@@ -0,0 +1,99 @@
+"""Materialized dashboard statistics.
+
+The dashboard numbers live in one ``dashboard_stats`` row. Writers adjust it with
+``bump`` inside their own transaction (a relative UPDATE, so concurrent writers never lose
+an increment), and ``reconcile`` recomputes every counter from the source tables with SQL
+aggregates; it runs as the ``DASHBOARD_RECONCILE`` job, after seeding and every
+``STATS_RECONCILE_SECONDS``.
+"""
+
+import os
+from datetime import datetime, timezone
+
+from sqlalchemy import case, func, insert, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from . import models
+
+# 주기적 정합성 재계산 간격(초), 0 이면 끔
+STATS_RECONCILE_SECONDS = int(os.getenv("STATS_RECONCILE_SECONDS", "3600"))
+
+STATS_ID = 1
+
+COUNTERS = (
+    "total_employees",
+    "active_employees",
+    "department_count",
+    "pay_group_count",
+    "pay_run_count",
+    "leave_requests_pending",
+    "total_payroll",
+)
+
+
+def aggregate_stmt():
+    """All counters in one round trip of SQL aggregates (no rows are loaded)."""
+    e = models.Employee
+    count = func.count()
+    return select(
+        select(count).select_from(e).scalar_subquery().label("total_employees"),
+        select(func.coalesce(func.sum(case((e.status == "ACTIVE", 1), else_=0)), 0))
+        .scalar_subquery()
+        .label("active_employees"),
+        select(count).select_from(models.Department).scalar_subquery().label("department_count"),
+        select(count).select_from(models.PayGroup).scalar_subquery().label("pay_group_count"),
+        select(count).select_from(models.PayRun).scalar_subquery().label("pay_run_count"),
+        select(count)
+        .select_from(models.LeaveRequest)
+        .where(models.LeaveRequest.status == "REQUESTED")
+        .scalar_subquery()
+        .label("leave_requests_pending"),
+        select(func.coalesce(func.sum(models.PayResult.net_amount), 0))
+        .scalar_subquery()
+        .label("total_payroll"),
+    )
+
+
+def bump(db: Session, **deltas) -> None:
+    """Add ``deltas`` to the stored counters in the caller's transaction."""
+    deltas = {k: v for k, v in deltas.items() if v}
+    if not deltas:
+        return
+    s = models.DashboardStat
+    # 행이 아직 없으면(정합성 작업 전) 건너뜀: 첫 재계산이 현재 값으로 채움
+    db.execute(
+        update(s)
+        .where(s.id == STATS_ID)
+        .values({getattr(s, k): getattr(s, k) + v for k, v in deltas.items()})
+        .execution_options(synchronize_session=False)
+    )
+
+
+def refresh(db: Session | Connection) -> dict:
+    """Recompute every counter from the source tables and store it (no commit).
+
+    Returns how far each stored counter had drifted (all of them when the row was missing).
+    """
+    values = dict(db.execute(aggregate_stmt()).one()._mapping)
+    s = models.DashboardStat
+    row = db.execute(select(*(getattr(s, k) for k in COUNTERS)).where(s.id == STATS_ID)).first()
+    now = datetime.now(timezone.utc)
+    if row is None:
+        db.execute(insert(s).values(id=STATS_ID, reconciled_at=now, **values))
+        stored = dict.fromkeys(COUNTERS, 0)
+    else:
+        stored = dict(zip(COUNTERS, row))
+        db.execute(update(s).where(s.id == STATS_ID).values(reconciled_at=now, **values))
+    # 작업 결과(JSON)로 남기므로 Decimal 은 float 로
+    number = lambda k, v: float(v or 0) if k == "total_payroll" else int(v or 0)  # noqa: E731
+    drift = {k: number(k, values[k]) - number(k, stored[k]) for k in COUNTERS}
+    drift["total_payroll"] = round(drift["total_payroll"], 2)
+    return {k: v for k, v in drift.items() if v}
+
+
+def reconcile(db: Session) -> dict:
+    drift = refresh(db)
+    db.commit()
+    return drift
+
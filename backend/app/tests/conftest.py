@@ -0,0 +1,57 @@
+import os
+import tempfile
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+# 앱 전역 엔진(TestClient 로 앱 전체를 띄우는 테스트)은 backend/jscorp_hr.db 대신 임시 파일 DB 사용.
+# app.database 를 import 하기 전에 지정해야 하며, DATABASE_URL 을 준 실행(PostgreSQL 등)은 그대로 둠
+_app_db_dir = tempfile.TemporaryDirectory(prefix="jscorp_hr_test_")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{Path(_app_db_dir.name) / 'jscorp_hr.db'}")
+
+from app import database  # noqa: E402
+from app.database import Base  # noqa: E402
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _app_database():
+    yield
+    for eng in {database.engine, database.writer_engine, database.read_engine}:
+        if eng is not None:
+            eng.dispose()
+    _app_db_dir.cleanup()
+
+
+@pytest.fixture()
+def engine():
+    """Isolated engine on the configured backend: in-memory SQLite, or a throwaway PostgreSQL schema."""
+    if database.engine.dialect.name == "sqlite":
+        eng = database.make_engine("sqlite://")
+        yield eng
+        eng.dispose()
+        return
+
+    schema = f"test_{uuid4().hex[:12]}"
+    with database.engine.begin() as conn:
+        conn.execute(text(f"CREATE SCHEMA {schema}"))
+    eng = create_engine(
+        database.DATABASE_URL,
+        connect_args={"options": f"-csearch_path={schema}"},
+    )
+    yield eng
+    eng.dispose()
+    with database.engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+
+
+@pytest.fixture()
+def db(engine, monkeypatch):
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(database, "SessionLocal", factory)
+    session = factory()
+    yield session
+    session.close()
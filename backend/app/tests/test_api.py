@@ -1,3 +1,4 @@
+import pytest
 from fastapi.testclient import TestClient
 
 from app.main import app
@@ -6,6 +7,13 @@ from app.main import app
 client = TestClient(app)
 
 
+@pytest.fixture(autouse=True, scope="module")
+def _startup():
+    # 스키마 확인/시딩은 앱 startup 단계에서 수행되므로 lifespan 을 실행
+    with client:
+        yield
+
+
 def test_health() -> None:
     resp = client.get("/health")
     assert resp.status_code == 200
@@ -57,3 +65,341 @@ def test_list_pay_runs_and_results() -> None:
         results_data = results.json()
         assert isinstance(results_data, list)
 
+
+
+def test_async_read_endpoints() -> None:
+    login = client.post("/api/auth/login", json={"username": "admin", "password": "admin123"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    for url in (
+        "/api/attendance/leave-requests",
+        "/api/attendance/time-logs?year_month=202512",
+    ):
+        resp = client.get(url, headers=headers)
+        assert resp.status_code == 200, f"{url}: {resp.text}"
+        assert isinstance(resp.json(), list)
+    stats = client.get("/api/dashboard/stats", headers=headers)
+    assert stats.status_code == 200
+    assert stats.json()["total_employees"] >= 1
+
+    # 직원 계정은 자기 자신 범위만 조회
+    login = client.post("/api/auth/login", json={"username": "sample1", "password": "sample123"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    resp = client.get("/api/employees", headers=headers)
+    assert resp.status_code == 200
+    assert len(resp.json()) <= 1
+    assert client.get("/api/employees/999999", headers=headers).status_code == 404
+
+
+def test_principal_cached_and_invalidated_on_role_change() -> None:
+    from sqlalchemy import event
+
+    from app import database, models
+
+    login = client.post("/api/auth/login", json={"username": "sample3", "password": "sample123"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    assert client.get("/api/auth/me", headers=headers).json()["role"] == "EMPLOYEE"
+
+    statements = []
+    eng = database.async_read_engine.sync_engine
+    capture = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(eng, "before_cursor_execute", capture)
+    try:
+        assert client.get("/api/auth/me", headers=headers).status_code == 200
+    finally:
+        event.remove(eng, "before_cursor_execute", capture)
+    # 캐시 적중 시 users / employees 조회 없음
+    assert statements == []
+
+    def set_user(**values) -> None:
+        with database.SessionLocal() as db:
+            user = db.query(models.User).filter(models.User.username == "sample3").one()
+            for k, v in values.items():
+                setattr(user, k, v)
+            db.commit()
+
+    try:
+        set_user(role="MANAGER")
+        assert client.get("/api/auth/me", headers=headers).json()["role"] == "MANAGER"
+        set_user(is_active=False)
+        assert client.get("/api/auth/me", headers=headers).status_code == 401
+    finally:
+        set_user(role="EMPLOYEE", is_active=True)
+    assert client.get("/api/auth/me", headers=headers).json()["role"] == "EMPLOYEE"
+
+
+def test_users_paginate_with_cursor() -> None:
+    login = client.post("/api/auth/login", json={"username": "admin", "password": "admin123"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    everything = [u["username"] for u in client.get("/api/users?limit=500", headers=headers).json()]
+
+    seen, cursor = [], None
+    while True:
+        url = "/api/users?limit=2" + (f"&cursor={cursor}" if cursor else "")
+        resp = client.get(url, headers=headers)
+        assert resp.status_code == 200
+        assert len(resp.json()) <= 2
+        seen += [u["username"] for u in resp.json()]
+        cursor = resp.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert seen == everything
+
+    assert client.get("/api/users?cursor=not-a-cursor", headers=headers).status_code == 400
+    assert client.get("/api/users?limit=100000", headers=headers).status_code == 422
+
+
+def test_export_streams_ndjson_and_csv() -> None:
+    import csv
+    import io
+    import json
+
+    login = client.post("/api/auth/login", json={"username": "admin", "password": "admin123"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    resp = client.get("/api/export/employees", headers=headers)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    assert {r["emp_no"] for r in rows} == {e["emp_no"] for e in client.get("/api/employees?limit=500", headers=headers).json()}
+
+    resp = client.get("/api/export/employees?format=csv", headers=headers)
+    assert resp.status_code == 200
+    table = list(csv.reader(io.StringIO(resp.content.decode("utf-8-sig"))))
+    assert table[0][:2] == ["id", "emp_no"]
+    assert len(table) == len(rows) + 1
+
+    runs = client.get("/api/payroll/runs", headers=headers).json()
+    if runs:
+        resp = client.get(f"/api/export/payroll/runs/{runs[0]['id']}/results?format=csv", headers=headers)
+        assert resp.status_code == 200
+        assert "attachment" in resp.headers["content-disposition"]
+    assert client.get("/api/export/payroll/runs/999999/results", headers=headers).status_code == 404
+    assert client.get("/api/export/employees?format=xml", headers=headers).status_code == 422
+
+    # 직원 계정은 본인 행만 내보냄
+    login = client.post("/api/auth/login", json={"username": "sample1", "password": "sample123"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    resp = client.get("/api/export/employees", headers=headers)
+    assert len(resp.text.splitlines()) <= 1
+    resp = client.get("/api/export/attendance/time-logs?year_month=202512", headers=headers)
+    assert resp.status_code == 200
+
+
+def test_time_log_batch_accepts_json_array_and_ndjson() -> None:
+    import json
+    from datetime import datetime
+
+    login = client.post("/api/auth/login", json={"username": "admin", "password": "admin123"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    emp_id = client.get("/api/employees?limit=1", headers=headers).json()[0]["id"]
+    events = [
+        {"emp_id": emp_id, "log_datetime": f"2031-03-0{d}T07:00:00", "log_type": "IN"} for d in (1, 2)
+    ]
+
+    resp = client.post("/api/attendance/time-logs/batch?device_id=GATE-1", json=events, headers=headers)
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["inserted"] == 2
+    # 근태요약은 등록 뒤 큐 작업으로 갱신
+    from app import jobs
+
+    jobs.wait_for(resp.json()["refresh_job_id"], timeout=30)
+    job = client.get(f"/api/jobs/{resp.json()['refresh_job_id']}", headers=headers).json()
+    assert job["job_type"] == "ATTENDANCE_REFRESH_SUMMARIES" and job["status"] == "SUCCEEDED", job
+
+    body = "\n".join(json.dumps(e) for e in events + [{**events[0], "log_datetime": "2031-03-03T07:00:00"}])
+    resp = client.post(
+        "/api/attendance/time-logs/batch",
+        content=body,
+        headers={**headers, "Content-Type": "application/x-ndjson"},
+    )
+    assert resp.status_code == 200
+    assert (resp.json()["inserted"], resp.json()["rejected"]) == (1, 2)
+
+    # 단건 등록도 같은 키로 중복이면 409
+    from app import database, models
+
+    def link(user_id) -> None:
+        with database.SessionLocal() as db:
+            db.get(models.Employee, emp_id).user_id = user_id
+            db.commit()
+
+    login = client.post("/api/auth/login", json={"username": "sample2", "password": "sample123"})
+    own = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    link(client.get("/api/auth/me", headers=own).json()["id"])
+    try:
+        clock_in = {"log_datetime": "2031-03-04T07:00:00", "log_type": "IN"}
+        assert client.post("/api/attendance/time-logs", json=clock_in, headers=own).status_code == 201
+        assert client.post("/api/attendance/time-logs", json=clock_in, headers=own).status_code == 409
+    finally:
+        link(None)
+        # 영속 테스트 DB(PostgreSQL)에서도 재실행 가능하도록 정리
+        with database.SessionLocal() as db:
+            db.query(models.TimeLog).filter(
+                models.TimeLog.emp_id == emp_id,
+                models.TimeLog.log_datetime >= datetime(2031, 3, 1),
+                models.TimeLog.log_datetime < datetime(2031, 4, 1),
+            ).delete()
+            db.commit()
+    assert client.post("/api/attendance/time-logs/batch", json={"emp_id": emp_id}, headers=headers).status_code == 400
+
+
+def test_dashboard_stats_follow_writes() -> None:
+    from app import jobs
+
+    login = client.post("/api/auth/login", json={"username": "admin", "password": "admin123"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    def stats() -> dict:
+        resp = client.get("/api/dashboard/stats", headers=headers)
+        assert resp.status_code == 200
+        return resp.json()
+
+    before = stats()
+    dept = client.post("/api/departments", json={"code": "STATS_TMP", "name": "Stats"}, headers=headers).json()
+    pg = client.post("/api/payroll/pay-groups", json={"code": "STATS_TMP", "name": "Stats"}, headers=headers).json()
+    after = stats()
+    assert after["department_count"] == before["department_count"] + 1
+    assert after["pay_group_count"] == before["pay_group_count"] + 1
+
+    assert client.delete(f"/api/departments/{dept['id']}", headers=headers).status_code == 204
+    assert client.delete(f"/api/payroll/pay-groups/{pg['id']}", headers=headers).status_code == 204
+    assert stats() == before
+
+    # 증감으로 유지한 값은 원본 테이블 재집계와 일치 (보정 없음)
+    resp = client.post("/api/dashboard/stats/reconcile", headers=headers)
+    assert resp.status_code == 202
+    jobs.wait_for(resp.json()["id"], timeout=30)
+    result = client.get(f"/api/jobs/{resp.json()['id']}/result", headers=headers).json()
+    assert result == {"drift": {}}
+
+
+def test_reference_lists_served_with_etag_and_304() -> None:
+    from sqlalchemy import event
+
+    from app import database
+
+    login = client.post("/api/auth/login", json={"username": "admin", "password": "admin123"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    url = "/api/attendance/work-types"
+
+    first = client.get(url, headers=headers)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "private, no-cache"
+
+    statements = []
+    capture = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(database.read_engine, "before_cursor_execute", capture)
+    try:
+        again = client.get(url, headers=headers)
+        not_modified = client.get(url, headers={**headers, "If-None-Match": etag})
+    finally:
+        event.remove(database.read_engine, "before_cursor_execute", capture)
+    # 두 번째부터는 조회/직렬화 없이 보관된 바이트로 응답
+    assert statements == []
+    assert again.content == first.content and again.headers["ETag"] == etag
+    assert not_modified.status_code == 304 and not_modified.content == b""
+
+    # 생성/삭제가 커밋되면 버전이 올라가 새 ETag
+    created = client.post(
+        "/api/attendance/work-types",
+        json={"code": "ETAG_TMP", "name": "Tmp", "start_time": "10:00", "end_time": "19:00"},
+        headers=headers,
+    ).json()
+    try:
+        changed = client.get(url, headers={**headers, "If-None-Match": etag})
+        assert changed.status_code == 200 and changed.headers["ETag"] != etag
+        assert "ETAG_TMP" in {wt["code"] for wt in changed.json()}
+    finally:
+        client.delete(f"/api/attendance/work-types/{created['id']}", headers=headers)
+    assert client.get(url, headers={**headers, "If-None-Match": etag}).status_code == 304
+
+    # 페이지 커서 헤더도 함께 보관
+    page = client.get("/api/departments?limit=1", headers=headers)
+    cached = client.get("/api/departments?limit=1", headers=headers)
+    assert page.headers.get("X-Next-Cursor") == cached.headers.get("X-Next-Cursor")
+
+
+def test_common_code_registry_bulk_and_names() -> None:
+    from sqlalchemy import event
+
+    from app import database, models
+
+    login = client.post("/api/auth/login", json={"username": "admin", "password": "admin123"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    bulk = client.get("/api/codes?groups=LEAVE_TYPE,EMP_STATUS", headers=headers)
+    assert bulk.status_code == 200
+    data = bulk.json()
+    assert set(data) == {"LEAVE_TYPE", "EMP_STATUS"}
+    assert [c["code"] for c in data["LEAVE_TYPE"]][:3] == ["ANNUAL", "SICK", "SPECIAL"]
+    assert client.get("/api/codes?groups=LEAVE_TYPE&groups=NOPE", headers=headers).status_code == 404
+
+    # 레지스트리에서 응답: 다른 그룹 조합도 DB 조회 없음
+    statements = []
+    capture = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(database.read_engine, "before_cursor_execute", capture)
+    try:
+        single = client.get("/api/codes/groups/EMP_STATUS/codes", headers=headers)
+        other = client.get("/api/codes?groups=EMP_STATUS", headers=headers)
+    finally:
+        event.remove(database.read_engine, "before_cursor_execute", capture)
+    assert statements == []
+    assert single.json() == other.json()["EMP_STATUS"] == data["EMP_STATUS"]
+
+    # 휴가신청 응답에 휴가유형 이름 포함
+    emp_id = client.get("/api/employees?limit=1", headers=headers).json()[0]["id"]
+    created = client.post(
+        "/api/attendance/leave-requests",
+        json={
+            "emp_id": emp_id,
+            "leave_type": "SICK",
+            "start_datetime": "2031-03-03T09:00:00",
+            "end_datetime": "2031-03-03T18:00:00",
+            "hours": 8,
+        },
+        headers=headers,
+    ).json()
+    try:
+        assert created["leave_type_name"] == "병가"
+        listed = client.get(f"/api/attendance/leave-requests?emp_id={emp_id}", headers=headers).json()
+        assert {lr["id"]: lr["leave_type_name"] for lr in listed}[created["id"]] == "병가"
+        rejected = client.post(
+            f"/api/attendance/leave-requests/{created['id']}/reject", headers=headers
+        ).json()
+        assert rejected["leave_type_name"] == "병가"
+    finally:
+        with database.SessionLocal() as db:
+            db.delete(db.get(models.LeaveRequest, created["id"]))
+            db.commit()
+
+
+def test_forced_ranking_distribution_is_validated() -> None:
+    login = client.post("/api/auth/login", json={"username": "admin", "password": "admin123"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    plan_id = client.get("/api/evaluations/plans", headers=headers).json()[0]["id"]
+    resp = client.post(
+        f"/api/evaluations/plans/{plan_id}/aggregate",
+        json={"distribution": {"NO_SUCH_GRADE": 100}},
+        headers=headers,
+    )
+    assert resp.status_code == 400
+    assert "Unknown grade" in resp.json()["detail"]
+
+
+def test_earning_formula_cannot_use_gross() -> None:
+    login = client.post("/api/auth/login", json={"username": "admin", "password": "admin123"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    item = {"code": "BONUS_TMP", "name": "Bonus", "calculation_type": "FORMULA", "formula": "gross * 0.1"}
+    resp = client.post("/api/payroll/pay-items", json={**item, "item_type": "EARNING"}, headers=headers)
+    assert resp.status_code == 400 and "gross" in resp.json()["detail"]
+
+    created = client.post("/api/payroll/pay-items", json={**item, "item_type": "DEDUCTION"}, headers=headers)
+    assert created.status_code == 201
+    try:
+        # 공제 -> 지급 변경도 같은 검사
+        resp = client.patch(
+            f"/api/payroll/pay-items/{created.json()['id']}", json={"item_type": "EARNING"}, headers=headers
+        )
+        assert resp.status_code == 400
+    finally:
+        client.delete(f"/api/payroll/pay-items/{created.json()['id']}", headers=headers)
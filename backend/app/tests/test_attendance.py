@@ -0,0 +1,217 @@
+import random
+from datetime import date, datetime
+
+from app import attendance, attendance_kernel, models, payroll
+
+
+def test_ingest_time_logs_dedups_and_reports_rejections(db) -> None:
+    emp = models.Employee(emp_no="E0001", first_name="F", last_name="L", email="e@jscorp.com")
+    db.add(emp)
+    db.flush()
+    db.add(models.TimeLog(emp_id=emp.id, log_datetime=datetime(2025, 1, 2, 7, 0), log_type="IN"))
+    db.commit()
+
+    events = [
+        {"emp_id": emp.id, "log_datetime": "2025-01-02T07:00:00", "log_type": "IN"},  # 기존 기록
+        {"emp_id": emp.id, "log_datetime": "2025-01-02T16:00:00", "log_type": "out"},
+        {"emp_id": emp.id, "log_datetime": "2025-01-02T16:00:00", "log_type": "OUT"},  # 배치 내 중복
+        {"emp_id": emp.id, "log_datetime": "2025-01-03T07:00:00", "log_type": "IN", "device_id": "GATE-2"},
+        {"emp_id": 999999, "log_datetime": "2025-01-03T07:00:00", "log_type": "IN"},
+        {"emp_id": emp.id, "log_datetime": "not-a-date", "log_type": "IN"},
+        {"emp_id": emp.id, "log_datetime": "2025-01-03T08:00:00", "log_type": "BREAK"},
+    ]
+    result = attendance.ingest_time_logs(db, events, device_id="GATE-1")
+
+    assert result["received"] == 7
+    assert result["inserted"] == 2
+    assert result["rejected"] == 5
+    assert [e["index"] for e in result["errors"]] == [0, 2, 4, 5, 6]
+    logs = db.query(models.TimeLog).order_by(models.TimeLog.log_datetime).all()
+    assert [(log.log_type, log.source, log.device_id) for log in logs] == [
+        ("IN", "DEVICE", None),
+        ("OUT", "DEVICE", "GATE-1"),
+        ("IN", "DEVICE", "GATE-2"),
+    ]
+
+    # 같은 배치를 다시 보내면 모두 중복으로 거절
+    again = attendance.ingest_time_logs(db, events[:4])
+    assert again["inserted"] == 0 and again["rejected"] == 4
+
+
+def test_aggregate_month_from_time_logs(db) -> None:
+    day_type = models.WorkType(code="DAY", name="Day", start_time="09:00", end_time="18:00", break_minutes=60)
+    night_type = models.WorkType(code="NIGHT", name="Night", start_time="22:00", end_time="06:00", break_minutes=30)
+    a = models.Employee(emp_no="A", first_name="F", last_name="L", email="a@jscorp.com", hire_date=date(2024, 1, 1))
+    b = models.Employee(
+        emp_no="B", first_name="F", last_name="L", email="b@jscorp.com",
+        hire_date=date(2024, 1, 1), terminate_date=date(2025, 1, 4), status="TERMINATED",
+    )
+    gone = models.Employee(emp_no="C", first_name="F", last_name="L", email="c@jscorp.com", status="TERMINATED")
+    locked = models.Employee(emp_no="D", first_name="F", last_name="L", email="d@jscorp.com", hire_date=date(2024, 1, 1))
+    db.add_all([day_type, night_type, a, b, gone, locked])
+    db.flush()
+    db.add(models.WorkCalendar(work_date=date(2025, 1, 1), is_workday=False, is_holiday=True))
+    db.add(
+        models.WorkSchedule(
+            emp_id=b.id, work_date=date(2025, 1, 4), work_type_id=night_type.id,
+            planned_start=datetime(2025, 1, 4, 22), planned_end=datetime(2025, 1, 5, 6),
+        )
+    )
+    db.add(
+        models.LeaveRequest(
+            emp_id=a.id, leave_type="ANNUAL", status="APPROVED", hours=8,
+            start_datetime=datetime(2025, 1, 6, 9), end_datetime=datetime(2025, 1, 6, 18),
+        )
+    )
+    db.add(models.AttendanceMonthSummary(emp_id=locked.id, year_month="202501", worked_hours=99, is_locked=True))
+    punches = [
+        (a, datetime(2025, 1, 1, 22, 0), "IN"),   # 휴일 야간 근무 (익일 퇴근)
+        (a, datetime(2025, 1, 2, 2, 0), "OUT"),
+        (a, datetime(2025, 1, 2, 9, 10), "IN"),   # 지각 + 연장
+        (a, datetime(2025, 1, 2, 20, 0), "OUT"),
+        (a, datetime(2025, 1, 3, 8, 55), "IN"),   # 조퇴
+        (a, datetime(2025, 1, 3, 17, 0), "OUT"),
+        (a, datetime(2025, 1, 7, 17, 0), "OUT"),  # 짝 없는 퇴근은 무시
+        (b, datetime(2025, 1, 4, 22, 5), "IN"),
+        (b, datetime(2025, 1, 5, 6, 0), "OUT"),
+    ]
+    db.add_all(models.TimeLog(emp_id=e.id, log_datetime=ts, log_type=k) for e, ts, k in punches)
+    db.commit()
+
+    assert attendance.aggregate_month(db, "202501") == {"created": 2, "updated": 0, "locked": 1}
+    rows = {
+        r.emp_id: r
+        for r in db.query(models.AttendanceMonthSummary).filter(models.AttendanceMonthSummary.year_month == "202501")
+    }
+    assert set(rows) == {a.id, b.id, locked.id}
+
+    def hours(r):
+        return [float(r.planned_hours), float(r.worked_hours), float(r.overtime_hours), float(r.night_hours), float(r.holiday_hours)]
+
+    # 1월 근무일 22일(1/1 휴일) x 8h, 근무 180+590+425분, 1/6 승인 휴가는 결근 아님
+    assert hours(rows[a.id]) == [176.0, 19.92, 1.83, 4.0, 3.0]
+    assert (rows[a.id].late_count, rows[a.id].early_leave_count, rows[a.id].absence_count) == (1, 1, 19)
+    # 퇴사일(1/4)까지: 1/2, 1/3 결근 + 토요일 야간조 일정
+    assert hours(rows[b.id]) == [23.5, 7.42, 0.0, 7.92, 7.42]
+    assert (rows[b.id].late_count, rows[b.id].early_leave_count, rows[b.id].absence_count) == (1, 0, 2)
+    assert float(rows[locked.id].worked_hours) == 99
+
+    assert attendance.aggregate_month(db, "202501") == {"created": 0, "updated": 2, "locked": 1}
+
+
+def test_vectorized_kernel_matches_reference(monkeypatch) -> None:
+    rng = random.Random(20250101)
+    days = 31
+    off = tuple(i % 7 in (3, 4) or i == 0 for i in range(days))
+    plans = tuple(
+        None if off[i] else attendance.DayPlan(i * 1440 + 540, i * 1440 + 1080, 60) for i in range(days)
+    )
+    cal = attendance.MonthCalendar("202501", datetime(2025, 1, 1), days, off, plans, 60)
+
+    months = []
+    for emp_id in range(1, 201):
+        first = rng.choice([0, 0, 0, rng.randrange(days)])
+        emp = attendance.EmployeeMonth(emp_id, first, rng.choice([days - 1, days - 1, rng.randrange(first, days)]))
+        # 익월 1일 퇴근, 연속 IN/OUT, 여러 날에 걸친 근무까지 포함
+        m = 0.0
+        while True:
+            m += rng.choice([30, 240, 480, 600, 900, 2000, 3000]) + rng.randrange(60)
+            if m >= (days + 1) * 1440:
+                break
+            emp.punches.append((m, rng.choice(["IN", "IN", "OUT", "OUT", "OUT"])))
+        for day in rng.sample(range(days), 3):
+            start = day * 1440 + rng.choice([540, 1320])
+            emp.plans[day] = attendance.DayPlan(start, start + 480, rng.choice([0, 30]))
+        emp.leave_days.update(rng.sample(range(days), 2))
+        months.append(emp)
+
+    arrays = attendance_kernel.from_employee_months(cal, months)
+    totals = attendance_kernel.summarize_month(cal, arrays, grace=5)
+    monkeypatch.setattr(attendance, "GRACE_MINUTES", 5)
+    for i, emp in enumerate(months):
+        expected = attendance.summarize_employee(cal, emp)
+        for field, value in vars(expected).items():
+            assert abs(totals[field][i] - value) < 1e-6, (emp.emp_id, field)
+    assert all(totals[field].sum() > 0 for field in vars(attendance.MonthTotals()))
+
+
+def _values(row) -> dict:
+    return {f: getattr(row, f) for f in payroll.ATTENDANCE_FIELDS}
+
+
+def test_time_log_writes_refresh_month_summary(db) -> None:
+    db.add(models.WorkType(code="DAY", name="Day", start_time="09:00", end_time="18:00", break_minutes=60))
+    emp = models.Employee(emp_no="A", first_name="F", last_name="L", email="a@jscorp.com", hire_date=date(2024, 1, 1))
+    db.add(emp)
+    db.commit()
+
+    def summary(ym: str) -> models.AttendanceMonthSummary:
+        db.expire_all()
+        return (
+            db.query(models.AttendanceMonthSummary)
+            .filter_by(emp_id=emp.id, year_month=ym)
+            .one()
+        )
+
+    def ingest(events: list[dict]) -> dict:
+        # 일괄 등록은 요약을 건드리지 않고 갱신할 키만 돌려줌 (API 에서는 큐 작업으로 실행)
+        result = attendance.ingest_time_logs(db, events)
+        attendance.refresh_summary_batches(db, result["refresh"], batch_size=1)
+        return result
+
+    result = attendance.ingest_time_logs(
+        db, [{"emp_id": emp.id, "log_datetime": "2025-02-03T09:00:00", "log_type": "IN"}]
+    )
+    assert result["refresh"] == [(emp.id, "202502")]
+    assert db.query(models.AttendanceMonthSummary).count() == 0
+    assert attendance.refresh_summary_batches(db, result["refresh"]) == {"created": 1, "updated": 0, "locked": 0}
+    assert float(summary("202502").worked_hours) == 0
+    ingest([{"emp_id": emp.id, "log_datetime": "2025-02-03T19:00:00", "log_type": "OUT"}])
+    assert (float(summary("202502").worked_hours), float(summary("202502").overtime_hours)) == (9.0, 1.0)
+
+    # 2/28 야간 근무의 3/1 퇴근은 2월 요약에 반영
+    ingest(
+        [
+            {"emp_id": emp.id, "log_datetime": "2025-02-28T22:00:00", "log_type": "IN"},
+            {"emp_id": emp.id, "log_datetime": "2025-03-01T06:00:00", "log_type": "OUT"},
+        ],
+    )
+    assert float(summary("202502").night_hours) == 8.0
+    incremental = {k: float(v) for k, v in _values(summary("202502")).items()}
+
+    # 증분 결과는 월 전체 재집계와 같음
+    attendance.aggregate_month(db, "202502")
+    assert {k: float(v) for k, v in _values(summary("202502")).items()} == incremental
+
+    attendance.close_month(db, "202502")
+    result = attendance.ingest_time_logs(
+        db, [{"emp_id": emp.id, "log_datetime": "2025-02-04T09:00:00", "log_type": "IN"}]
+    )
+    assert result["errors"] == [{"index": 0, "reason": "Attendance month is closed"}]
+
+
+def test_closed_month_blocks_employees_without_a_summary(db) -> None:
+    with_row = models.Employee(emp_no="A", first_name="F", last_name="L", email="a@jscorp.com", hire_date=date(2024, 1, 1))
+    without_row = models.Employee(emp_no="B", first_name="F", last_name="L", email="b@jscorp.com", hire_date=date(2024, 1, 1))
+    db.add_all([with_row, without_row])
+    db.flush()
+    db.add(models.AttendanceMonthSummary(emp_id=with_row.id, year_month="202502"))
+    db.commit()
+
+    assert attendance.close_month(db, "202502") == {"locked_rows": 1}
+    assert attendance.closed_months(db, {(without_row.id, "202502"), (without_row.id, "202503")}) == {
+        (without_row.id, "202502")
+    }
+
+    result = attendance.ingest_time_logs(
+        db, [{"emp_id": without_row.id, "log_datetime": "2025-02-04T09:00:00", "log_type": "IN"}]
+    )
+    assert result["errors"] == [{"index": 0, "reason": "Attendance month is closed"}]
+    # 3/1 출근은 받지만 마감된 2월 요약은 만들지 않음
+    result = attendance.ingest_time_logs(
+        db, [{"emp_id": without_row.id, "log_datetime": "2025-03-01T09:00:00", "log_type": "IN"}]
+    )
+    attendance.refresh_summary_batches(db, result["refresh"])
+    assert attendance.aggregate_month(db, "202502") == {"created": 0, "updated": 0, "locked": 1}
+    months = db.query(models.AttendanceMonthSummary.year_month).filter_by(emp_id=without_row.id).all()
+    assert [m for (m,) in months] == ["202503"]
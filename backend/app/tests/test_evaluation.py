@@ -0,0 +1,155 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.exc import IntegrityError
+
+from app import evaluation, models, org
+
+
+def _seed(db):
+    def dept(code, parent=None):
+        d = models.Department(code=code, name=code, parent_id=parent.id if parent else None)
+        db.add(d)
+        db.flush()
+        org.add_department(db, d)
+        return d
+
+    hq = dept("HQ")
+    plant = dept("P1", hq)
+    line = dept("L1", plant)
+    pg1 = models.PayGroup(code="PG1", name="PG1")
+    pg2 = models.PayGroup(code="PG2", name="PG2")
+    plan = models.EvaluationPlan(name="Plan", year=2025, status="OPEN")
+    db.add_all([pg1, pg2, plan])
+    db.flush()
+    for key, d, pg, status in (
+        ("hq", hq, pg1, "ACTIVE"),
+        ("plant", plant, pg1, "ACTIVE"),
+        ("line", line, pg2, "ACTIVE"),
+        ("gone", line, pg2, "TERMINATED"),
+    ):
+        db.add(
+            models.Employee(
+                emp_no=key, first_name="F", last_name="L", email=f"{key}@jscorp.com",
+                dept_id=d.id, pay_group_id=pg.id, status=status,
+            )
+        )
+    db.commit()
+    return plan.id, plant.id, pg2.id
+
+
+def _targets(db, plan_id: int) -> set[str]:
+    return set(
+        db.scalars(
+            select(models.Employee.emp_no)
+            .join(models.EvaluationTarget, models.EvaluationTarget.emp_id == models.Employee.id)
+            .where(models.EvaluationTarget.plan_id == plan_id)
+        )
+    )
+
+
+def test_seed_targets_is_one_statement_with_filters(db) -> None:
+    plan_id, plant_id, pg2_id = _seed(db)
+
+    statements = []
+    capture = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(db.get_bind(), "before_cursor_execute", capture)
+    try:
+        assert evaluation.seed_targets(db, plan_id, pay_group_id=pg2_id) == {"created": 1}
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", capture)
+    assert len(statements) == 1 and statements[0].lstrip().upper().startswith("INSERT")
+    assert _targets(db, plan_id) == {"line"}
+
+    # 하위 부서 포함, 이미 대상인 직원은 건너뜀
+    assert evaluation.seed_targets(db, plan_id, dept_id=plant_id) == {"created": 1}
+    assert _targets(db, plan_id) == {"line", "plant"}
+    assert evaluation.seed_targets(db, plan_id) == {"created": 1}
+    assert evaluation.seed_targets(db, plan_id) == {"created": 0}
+    assert _targets(db, plan_id) == {"hq", "plant", "line"}
+
+    emp_id = db.scalar(select(models.Employee.id).where(models.Employee.emp_no == "hq"))
+    db.add(models.EvaluationTarget(plan_id=plan_id, emp_id=emp_id))
+    with pytest.raises(IntegrityError):
+        db.commit()
+    db.rollback()
+
+
+def test_grade_table_matches_linear_scan() -> None:
+    rng = random.Random(7)
+    for _ in range(200):
+        policies = []
+        for pid in range(rng.randint(0, 6)):
+            low = rng.choice(range(0, 100, 10))
+            high = low + rng.choice((5, 10, 15, 30))
+            policies.append(
+                SimpleNamespace(id=pid, min_score=low, max_score=high, grade=f"G{pid}", is_promotion_candidate=pid % 2 == 0)
+            )
+        table = evaluation.GradeTable.compile(policies)
+        ordered = sorted(policies, key=lambda p: (p.min_score, p.id))
+        for score in [rng.uniform(-5, 135) for _ in range(20)] + [0, 10, 50, 90, 100]:
+            # 기존 구현: min_score 순으로 처음 포함되는 정책
+            match = next((p for p in ordered if p.min_score <= score <= p.max_score), None)
+            expected = (match.grade, match.is_promotion_candidate) if match else (None, False)
+            assert table.lookup(score) == expected, (score, policies)
+
+
+def _seed_results(db, scores):
+    plan = models.EvaluationPlan(name="Plan", year=2025, status="OPEN")
+    db.add(plan)
+    db.flush()
+    for low, high, grade, promo in ((90, 100, "S", True), (80, 90, "A", True), (60, 80, "B", False), (0, 60, "C", False)):
+        db.add(models.GradePolicy(plan_id=plan.id, min_score=low, max_score=high, grade=grade, is_promotion_candidate=promo))
+    for i, score in enumerate(scores):
+        emp = models.Employee(emp_no=f"R{i}", first_name="F", last_name="L", email=f"r{i}@jscorp.com")
+        db.add(emp)
+        db.flush()
+        db.add(models.EvaluationResult(plan_id=plan.id, emp_id=emp.id, score=score))
+    db.commit()
+    return plan.id
+
+
+def _grades(db, plan_id: int) -> list[tuple[float, str | None, bool]]:
+    r = models.EvaluationResult
+    db.expire_all()
+    return [
+        (float(score), grade, promo)
+        for score, grade, promo in db.execute(
+            select(r.score, r.grade, r.is_promotion_candidate).where(r.plan_id == plan_id).order_by(r.score.desc(), r.id)
+        )
+    ]
+
+
+def test_aggregate_grades_by_score_in_one_update(db) -> None:
+    plan_id = _seed_results(db, [95, 90, 85, 70, 60, 30])
+
+    statements = []
+    capture = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(db.get_bind(), "before_cursor_execute", capture)
+    try:
+        assert evaluation.aggregate_grades(db, plan_id) == {"updated": 6}
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", capture)
+    assert sum(st.lstrip().upper().startswith("UPDATE") for st in statements) == 1
+    # 구간 경계(90, 60)는 아래 구간
+    assert _grades(db, plan_id) == [
+        (95, "S", True), (90, "A", True), (85, "A", True), (70, "B", False), (60, "C", False), (30, "C", False),
+    ]
+
+
+def test_aggregate_grades_by_distribution(db) -> None:
+    plan_id = _seed_results(db, [99, 91, 88, 88, 75, 74, 70, 65, 50, 20])
+
+    result = evaluation.aggregate_grades(db, plan_id, {"S": 10, "A": 20, "B": 40, "C": 30})
+    assert result == {"updated": 10}
+    grades = [g for _, g, _ in _grades(db, plan_id)]
+    # 동점(88)은 함께 상위 등급
+    assert grades == ["S", "A", "A", "A", "B", "B", "B", "C", "C", "C"]
+    assert [p for _, _, p in _grades(db, plan_id)][:4] == [True] * 4
+
+    with pytest.raises(evaluation.GradingError):
+        evaluation.aggregate_grades(db, plan_id, {"S": 50, "X": 50})
+    with pytest.raises(evaluation.GradingError):
+        evaluation.aggregate_grades(db, plan_id, {"S": 50, "A": 20})
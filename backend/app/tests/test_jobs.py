@@ -0,0 +1,222 @@
+import json
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import insert, update
+
+from app import attendance, database, jobs, models
+from app.database import Base
+
+
+def test_payroll_job_runs_in_background(db) -> None:
+    pg = models.PayGroup(code="PG", name="PG")
+    db.add(pg)
+    db.flush()
+    emp = models.Employee(emp_no="E1", first_name="F", last_name="L", email="e1@jscorp.com", pay_group_id=pg.id)
+    db.add(emp)
+    db.flush()
+    db.add(models.AttendanceMonthSummary(emp_id=emp.id, year_month="202501", worked_hours=10))
+    run = models.PayRun(pay_group_id=pg.id, year_month="202501")
+    db.add(run)
+    db.commit()
+
+    job = jobs.submit_job(db, "PAYROLL_CALCULATE", {"run_id": run.id})
+    jobs.wait_for(job.id, timeout=30)
+
+    db.expire_all()
+    job = db.get(models.Job, job.id)
+    assert job.status == "SUCCEEDED", job.error
+    assert job.progress == 100
+    assert json.loads(job.result) == {"created": 1, "updated": 0}
+
+
+def test_cancelled_queued_job_never_runs(db) -> None:
+    job = models.Job(job_type="ATTENDANCE_CLOSE_MONTH", params=json.dumps({"year_month": "202501"}))
+    db.add(job)
+    db.commit()
+
+    jobs.cancel_job(db, job)
+    jobs.run_job(job.id)
+
+    db.expire_all()
+    job = db.get(models.Job, job.id)
+    assert job.status == "CANCELLED"
+    assert job.started_at is None
+
+
+def test_failed_job_records_error(db) -> None:
+    job = jobs.submit_job(db, "PAYROLL_CALCULATE", {"run_id": 999})
+    jobs.wait_for(job.id, timeout=30)
+
+    db.expire_all()
+    job = db.get(models.Job, job.id)
+    assert job.status == "FAILED"
+    assert "not found" in job.error
+
+
+def test_restart_fails_only_running_jobs_with_an_expired_lease(db) -> None:
+    now = datetime.now(timezone.utc)
+    stale = now - timedelta(seconds=jobs.JOB_LEASE_SECONDS + 10)
+
+    def running(**values) -> models.Job:
+        return models.Job(job_type="ATTENDANCE_CLOSE_MONTH", params="{}", status="RUNNING", progress=40, **values)
+
+    dead = running(worker_id="host-a:1", started_at=stale, heartbeat_at=stale)
+    # 다른 워커 프로세스가 실행 중인 작업
+    alive = running(worker_id="host-b:2", started_at=stale, heartbeat_at=now)
+    # 리스 컬럼 이전에 시작된 작업
+    legacy = running(started_at=stale)
+    done = models.Job(job_type="ATTENDANCE_CLOSE_MONTH", params="{}", status="SUCCEEDED", progress=100)
+    db.add_all([dead, alive, legacy, done])
+    db.commit()
+
+    jobs.resume_queued_jobs()
+
+    db.expire_all()
+    for job in (dead, legacy):
+        assert job.status == "FAILED"
+        assert job.error == "Interrupted: worker lease expired" and job.finished_at is not None
+    assert alive.status == "RUNNING"
+    assert done.status == "SUCCEEDED"
+
+
+def _run_with_handler(db, monkeypatch, handler) -> models.Job:
+    monkeypatch.setitem(jobs.HANDLERS, "DASHBOARD_RECONCILE", handler)
+    job = models.Job(job_type="DASHBOARD_RECONCILE", params="{}")
+    db.add(job)
+    db.commit()
+    jobs.run_job(job.id)
+    db.expire_all()
+    return db.get(models.Job, job.id)
+
+
+def _expire_lease(job_id: int) -> None:
+    # 다른 프로세스가 리스 만료로 실패 처리한 상황
+    with database.SessionLocal() as other:
+        other.execute(
+            update(models.Job).where(models.Job.id == job_id).values(status="FAILED", error="Interrupted: worker lease expired")
+        )
+        other.commit()
+
+
+def test_job_failed_after_lease_expiry_is_not_overwritten(db, monkeypatch) -> None:
+    def handler(session, params, progress) -> dict:
+        _expire_lease(session.query(models.Job.id).filter(models.Job.status == "RUNNING").scalar())
+        return {"drift": {}}
+
+    job = _run_with_handler(db, monkeypatch, handler)
+    # 실패 처리된 작업은 핸들러가 끝나도 SUCCEEDED 로 되돌아가지 않음
+    assert job.status == "FAILED"
+    assert job.error == "Interrupted: worker lease expired" and job.result is None
+
+
+def test_progress_after_lease_loss_stops_the_handler(db, monkeypatch) -> None:
+    steps = []
+
+    def handler(session, params, progress) -> dict:
+        job_id = session.query(models.Job.id).filter(models.Job.status == "RUNNING").scalar()
+        progress(10)
+        steps.append(10)
+        _expire_lease(job_id)
+        progress(20)
+        steps.append(20)
+        return {}
+
+    job = _run_with_handler(db, monkeypatch, handler)
+    assert steps == [10]
+    assert job.status == "FAILED" and job.progress == 10
+
+
+def test_heartbeat_renews_leases_of_jobs_running_here(db, monkeypatch) -> None:
+    seen = {}
+
+    def handler(session, params, progress) -> dict:
+        job_id = session.query(models.Job.id).filter(models.Job.status == "RUNNING").scalar()
+        job = session.get(models.Job, job_id)
+        seen["worker_id"] = job.worker_id
+        stale = datetime.now(timezone.utc) - timedelta(seconds=jobs.JOB_LEASE_SECONDS + 10)
+        with database.SessionLocal() as other:
+            other.execute(update(models.Job).where(models.Job.id == job_id).values(heartbeat_at=stale))
+            other.commit()
+        seen["heartbeat"] = jobs.heartbeat()
+        return {}
+
+    job = _run_with_handler(db, monkeypatch, handler)
+    assert seen == {"worker_id": jobs.worker_id(), "heartbeat": {"renewed": 1, "expired": 0}}
+    assert job.status == "SUCCEEDED"
+
+
+def _sqlite_writer_factory(tmp_path, monkeypatch, employees: int):
+    # production 프로필: 핸들러 트랜잭션과 작업 상태 기록이 SQLite 쓰기 잠금을 나눠 씀 (교착이면 2초 만에 실패)
+    monkeypatch.setattr(database, "SQLITE_BUSY_TIMEOUT_MS", 2000)
+    url = f"sqlite:///{tmp_path / 'hr.db'}"
+    reader = database.make_engine(url, sqlite_profile="production")
+    writer = database.make_engine(url, writer=True, sqlite_profile="production")
+    Base.metadata.create_all(bind=reader)
+    factory = database.make_session_factory(reader, writer)
+    monkeypatch.setattr(database, "SessionLocal", factory)
+    with factory() as db:
+        db.execute(
+            insert(models.Employee),
+            [
+                {"emp_no": f"E{i:05d}", "first_name": "F", "last_name": "L", "email": f"e{i}@jscorp.com", "hire_date": date(2020, 1, 1)}
+                for i in range(employees)
+            ],
+        )
+        db.commit()
+    return factory, (reader, writer)
+
+
+def _record_progress(monkeypatch, on_progress=None) -> list[int]:
+    written = []
+    set_job = jobs._set_job
+
+    def spy(job_id, **values):
+        if "progress" in values and "status" not in values:
+            written.append(values["progress"])
+            if on_progress:
+                on_progress(job_id, values["progress"])
+        return set_job(job_id, **values)
+
+    monkeypatch.setattr(jobs, "_set_job", spy)
+    return written
+
+
+def test_month_aggregate_job_reports_progress_per_batch_on_sqlite_writer(tmp_path, monkeypatch) -> None:
+    n = 2 * attendance.AGGREGATE_BATCH_SIZE + 1
+    factory, engines = _sqlite_writer_factory(tmp_path, monkeypatch, n)
+    written = _record_progress(monkeypatch)
+
+    with factory() as db:
+        job_id = jobs.submit_job(db, "ATTENDANCE_AGGREGATE_MONTH", {"year_month": "202501"}).id
+    jobs.wait_for(job_id, timeout=60)
+
+    with factory() as db:
+        job = db.get(models.Job, job_id)
+        assert job.status == "SUCCEEDED", job.error
+        assert json.loads(job.result)["created"] == n
+    # 쓰기 단계에서도 배치마다 진행률 기록
+    assert [p for p in written if 50 < p < 100] == [69, 89]
+    for eng in engines:
+        eng.dispose()
+
+
+def test_month_aggregate_job_can_be_cancelled_while_writing(tmp_path, monkeypatch) -> None:
+    n = 2 * attendance.AGGREGATE_BATCH_SIZE + 1
+    factory, engines = _sqlite_writer_factory(tmp_path, monkeypatch, n)
+
+    def cancel_after_first_batch(job_id: int, pct: int) -> None:
+        if pct > 50:
+            with factory() as db:
+                jobs.cancel_job(db, db.get(models.Job, job_id))
+
+    _record_progress(monkeypatch, cancel_after_first_batch)
+    with factory() as db:
+        job_id = jobs.submit_job(db, "ATTENDANCE_AGGREGATE_MONTH", {"year_month": "202501"}).id
+    jobs.wait_for(job_id, timeout=60)
+
+    with factory() as db:
+        assert db.get(models.Job, job_id).status == "CANCELLED"
+        # 취소 전에 커밋된 배치만 남음 (다시 실행하면 나머지를 채움)
+        assert db.query(models.AttendanceMonthSummary).count() == 2 * attendance.AGGREGATE_BATCH_SIZE
+    for eng in engines:
+        eng.dispose()
@@ -0,0 +1,226 @@
+import pytest
+from sqlalchemy import create_engine, event, inspect, select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app import migrations, models, payroll, stats
+from app.database import Base
+
+
+def _engine():
+    return create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+
+def test_run_migrations_is_noop_when_current(engine) -> None:
+    eng = engine
+    applied = migrations.run_migrations(eng)
+    assert applied == [v for v, _, _ in migrations.MIGRATIONS]
+
+    statements = []
+    event.listen(eng, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    assert migrations.run_migrations(eng) == []
+    assert not [s for s in statements if not s.lstrip().upper().startswith(("SELECT", "PRAGMA", "SHOW"))]
+
+
+def _schema(conn) -> dict:
+    insp = inspect(conn)
+    return {
+        table: (
+            {c["name"] for c in insp.get_columns(table)},
+            {i["name"] for i in insp.get_indexes(table) if "duplicates_constraint" not in i},
+        )
+        for table in insp.get_table_names()
+        if table != "schema_migrations"
+    }
+
+
+@pytest.mark.filterwarnings("ignore:Skipped unsupported reflection of expression-based index")
+def test_fresh_database_is_built_by_the_versions_not_the_models(engine) -> None:
+    # v1 은 버전 관리 이전 스키마만 만들고, 이후 테이블/인덱스는 각 버전이 추가해 최종적으로 모델과 일치
+    migrations.run_migrations(engine)
+    with engine.connect() as conn:
+        actual = _schema(conn)
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                # SQLite 리플렉션에서 빠지는 식 인덱스 포함
+                assert migrations._has_index(conn, table.name, index.name), index.name
+
+    expected = {
+        t.name: ({c.name for c in t.columns}, {i.name for i in t.indexes})
+        for t in Base.metadata.sorted_tables
+    }
+    assert actual.keys() == expected.keys()
+    for table, (columns, indexes) in expected.items():
+        assert actual[table][0] == columns, table
+        # 이전 버전이 만들고 대체된 인덱스(평가결과 키, 출퇴근 조회 인덱스)는 남지 않음
+        assert actual[table][1] <= indexes, table
+
+    from app import baseline_schema
+
+    assert {"jobs", "dashboard_stats", "department_closure"}.isdisjoint(baseline_schema.metadata.tables)
+    assert "formula" not in baseline_schema.metadata.tables["pay_items"].c
+
+
+def test_run_migrations_upgrades_legacy_sqlite_schema() -> None:
+    eng = _engine()
+    with eng.begin() as conn:
+        conn.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY, username VARCHAR(50), password_hash VARCHAR(255), is_active BOOLEAN, created_at DATETIME, updated_at DATETIME)"))
+        conn.execute(text("CREATE TABLE pay_items (id INTEGER PRIMARY KEY, code VARCHAR(20), name VARCHAR(100), item_type VARCHAR(20), taxable BOOLEAN, calculation_type VARCHAR(20), default_amount DECIMAL(15, 2), created_at DATETIME, updated_at DATETIME)"))
+
+    migrations.run_migrations(eng)
+
+    insp = inspect(eng)
+    assert {"email", "role", "verification_token"} <= {c["name"] for c in insp.get_columns("users")}
+    assert "formula" in {c["name"] for c in insp.get_columns("pay_items")}
+    assert "uq_pay_results_pay_run_id_emp_id" in {i["name"] for i in insp.get_indexes("pay_results")}
+
+
+_PAY_ITEMS_DDL = "CREATE TABLE pay_items (id INTEGER PRIMARY KEY, code VARCHAR(20), name VARCHAR(100), item_type VARCHAR(20), taxable BOOLEAN, calculation_type VARCHAR(20), default_amount DECIMAL(15, 2), created_at DATETIME, updated_at DATETIME)"
+
+
+def _baseline_pay_items(conn, base_amount: int = 0) -> None:
+    # 초기 버전 시딩: 모든 항목 FIXED
+    conn.execute(text(_PAY_ITEMS_DDL))
+    for i, (code, itype, amount) in enumerate(
+        (("BASE", "EARNING", base_amount), ("OT", "EARNING", 0), ("TAX", "DEDUCTION", 0), ("INS", "DEDUCTION", 0)), 1
+    ):
+        conn.execute(
+            text("INSERT INTO pay_items (id, code, name, item_type, taxable, calculation_type, default_amount) VALUES (:id, :code, :code, :t, 1, 'FIXED', :a)"),
+            {"id": i, "code": code, "t": itype, "a": amount},
+        )
+
+
+def test_baseline_seeded_pay_items_get_current_rules() -> None:
+    eng = _engine()
+    with eng.begin() as conn:
+        _baseline_pay_items(conn)
+    migrations.run_migrations(eng)
+
+    with Session(eng) as db:
+        pg = models.PayGroup(code="PG", name="PG")
+        db.add(pg)
+        db.flush()
+        emp = models.Employee(emp_no="E1", first_name="F", last_name="L", email="e1@jscorp.com", pay_group_id=pg.id)
+        db.add(emp)
+        db.flush()
+        db.add(models.AttendanceMonthSummary(emp_id=emp.id, year_month="202501", worked_hours=160))
+        run = models.PayRun(pay_group_id=pg.id, year_month="202501")
+        db.add(run)
+        db.commit()
+
+        payroll.calculate_pay_run(db, run)
+        result = db.scalars(select(models.PayResult)).one()
+        assert float(result.gross_amount) == 3_200_000
+        assert float(result.deduct_amount) == 320_000
+        assert float(result.net_amount) == 2_880_000
+
+
+def test_configured_pay_items_are_left_alone() -> None:
+    eng = _engine()
+    with eng.begin() as conn:
+        _baseline_pay_items(conn, base_amount=3_000_000)
+    migrations.run_migrations(eng)
+
+    with eng.connect() as conn:
+        rules = dict(conn.execute(text("SELECT code, calculation_type FROM pay_items")).all())
+    assert rules == {"BASE": "FIXED", "OT": "FIXED", "TAX": "FIXED", "INS": "FIXED"}
+
+
+def test_duplicate_keys_fail_the_migration_until_deduped() -> None:
+    eng = _engine()
+    Base.metadata.create_all(bind=eng)
+    migrations.schema_migrations.create(bind=eng)
+    with eng.begin() as conn:
+        # v12 까지 적용된 DB: NULL 평가자를 막지 못하던 이전 인덱스, 중복 때문에 만들지 못한 급여결과 키
+        conn.execute(text("DROP INDEX uq_evaluation_results_plan_id_emp_id_evaluator"))
+        conn.execute(text("CREATE UNIQUE INDEX uq_evaluation_results_plan_id_emp_id_evaluator_emp_id ON evaluation_results (plan_id, emp_id, evaluator_emp_id)"))
+        conn.execute(text("DROP INDEX uq_pay_results_pay_run_id_emp_id"))
+        for version, name, _ in migrations.MIGRATIONS:
+            if version < 13:
+                conn.execute(migrations.schema_migrations.insert().values(version=version, name=name))
+        conn.execute(models.EvaluationPlan.__table__.insert().values(id=1, name="P", year=2025, status="OPEN"))
+        conn.execute(models.EvaluationItem.__table__.insert().values(id=1, plan_id=1, name="I", weight=100))
+        conn.execute(
+            models.Employee.__table__.insert().values(id=1, emp_no="E1", first_name="F", last_name="L", email="e1@jscorp.com")
+        )
+        for rid, score in ((1, 70), (2, 80), (3, 90)):
+            conn.execute(models.EvaluationResult.__table__.insert().values(id=rid, plan_id=1, emp_id=1, score=score))
+            conn.execute(models.EvaluationScore.__table__.insert().values(result_id=rid, item_id=1, score=score))
+        conn.execute(models.PayGroup.__table__.insert().values(id=1, code="PG", name="PG"))
+        conn.execute(models.PayItem.__table__.insert().values(id=1, code="BASE", name="Base", item_type="EARNING"))
+        conn.execute(models.PayRun.__table__.insert().values(id=1, pay_group_id=1, year_month="202501"))
+        for pid, net in ((1, 100), (2, 300)):
+            conn.execute(models.PayResult.__table__.insert().values(id=pid, pay_run_id=1, emp_id=1, net_amount=net))
+            conn.execute(models.PayResultItem.__table__.insert().values(pay_result_id=pid, pay_item_id=1, amount=net))
+        stats.refresh(conn)
+
+    with pytest.raises(migrations.MigrationError, match="duplicate key"):
+        migrations.run_migrations(eng)
+
+    # 데이터는 그대로이고 버전은 미적용
+    assert 13 not in migrations.applied_versions(eng)
+    with eng.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM evaluation_results")).scalar() == 3
+        found = migrations.find_duplicates(conn)
+    assert found["uq_evaluation_results_plan_id_emp_id_evaluator"] == [((1, 1, 0), [1, 2, 3])]
+    assert found["uq_pay_results_pay_run_id_emp_id"] == [((1, 1), [1, 2])]
+
+    with eng.begin() as conn:
+        assert migrations.dedupe(conn) == {
+            "uq_evaluation_results_plan_id_emp_id_evaluator": 2,
+            "uq_pay_results_pay_run_id_emp_id": 1,
+        }
+    assert migrations.run_migrations(eng)[0] == 13
+
+    with eng.connect() as conn:
+        # 키마다 가장 최근 행과 그 하위 행만 남고, 대시보드 합계도 다시 계산됨
+        assert conn.execute(text("SELECT id, score FROM evaluation_results")).all() == [(3, 90)]
+        assert conn.execute(text("SELECT result_id FROM evaluation_scores")).scalars().all() == [3]
+        assert conn.execute(text("SELECT pay_result_id FROM pay_result_items")).scalars().all() == [2]
+        assert float(conn.execute(text("SELECT total_payroll FROM dashboard_stats")).scalar()) == 300
+    with pytest.raises(IntegrityError), eng.begin() as conn:
+        conn.execute(models.EvaluationResult.__table__.insert().values(plan_id=1, emp_id=1, score=50))
+
+
+def test_integrity_error_inside_a_migration_is_not_skipped(monkeypatch) -> None:
+    eng = _engine()
+    migrations.run_migrations(eng)
+
+    def failing(conn) -> None:
+        conn.execute(text("CREATE TABLE extra (id INTEGER PRIMARY KEY)"))
+        conn.execute(text("INSERT INTO extra (id) VALUES (1), (1)"))
+
+    def later(conn) -> None:
+        raise AssertionError("ran after a failed migration")
+
+    monkeypatch.setattr(migrations, "MIGRATIONS", migrations.MIGRATIONS + [(98, "failing", failing), (99, "later", later)])
+    with pytest.raises(IntegrityError):
+        migrations.run_migrations(eng)
+
+    assert {98, 99}.isdisjoint(migrations.applied_versions(eng))
+    assert not inspect(eng).has_table("extra")
+
+
+def test_months_closed_by_locked_summaries_are_recorded() -> None:
+    eng = _engine()
+    Base.metadata.create_all(bind=eng)
+    migrations.schema_migrations.create(bind=eng)
+    with eng.begin() as conn:
+        conn.execute(text("DROP TABLE attendance_month_closes"))
+        for version, name, _ in migrations.MIGRATIONS:
+            if version < 16:
+                conn.execute(migrations.schema_migrations.insert().values(version=version, name=name))
+        conn.execute(
+            models.Employee.__table__.insert().values(id=1, emp_no="E1", first_name="F", last_name="L", email="e1@jscorp.com")
+        )
+        conn.execute(models.AttendanceMonthSummary.__table__.insert().values(emp_id=1, year_month="202501", is_locked=True))
+        conn.execute(models.AttendanceMonthSummary.__table__.insert().values(emp_id=1, year_month="202502"))
+
+    assert migrations.run_migrations(eng) == [16]
+    with eng.connect() as conn:
+        assert conn.execute(text("SELECT year_month FROM attendance_month_closes")).scalars().all() == ["202501"]
@@ -0,0 +1,60 @@
+from sqlalchemy import select
+
+from app import models, org
+
+
+def _dept(db, code, parent=None):
+    d = models.Department(code=code, name=code, parent_id=parent.id if parent else None)
+    db.add(d)
+    db.flush()
+    org.add_department(db, d)
+    return d
+
+
+def _pairs(db) -> set[tuple[int, int, int]]:
+    C = models.DepartmentClosure
+    return set(db.execute(select(C.ancestor_id, C.descendant_id, C.depth)).all())
+
+
+def _subtree_codes(db, dept) -> list[str]:
+    return [d.code for d, _ in db.execute(org.subtree(dept.id))]
+
+
+def test_closure_maintained_incrementally(db) -> None:
+    hq = _dept(db, "HQ")
+    plant = _dept(db, "PLANT", hq)
+    line = _dept(db, "LINE", plant)
+    shift = _dept(db, "SHIFT", line)
+    sales = _dept(db, "SALES", hq)
+    db.commit()
+
+    assert _subtree_codes(db, plant) == ["PLANT", "LINE", "SHIFT"]
+    assert _subtree_codes(db, hq) == ["HQ", "PLANT", "SALES", "LINE", "SHIFT"]
+
+    # LINE(하위 SHIFT 포함)을 SALES 아래로 이동
+    org.move_department(db, line, sales.id)
+    line.parent_id = sales.id
+    db.commit()
+    assert _subtree_codes(db, plant) == ["PLANT"]
+    assert _subtree_codes(db, sales) == ["SALES", "LINE", "SHIFT"]
+
+    try:
+        org.move_department(db, sales, shift.id)
+    except org.HierarchyError:
+        pass
+    else:
+        raise AssertionError("cycle accepted")
+
+    try:
+        org.remove_department(db, line)
+    except org.HierarchyError:
+        pass
+    else:
+        raise AssertionError("removed department with children")
+    org.remove_department(db, shift)
+    db.delete(shift)
+    db.commit()
+
+    incremental = _pairs(db)
+    org.rebuild_closure(db)
+    assert _pairs(db) == incremental
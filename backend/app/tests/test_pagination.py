@@ -0,0 +1,36 @@
+from datetime import datetime
+
+from fastapi import Response
+from sqlalchemy import select
+
+from app import models, pagination
+
+
+def test_keyset_descending_with_ties(db) -> None:
+    emps = [
+        models.Employee(emp_no=f"E{i}", first_name="F", last_name="L", email=f"e{i}@jscorp.com")
+        for i in range(3)
+    ]
+    db.add_all(emps)
+    db.flush()
+    # 같은 시각 기록(직원 3명)이 페이지 경계에 걸쳐도 누락/중복 없음
+    stamps = [(e, datetime(2025, 1, 1, 9)) for e in emps]
+    stamps += [(emps[0], datetime(2025, 1, 2, 9)), (emps[0], datetime(2025, 1, 3, 18))]
+    db.add_all(models.TimeLog(emp_id=e.id, log_datetime=ts, log_type="IN") for e, ts in stamps)
+    db.commit()
+
+    keys = pagination.Keyset((models.TimeLog.log_datetime, models.TimeLog.id), descending=True)
+    expected = list(
+        db.scalars(select(models.TimeLog.id).order_by(models.TimeLog.log_datetime.desc(), models.TimeLog.id.desc()))
+    )
+
+    seen, cursor = [], None
+    while True:
+        page = pagination.PageParams(cursor=cursor, limit=2)
+        response = Response()
+        rows = keys.page(db.scalars(keys.apply(select(models.TimeLog), page)), page, response)
+        seen += [r.id for r in rows]
+        cursor = response.headers.get(pagination.NEXT_CURSOR_HEADER)
+        if not cursor:
+            break
+    assert seen == expected
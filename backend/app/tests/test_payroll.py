@@ -0,0 +1,136 @@
+from app import models, payroll, stats
+
+
+def _seed_run(db, n_employees: int = 5):
+    pg = models.PayGroup(code="PG", name="PG")
+    db.add(pg)
+    db.flush()
+    emps = []
+    for i in range(n_employees):
+        emp = models.Employee(
+            emp_no=f"E{i:04d}",
+            first_name="F",
+            last_name="L",
+            email=f"e{i}@jscorp.com",
+            pay_group_id=pg.id,
+            status="ACTIVE" if i != n_employees - 1 else "TERMINATED",
+        )
+        db.add(emp)
+        emps.append(emp)
+    db.flush()
+    for i, emp in enumerate(emps[:-2]):
+        db.add(
+            models.AttendanceMonthSummary(
+                emp_id=emp.id, year_month="202501", worked_hours=160 + i
+            )
+        )
+    run = models.PayRun(pay_group_id=pg.id, year_month="202501")
+    db.add(run)
+    db.commit()
+    return run, emps
+
+
+def test_calculate_pay_run_creates_then_updates(db) -> None:
+    run, emps = _seed_run(db)
+
+    first = payroll.calculate_pay_run(db, run, batch_size=2)
+    assert first == {"created": 4, "updated": 0}
+
+    second = payroll.calculate_pay_run(db, run, batch_size=2)
+    assert second == {"created": 0, "updated": 4}
+
+    results = {
+        r.emp_id: r
+        for r in db.query(models.PayResult).filter(models.PayResult.pay_run_id == run.id)
+    }
+    assert set(results) == {e.id for e in emps[:-1]}
+    assert float(results[emps[0].id].gross_amount) == 160 * 20000
+    assert float(results[emps[0].id].net_amount) == 160 * 20000 * 0.9
+    # 근태요약이 없는 직원은 0원
+    assert float(results[emps[3].id].gross_amount) == 0
+    assert run.status == "CALCULATED"
+
+
+def test_calculate_pay_run_keeps_dashboard_total(db) -> None:
+    run, emps = _seed_run(db)
+    assert stats.reconcile(db)["pay_run_count"] == 1
+
+    payroll.calculate_pay_run(db, run)
+    # 재계산은 회차 합계의 변화분만 반영
+    summary = db.query(models.AttendanceMonthSummary).filter_by(emp_id=emps[0].id).one()
+    summary.worked_hours = 100
+    db.commit()
+    payroll.calculate_pay_run(db, run)
+
+    row = db.get(models.DashboardStat, stats.STATS_ID)
+    db.refresh(row)
+    assert float(row.total_payroll) == (100 + 161 + 162) * 20000 * 0.9
+    assert stats.reconcile(db) == {}
+
+
+def test_calculate_pay_run_with_pay_items(db) -> None:
+    run, emps = _seed_run(db)
+    db.add_all(
+        [
+            models.PayItem(code="BASE", name="Base", item_type="EARNING", calculation_type="FIXED", default_amount=1000000),
+            models.PayItem(code="OT", name="OT", item_type="EARNING", calculation_type="RATE", default_amount=30000, formula="overtime_hours"),
+            models.PayItem(code="NIGHT", name="Night", item_type="EARNING", calculation_type="FORMULA", formula="max(worked_hours - 160, 0) * 10000"),
+            models.PayItem(code="TAX", name="Tax", item_type="DEDUCTION", calculation_type="FORMULA", formula="gross * 0.05"),
+        ]
+    )
+    db.commit()
+
+    assert payroll.calculate_pay_run(db, run) == {"created": 4, "updated": 0}
+    pr = (
+        db.query(models.PayResult)
+        .filter(models.PayResult.pay_run_id == run.id, models.PayResult.emp_id == emps[2].id)
+        .one()
+    )
+    # worked_hours=162 -> NIGHT 20,000 / overtime 0
+    assert float(pr.gross_amount) == 1020000
+    assert float(pr.deduct_amount) == 51000
+    lines = db.query(models.PayResultItem).filter(models.PayResultItem.pay_result_id == pr.id).all()
+    assert len(lines) == 4
+
+    # 재계산 시 항목 내역은 중복되지 않고 교체됨
+    payroll.calculate_pay_run(db, run)
+    assert db.query(models.PayResultItem).count() == 16
+
+
+def test_compile_formula_rejects_unsafe_expressions() -> None:
+    for expr in ("__import__('os')", "worked_hours.real", "salary * 2", "2 ** 100000", "[1][0]"):
+        try:
+            payroll.compile_formula(expr)
+        except payroll.FormulaError:
+            continue
+        raise AssertionError(f"accepted: {expr}")
+    assert eval(payroll.compile_formula("min(worked_hours, 8) * 2"), {"__builtins__": {}, "min": min, "worked_hours": 10}) == 16
+
+
+def test_gross_only_allowed_in_deduction_formulas() -> None:
+    assert payroll.compile_pay_item(None, "TAX", "DEDUCTION", "FORMULA", None, "gross * 0.1").code_obj
+    for calc in ("FORMULA", "RATE"):
+        try:
+            payroll.compile_pay_item(None, "BONUS", "EARNING", calc, 1, "gross * 0.1")
+        except payroll.FormulaError:
+            continue
+        raise AssertionError(f"earning {calc} accepted gross")
+
+
+def test_parallel_calculation_matches_serial(db) -> None:
+    run, _ = _seed_run(db, n_employees=11)
+    db.add_all(
+        [
+            models.PayItem(code="BASE", name="Base", item_type="EARNING", calculation_type="RATE", default_amount=12345, formula="worked_hours"),
+            models.PayItem(code="TAX", name="Tax", item_type="DEDUCTION", calculation_type="FORMULA", formula="round(gross * 0.033, 2)"),
+        ]
+    )
+    db.commit()
+
+    plan = payroll.compile_pay_plan(db)
+    inputs = payroll.load_pay_inputs(db, run)
+    serial = payroll.compute_pay_amounts(plan, inputs)
+    parallel = payroll.compute_pay_amounts_parallel(plan, inputs, chunks=3)
+    assert parallel == serial
+    # 멀티스레드 서버에서 fork 하지 않음
+    assert payroll._mp_context().get_start_method() != "fork"
@@ -0,0 +1,88 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app import database
+from app.main import app
+
+# EXPLAIN QUERY PLAN 은 SQLite 전용 (PostgreSQL 은 작은 테이블에서 순차 스캔을 선택함)
+pytestmark = pytest.mark.skipif(
+    database.engine.dialect.name != "sqlite", reason="SQLite query plans only"
+)
+
+LIST_ENDPOINTS = [
+    "/api/users",
+    "/api/departments",
+    "/api/departments/1/subtree",
+    "/api/employees",
+    "/api/payroll/pay-groups",
+    "/api/payroll/pay-items",
+    "/api/attendance/monthly?year_month=202501",
+    "/api/attendance/work-types",
+    "/api/attendance/leave-requests",
+    "/api/attendance/leave-requests?status=REQUESTED",
+    "/api/attendance/leave-requests?emp_id=1",
+    "/api/attendance/time-logs",
+    "/api/attendance/time-logs?emp_id=1&year_month=202501",
+    "/api/payroll/runs",
+    "/api/payroll/runs/1/results",
+    "/api/permissions/requests",
+    "/api/permissions/requests?status=PENDING",
+    "/api/permissions/requests/mine",
+    "/api/evaluations/plans",
+    "/api/evaluations/plans/1/items",
+    "/api/evaluations/plans/1/grade-policies",
+    "/api/evaluations/plans/1/promotion-candidates",
+    "/api/education/courses",
+    "/api/education/sessions",
+    "/api/education/sessions?course_id=1",
+    "/api/education/my-enrollments",
+    "/api/benefits/policies",
+    "/api/benefits/my-balances",
+    "/api/codes/groups",
+    "/api/codes/groups/LEAVE_TYPE/codes",
+    "/api/audit-logs",
+    "/api/audit-logs?entity_type=Employee",
+    "/api/employees/1/job-history",
+    "/api/employees/1/status-history",
+]
+
+
+def _full_scans(statements) -> list[str]:
+    scans = []
+    with database.engine.connect() as conn:
+        for sql, params in statements:
+            for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", params):
+                detail = row[-1]
+                # "SCAN t USING INDEX ..." 는 인덱스 순서로 읽는 것이므로 허용
+                if detail.startswith("SCAN") and "INDEX" not in detail:
+                    scans.append(f"{detail} :: {sql}")
+    return scans
+
+
+def test_list_endpoints_use_indexes() -> None:
+    statements = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and not executemany:
+            statements.append((statement, parameters))
+
+    with TestClient(app) as client:
+        token = client.post(
+            "/api/auth/login", json={"username": "admin", "password": "admin123"}
+        ).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        engines = (database.read_engine, database.async_read_engine.sync_engine)
+        for eng in engines:
+            event.listen(eng, "before_cursor_execute", _capture)
+        try:
+            for url in LIST_ENDPOINTS:
+                resp = client.get(url, headers=headers)
+                assert resp.status_code in (200, 404), f"{url}: {resp.text}"
+        finally:
+            for eng in engines:
+                event.remove(eng, "before_cursor_execute", _capture)
+
+    assert statements
+    assert _full_scans(statements) == []
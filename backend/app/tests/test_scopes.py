@@ -0,0 +1,66 @@
+from sqlalchemy import select
+
+from app import models, org, scopes
+from app.auth import Principal
+
+
+def _principal(role: str, emp: models.Employee | None) -> Principal:
+    return Principal(
+        id=1,
+        username="u",
+        role=role,
+        is_active=True,
+        email=None,
+        email_verified=True,
+        emp_id=emp.id if emp else None,
+        dept_id=emp.dept_id if emp else None,
+    )
+
+
+def _seed_org(db):
+    def dept(code, parent=None):
+        d = models.Department(code=code, name=code, parent_id=parent.id if parent else None)
+        db.add(d)
+        db.flush()
+        org.add_department(db, d)
+        return d
+
+    hq = dept("HQ")
+    plant = dept("P1", hq)
+    other = dept("P2", hq)
+    line = dept("L1", plant)
+    emps = {}
+    for key, dept in (("boss", plant), ("peer", plant), ("line", line), ("other", other), ("hq", hq)):
+        emp = models.Employee(emp_no=key, first_name="F", last_name="L", email=f"{key}@jscorp.com", dept_id=dept.id)
+        db.add(emp)
+        emps[key] = emp
+    db.commit()
+    return emps
+
+
+def _visible(db, scope) -> set[str]:
+    stmt = select(models.Employee.emp_no).where(
+        scope.employee_clause(models.Employee.id, models.Employee.dept_id)
+    )
+    via_emp_id = select(models.Employee.emp_no).where(scope.employee_clause(models.Employee.id))
+    result = set(db.scalars(stmt))
+    assert result == set(db.scalars(via_emp_id))
+    return result
+
+
+def test_scopes_resolve_to_subqueries(db) -> None:
+    emps = _seed_org(db)
+    boss = emps["boss"]
+
+    assert _visible(db, scopes.scope_for(_principal("EMPLOYEE", boss))) == {"boss"}
+    assert _visible(db, scopes.scope_for(_principal("MANAGER", boss))) == {"boss", "peer"}
+    # ORG 는 하위 부서(라인)까지 포함
+    assert _visible(db, scopes.scope_for(_principal("PLANT_MANAGER", boss))) == {"boss", "peer", "line"}
+    assert _visible(db, scopes.scope_for(_principal("HR_ADMIN", None))) == set(emps)
+    assert _visible(db, scopes.scope_for(_principal("MANAGER", None))) == set()
+
+    org = scopes.scope_for(_principal("PLANT_MANAGER", boss))
+    assert db.scalar(org.contains(emps["line"].id)) is not None
+    assert db.scalar(org.contains(emps["other"].id)) is None
+    # 같은 주체는 캐시된 스코프 재사용
+    assert scopes.scope_for(_principal("PLANT_MANAGER", boss)) is org
@@ -0,0 +1,114 @@
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+
+from app import database, models
+from app.database import Base
+
+
+def test_production_profile_serializes_concurrent_clock_ins(tmp_path) -> None:
+    url = f"sqlite:///{tmp_path / 'hr.db'}"
+    reader = database.make_engine(url, sqlite_profile="production")
+    writer = database.make_engine(url, writer=True, sqlite_profile="production")
+    Base.metadata.create_all(bind=reader)
+    factory = database.make_session_factory(reader, writer)
+
+    with reader.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+
+    with factory() as db:
+        emp = models.Employee(emp_no="E0001", first_name="F", last_name="L", email="e@jscorp.com")
+        db.add(emp)
+        db.commit()
+        emp_id = emp.id
+
+    errors = []
+
+    def clock_in() -> None:
+        for _ in range(20):
+            with factory() as db:
+                try:
+                    db.get(models.Employee, emp_id)
+                    db.add(models.TimeLog(emp_id=emp_id, log_datetime=datetime.now(), log_type="IN"))
+                    db.commit()
+                except OperationalError as e:
+                    errors.append(e)
+
+    threads = [threading.Thread(target=clock_in) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    with factory() as db:
+        assert db.query(models.TimeLog).count() == 160
+    reader.dispose()
+    writer.dispose()
+
+
+def test_writers_serialize_on_begin_immediate(tmp_path) -> None:
+    url = f"sqlite:///{tmp_path / 'hr.db'}"
+    reader = database.make_engine(url, sqlite_profile="production")
+    writer = database.make_engine(url, writer=True, sqlite_profile="production")
+    Base.metadata.create_all(bind=reader)
+    factory = database.make_session_factory(reader, writer)
+    statements = []
+    event.listen(writer, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    holding = threading.Event()
+    order = []
+
+    def slow_writer() -> None:
+        with factory() as db:
+            db.add(models.Department(code="D1", name="D1", effective_from=datetime(2025, 1, 1)))
+            db.flush()
+            holding.set()
+            time.sleep(0.3)
+            order.append("first")
+            db.commit()
+
+    t = threading.Thread(target=slow_writer)
+    t.start()
+    holding.wait()
+    # 쓰기 잠금을 가진 트랜잭션이 끝날 때까지 busy_timeout 으로 대기한 뒤 진행
+    with factory() as db:
+        db.add(models.Department(code="D2", name="D2", effective_from=datetime(2025, 1, 1)))
+        db.commit()
+        order.append("second")
+    t.join()
+
+    assert order == ["first", "second"]
+    assert statements.count("BEGIN IMMEDIATE") == 2
+    assert writer.pool.size() > 1
+    reader.dispose()
+    writer.dispose()
+
+
+def test_read_session_uses_query_only_connection(tmp_path) -> None:
+    url = f"sqlite:///{tmp_path / 'hr.db'}"
+    primary = database.make_engine(url)
+    Base.metadata.create_all(bind=primary)
+    reader = database.make_read_engine(url)
+    factory = database.make_read_session_factory(reader)
+
+    with factory() as db:
+        assert db.query(models.Employee).count() == 0
+        db.add(models.Employee(emp_no="E0001", first_name="F", last_name="L", email="e@jscorp.com"))
+        try:
+            db.commit()
+        except RuntimeError:
+            db.rollback()
+        else:
+            raise AssertionError("read-only session flushed")
+        try:
+            db.execute(text("DELETE FROM employees"))
+        except OperationalError:
+            pass
+        else:
+            raise AssertionError("query_only connection accepted a write")
+    primary.dispose()
+    reader.dispose()
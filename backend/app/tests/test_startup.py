@@ -0,0 +1,39 @@
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from app import main
+
+# 워커 재시작/콜드스타트 시 startup 단계(스키마 확인 + 시딩 여부 판단) 허용 시간
+STARTUP_BUDGET_SECONDS = 1.0
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+
+def test_import_does_not_touch_database() -> None:
+    code = (
+        "from sqlalchemy import event\n"
+        "from app import database\n"
+        "connects = []\n"
+        "event.listen(database.engine, 'connect', lambda *a: connects.append(1))\n"
+        "import app.main\n"
+        "print(len(connects))\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert out.stdout.strip() == "0"
+
+
+def test_warm_startup_within_budget() -> None:
+    main.startup()  # 최초 실행: 마이그레이션/시딩
+
+    started = time.perf_counter()
+    main.startup()
+    elapsed = time.perf_counter() - started
+    assert elapsed < STARTUP_BUDGET_SECONDS, f"startup took {elapsed:.3f}s"
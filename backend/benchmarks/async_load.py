@@ -0,0 +1,105 @@
+"""500 concurrent users against /api/employees: sync threadpool handler vs the async handler.
+
+Both variants run in-process (httpx ASGITransport) on a temporary SQLite file while a
+share of the users log in concurrently, so bcrypt occupies FastAPI's threadpool the way it
+does in production.
+
+    cd backend
+    python -m benchmarks.async_load --users 500 --requests 10
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+_tmp = tempfile.TemporaryDirectory()
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{Path(_tmp.name) / 'load.db'}")
+# 500 명이 동시에 풀을 기다리므로 대기 시간 초과 대신 지연(latency)으로 측정
+os.environ.setdefault("DB_POOL_TIMEOUT", "300")
+
+import httpx  # noqa: E402
+from fastapi import Depends  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app import auth, database, models, schemas  # noqa: E402
+from app.main import app, startup  # noqa: E402
+
+
+@app.get("/bench/sync/employees", response_model=list[schemas.EmployeeRead], include_in_schema=False)
+def _sync_list_employees(
+    db: Session = Depends(database.get_read_db),
+    current_user: models.User = Depends(auth.get_current_user),
+) -> list[schemas.EmployeeRead]:
+    # 포팅 전 list_employees (ADMIN 경로)
+    return db.query(models.Employee).order_by(models.Employee.emp_no).all()
+
+
+def _seed(n: int) -> None:
+    startup()
+    with database.SessionLocal() as db:
+        db.add_all(
+            models.Employee(emp_no=f"B{i:05d}", first_name="F", last_name="L", email=f"b{i}@jscorp.com")
+            for i in range(n)
+        )
+        db.commit()
+
+
+async def _run(path: str, users: int, per_user: int, login_share: float) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=300) as client:
+        token = (await client.post("/api/auth/login", json={"username": "admin", "password": "admin123"})).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        latencies: list[float] = []
+        errors = 0
+        n_login = int(users * login_share)
+
+        async def reader() -> None:
+            nonlocal errors
+            for _ in range(per_user):
+                t0 = time.perf_counter()
+                resp = await client.get(path, headers=headers)
+                latencies.append(time.perf_counter() - t0)
+                errors += resp.status_code != 200
+
+        async def login() -> None:
+            for _ in range(per_user):
+                await client.post("/api/auth/login", json={"username": "sample1", "password": "sample123"})
+
+        started = time.perf_counter()
+        await asyncio.gather(*(reader() for _ in range(users - n_login)), *(login() for _ in range(n_login)))
+        elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "path": path,
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": elapsed,
+        "per_sec": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=10, help="requests per user")
+    parser.add_argument("--employees", type=int, default=50)
+    parser.add_argument("--login-share", type=float, default=0.05)
+    args = parser.parse_args()
+    _seed(args.employees)
+    for path in ("/bench/sync/employees", "/api/employees"):
+        r = asyncio.run(_run(path, args.users, args.requests, args.login_share))
+        print(
+            f"{r['path']:24s} {r['requests']:6d} req {r['errors']:4d} err {r['seconds']:7.2f}s {r['per_sec']:8.1f} req/s "
+            f"p50 {r['p50_ms']:8.1f}ms p95 {r['p95_ms']:8.1f}ms"
+        )
+        asyncio.run(database.async_read_engine.dispose())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Monthly attendance aggregation over synthetic time logs.
+
+    cd backend
+    python -m benchmarks.attendance_aggregate --employees 30000 --punches 60
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import insert
+
+from app import attendance, attendance_kernel, database, models
+from app.database import Base
+
+YEAR_MONTH = "202501"
+
+
+def _punches(emp_id: int, workdays: list[date], per_month: int):
+    # 근무일마다 IN/OUT, 일부 날은 점심 외출(OUT/IN)까지 4건
+    four = max(0, min(len(workdays), (per_month - 2 * len(workdays)) // 2))
+    for i, d in enumerate(workdays):
+        jitter = (emp_id * 7 + i * 13) % 20
+        start = datetime(d.year, d.month, d.day, 8, 50) + timedelta(minutes=jitter)
+        end = datetime(d.year, d.month, d.day, 18, 0) + timedelta(minutes=(emp_id + i) % 120)
+        yield {"emp_id": emp_id, "log_datetime": start, "log_type": "IN"}
+        if i < four:
+            yield {"emp_id": emp_id, "log_datetime": datetime(d.year, d.month, d.day, 12, 0), "log_type": "OUT"}
+            yield {"emp_id": emp_id, "log_datetime": datetime(d.year, d.month, d.day, 12, 50), "log_type": "IN"}
+        yield {"emp_id": emp_id, "log_datetime": end, "log_type": "OUT"}
+
+
+def _seed(factory, employees: int, punches: int) -> int:
+    first = date(2025, 1, 1)
+    workdays = [first + timedelta(days=i) for i in range(31) if (first + timedelta(days=i)).weekday() < 5]
+    with factory() as db:
+        db.add(models.WorkType(code="DAY", name="Day", start_time="09:00", end_time="18:00", break_minutes=60))
+        db.execute(
+            insert(models.Employee),
+            [
+                {"emp_no": f"E{i:06d}", "first_name": "F", "last_name": "L", "email": f"e{i}@jscorp.com", "hire_date": date(2020, 1, 1)}
+                for i in range(1, employees + 1)
+            ],
+        )
+        total = 0
+        batch = []
+        for emp_id in range(1, employees + 1):
+            batch.extend(_punches(emp_id, workdays, punches))
+            if len(batch) >= 50000:
+                db.execute(insert(models.TimeLog), batch)
+                total += len(batch)
+                batch.clear()
+        if batch:
+            db.execute(insert(models.TimeLog), batch)
+            total += len(batch)
+        db.commit()
+    return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--employees", type=int, default=30000)
+    parser.add_argument("--punches", type=int, default=60)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = os.getenv("DATABASE_URL") or f"sqlite:///{Path(tmp) / 'aggregate.db'}"
+        eng = database.make_engine(url)
+        Base.metadata.drop_all(bind=eng)
+        Base.metadata.create_all(bind=eng)
+        factory = database.make_session_factory(eng)
+
+        t0 = time.perf_counter()
+        logs = _seed(factory, args.employees, args.punches)
+        print(f"seeded {args.employees} employees / {logs} time logs in {time.perf_counter() - t0:.1f}s")
+
+        with factory() as db:
+            cal = attendance.load_month_calendar(db, YEAR_MONTH)
+            t0 = time.perf_counter()
+            months = list(attendance.iter_employee_months(db, cal))
+            load = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            reference = [attendance.summarize_employee(cal, emp) for emp in months]
+            compute = time.perf_counter() - t0
+            print(f"reference  load (streamed merge): {load:.2f}s   compute (pure Python): {compute:.2f}s")
+
+            t0 = time.perf_counter()
+            arrays = attendance_kernel.load_month_arrays(db, cal)
+            load = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            totals = attendance_kernel.summarize_month(cal, arrays)
+            compute = time.perf_counter() - t0
+            print(f"vectorized load (columns):        {load:.2f}s   compute (NumPy):       {compute:.2f}s")
+
+        # 두 구현의 결과가 같은지 확인
+        mismatched = sum(
+            any(abs(totals[k][i] - v) > 1e-6 for k, v in vars(ref).items())
+            for i, ref in enumerate(reference)
+        )
+        print(f"employees: {len(reference)}  mismatched: {mismatched}")
+
+        for label in ("first run (insert)", "re-run (update)"):
+            with factory() as db:
+                t0 = time.perf_counter()
+                result = attendance.aggregate_month(db, YEAR_MONTH)
+                print(f"aggregate_month {label}: {time.perf_counter() - t0:.2f}s {result}")
+        eng.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Clock-in burst against a SQLite file: basic driver defaults vs the production profile.
+
+    cd backend
+    python -m benchmarks.clock_in_stress --threads 32 --per-thread 50
+"""
+
+import argparse
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy.exc import OperationalError
+
+from app import database, models
+from app.database import Base
+
+
+def _run(profile: str, threads: int, per_thread: int, readers: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{Path(tmp) / 'stress.db'}"
+        reader = database.make_engine(url, sqlite_profile=profile)
+        writer = database.make_engine(url, writer=True, sqlite_profile=profile) if profile == "production" else None
+        Base.metadata.create_all(bind=reader)
+        factory = database.make_session_factory(reader, writer)
+
+        with factory() as db:
+            db.add_all(
+                models.Employee(emp_no=f"E{i:05d}", first_name="F", last_name="L", email=f"e{i}@jscorp.com")
+                for i in range(threads)
+            )
+            db.commit()
+
+        ok = 0
+        locked = 0
+        lock = threading.Lock()
+        stop = threading.Event()
+
+        def clock_in(emp_id: int) -> None:
+            nonlocal ok, locked
+            for _ in range(per_thread):
+                db = factory()
+                try:
+                    # create_time_log 와 같은 흐름: 직원 조회 -> INSERT -> commit -> refresh
+                    emp = db.get(models.Employee, emp_id)
+                    tl = models.TimeLog(emp_id=emp.id, log_datetime=datetime.now(), log_type="IN", source="DEVICE")
+                    db.add(tl)
+                    db.commit()
+                    db.refresh(tl)
+                    with lock:
+                        ok += 1
+                except OperationalError:
+                    db.rollback()
+                    with lock:
+                        locked += 1
+                finally:
+                    db.close()
+
+        def read_loop() -> None:
+            while not stop.is_set():
+                with factory() as db:
+                    db.query(models.TimeLog).order_by(models.TimeLog.log_datetime.desc()).limit(100).all()
+
+        workers = [threading.Thread(target=clock_in, args=(i + 1,)) for i in range(threads)]
+        bg = [threading.Thread(target=read_loop) for _ in range(readers)]
+        for t in bg:
+            t.start()
+        started = time.perf_counter()
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+        elapsed = time.perf_counter() - started
+        stop.set()
+        for t in bg:
+            t.join()
+        reader.dispose()
+        if writer is not None:
+            writer.dispose()
+    return {"profile": profile, "ok": ok, "locked": locked, "seconds": elapsed, "per_sec": ok / elapsed}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--per-thread", type=int, default=50)
+    parser.add_argument("--readers", type=int, default=4)
+    args = parser.parse_args()
+    results = [_run(p, args.threads, args.per_thread, args.readers) for p in ("basic", "production")]
+    for r in results:
+        print(f"{r['profile']:10s} ok={r['ok']:6d} locked={r['locked']:5d} {r['seconds']:7.2f}s {r['per_sec']:8.1f} clock-ins/s")
+    base, prod = results
+    if base["per_sec"]:
+        print(f"speedup x{prod['per_sec'] / base['per_sec']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Evaluation grade aggregation over synthetic results.
+
+    cd backend
+    python -m benchmarks.grade_aggregate --results 100000
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import insert, select
+
+from app import database, evaluation, models
+from app.database import Base
+
+POLICIES = (
+    (90, 100, "S", True),
+    (80, 90, "A", True),
+    (70, 80, "B", False),
+    (60, 70, "C", False),
+    (0, 60, "D", False),
+)
+DISTRIBUTION = {"S": 10, "A": 20, "B": 40, "C": 20, "D": 10}
+
+
+def _seed(factory, results: int) -> int:
+    rng = random.Random(1)
+    with factory() as db:
+        plan = models.EvaluationPlan(name="Bench", year=2025, status="OPEN")
+        db.add(plan)
+        db.flush()
+        for low, high, grade, promo in POLICIES:
+            db.add(models.GradePolicy(plan_id=plan.id, min_score=low, max_score=high, grade=grade, is_promotion_candidate=promo))
+        db.execute(
+            insert(models.Employee),
+            [
+                {"emp_no": f"E{i:06d}", "first_name": "F", "last_name": "L", "email": f"e{i}@jscorp.com"}
+                for i in range(1, results + 1)
+            ],
+        )
+        db.execute(
+            insert(models.EvaluationResult),
+            [
+                {"plan_id": plan.id, "emp_id": i, "score": round(rng.uniform(40, 100), 2)}
+                for i in range(1, results + 1)
+            ],
+        )
+        db.commit()
+        return plan.id
+
+
+def _linear_scan(db, plan_id: int) -> dict[str, int]:
+    # 이전 구현: 결과마다 정책 선형 탐색, 행마다 UPDATE
+    policies = (
+        db.query(models.GradePolicy)
+        .filter(models.GradePolicy.plan_id == plan_id)
+        .order_by(models.GradePolicy.min_score)
+        .all()
+    )
+    results = db.query(models.EvaluationResult).filter(models.EvaluationResult.plan_id == plan_id).all()
+    for res in results:
+        score = float(res.score)
+        grade, is_promo = None, False
+        for gp in policies:
+            if gp.min_score <= score <= gp.max_score:
+                grade, is_promo = gp.grade, gp.is_promotion_candidate
+                break
+        res.grade = grade
+        res.is_promotion_candidate = is_promo
+    db.commit()
+    return {"updated": len(results)}
+
+
+def _grades(db, plan_id: int) -> dict[int, str | None]:
+    r = models.EvaluationResult
+    return dict(db.execute(select(r.id, r.grade).where(r.plan_id == plan_id)).all())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--results", type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = os.getenv("DATABASE_URL") or f"sqlite:///{Path(tmp) / 'grades.db'}"
+        eng = database.make_engine(url)
+        Base.metadata.drop_all(bind=eng)
+        Base.metadata.create_all(bind=eng)
+        factory = database.make_session_factory(eng)
+
+        t0 = time.perf_counter()
+        plan_id = _seed(factory, args.results)
+        print(f"seeded {args.results} results in {time.perf_counter() - t0:.1f}s")
+
+        runs = (
+            ("linear scan + per-row UPDATE", lambda db: _linear_scan(db, plan_id)),
+            ("interval table + bulk UPDATE", lambda db: evaluation.aggregate_grades(db, plan_id)),
+            ("forced ranking + bulk UPDATE", lambda db: evaluation.aggregate_grades(db, plan_id, DISTRIBUTION)),
+        )
+        graded = []
+        for label, run in runs:
+            with factory() as db:
+                t0 = time.perf_counter()
+                result = run(db)
+                print(f"{label}: {time.perf_counter() - t0:.2f}s {result}")
+                graded.append(_grades(db, plan_id))
+        # 점수 구간 방식은 이전 구현과 결과가 같아야 함
+        mismatched = sum(graded[0][k] != graded[1][k] for k in graded[0])
+        print(f"score-band mismatched: {mismatched}")
+
+        with factory() as db:
+            r = models.EvaluationResult
+            scores = db.execute(select(r.id, r.score).where(r.plan_id == plan_id)).all()
+            policies = db.scalars(select(models.GradePolicy).where(models.GradePolicy.plan_id == plan_id)).all()
+        table = evaluation.GradeTable.compile(policies)
+        t0 = time.perf_counter()
+        evaluation.grade_by_score(table, scores)
+        band = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        evaluation.grade_by_distribution(table, scores, DISTRIBUTION)
+        ranking = time.perf_counter() - t0
+        print(f"compute only: score bands {band:.3f}s   forced ranking {ranking:.3f}s")
+        eng.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-import { useCallback, useEffect, useState } from 'react'
+import { useCallback, useEffect, useState, type Dispatch, type SetStateAction } from 'react'
 import { useTranslation } from 'react-i18next'
 import Login from './Login'
 import './App.css'
@@ -226,6 +226,27 @@ async function fetchJson<T>(url: string, headers: Record<string, string> = {}):
   return (await res.json()) as T
 }
 
+type Page<T> = { items: T[]; nextCursor: string | null }
+
+// 목록 API 는 X-Next-Cursor 헤더로 다음 페이지를 알려줌 (마지막 페이지에는 없음).
+// 첫 페이지만 받고, 이후 페이지는 '더 보기' 로 요청할 때 가져옴
+async function fetchPage<T>(
+  url: string,
+  headers: Record<string, string> = {},
+  cursor: string | null = null,
+): Promise<Page<T>> {
+  const sep = url.includes('?') ? '&' : '?'
+  const pageUrl = cursor ? `${url}${sep}cursor=${encodeURIComponent(cursor)}` : url
+  const res = await fetch(pageUrl, { headers: { ...headers } })
+  if (!res.ok) {
+    const err = await res.json().catch(() => ({}))
+    throw new Error((err as { detail?: string }).detail || `Request failed: ${res.status}`)
+  }
+  return { items: (await res.json()) as T[], nextCursor: res.headers.get('X-Next-Cursor') }
+}
+
+type PagedList = 'employees' | 'departments' | 'leaveRequests' | 'payResults' | 'permissionRequests' | 'timeLogs' | 'users'
+
 async function postJson<T>(
   url: string,
   body: object,
@@ -439,21 +460,40 @@ function App() {
   const [myPointBalances, setMyPointBalances] = useState<PointBalance[]>([])
   const [timeLogs, setTimeLogs] = useState<{ id: number; emp_id: number; log_datetime: string; log_type: string; source: string }[]>([])
 
+  // 목록별 다음 페이지 (url + cursor). 없으면 마지막 페이지까지 받은 상태
+  const [pageCursors, setPageCursors] = useState<Partial<Record<PagedList, { url: string; cursor: string }>>>({})
+
   const currentYearMonth = new Date().toISOString().slice(0, 7).replace('-', '')
 
   const headers = authHeaders(token)
 
+  const trackCursor = useCallback((key: PagedList, url: string, cursor: string | null) => {
+    setPageCursors((prev) => {
+      const next = { ...prev }
+      if (cursor) next[key] = { url, cursor }
+      else delete next[key]
+      return next
+    })
+  }, [])
+
+  const loadFirstPage = useCallback(
+    async <T,>(key: PagedList, url: string, set: (items: T[]) => void) => {
+      const page = await fetchPage<T>(url, authHeaders(token))
+      set(page.items)
+      trackCursor(key, url, page.nextCursor)
+    },
+    [token, trackCursor],
+  )
+
   const loadEmployees = useCallback(async () => {
     if (!token) return
-    const list = await fetchJson<Employee[]>(`${API_BASE}/api/employees`, headers)
-    setEmployees(list)
-  }, [token])
+    await loadFirstPage<Employee>('employees', `${API_BASE}/api/employees`, setEmployees)
+  }, [token, loadFirstPage])
 
   const loadDepartments = useCallback(async () => {
     if (!token) return
-    const list = await fetchJson<Department[]>(`${API_BASE}/api/departments`, headers)
-    setDepartments(list)
-  }, [token])
+    await loadFirstPage<Department>('departments', `${API_BASE}/api/departments`, setDepartments)
+  }, [token, loadFirstPage])
 
   const loadPayGroups = useCallback(async () => {
     if (!token) return
@@ -482,16 +522,13 @@ function App() {
     setPayRuns(list)
     if (list.length > 0) {
       setSelectedRun(list[0].id)
-      const results = await fetchJson<PayResult[]>(
-        `${API_BASE}/api/payroll/runs/${list[0].id}/results`,
-        headers,
-      )
-      setPayResults(results)
+      await loadFirstPage<PayResult>('payResults', `${API_BASE}/api/payroll/runs/${list[0].id}/results`, setPayResults)
     } else {
       setSelectedRun(null)
       setPayResults([])
+      trackCursor('payResults', '', null)
     }
-  }, [token])
+  }, [token, loadFirstPage, trackCursor])
 
   const loadDashboardStats = useCallback(async () => {
     if (!token) return
@@ -507,9 +544,8 @@ function App() {
 
   const loadLeaveRequests = useCallback(async () => {
     if (!token) return
-    const list = await fetchJson<LeaveRequest[]>(`${API_BASE}/api/attendance/leave-requests`, headers)
-    setLeaveRequests(list)
-  }, [token])
+    await loadFirstPage<LeaveRequest>('leaveRequests', `${API_BASE}/api/attendance/leave-requests`, setLeaveRequests)
+  }, [token, loadFirstPage])
 
   const loadCurrentUser = useCallback(async () => {
     if (!token) return
@@ -526,13 +562,18 @@ function App() {
     // HR_ADMIN / ADMIN 전용 전체 요청 목록
     if (currentUser?.role === 'ADMIN' || currentUser?.role === 'HR_ADMIN') {
       try {
-        const list = await fetchJson<PermissionRequest[]>(`${API_BASE}/api/permissions/requests?status=PENDING`, headers)
-        setPermissionRequests(list)
+        await loadFirstPage<PermissionRequest>(
+          'permissionRequests',
+          `${API_BASE}/api/permissions/requests?status=PENDING`,
+          setPermissionRequests,
+        )
       } catch {
         setPermissionRequests([])
+        trackCursor('permissionRequests', '', null)
       }
     } else {
       setPermissionRequests([])
+      trackCursor('permissionRequests', '', null)
     }
     // 내 요청 목록
     try {
@@ -541,7 +582,7 @@ function App() {
     } catch {
       setMyPermissionRequests([])
     }
-  }, [token, currentUser?.role])
+  }, [token, currentUser?.role, loadFirstPage, trackCursor])
 
   const loadEvaluationPlans = useCallback(async () => {
     if (!token) return
@@ -658,25 +699,26 @@ function App() {
   const loadTimeLogs = useCallback(async () => {
     if (!token) return
     try {
-      const list = await fetchJson<{ id: number; emp_id: number; log_datetime: string; log_type: string; source: string }[]>(
+      await loadFirstPage<{ id: number; emp_id: number; log_datetime: string; log_type: string; source: string }>(
+        'timeLogs',
         `${API_BASE}/api/attendance/time-logs?year_month=${currentYearMonth}`,
-        headers,
+        setTimeLogs,
       )
-      setTimeLogs(list)
     } catch {
       setTimeLogs([])
+      trackCursor('timeLogs', '', null)
     }
-  }, [token, currentYearMonth])
+  }, [token, currentYearMonth, loadFirstPage, trackCursor])
 
   const loadUsers = useCallback(async () => {
     if (!token) return
     try {
-      const list = await fetchJson<User[]>(`${API_BASE}/api/users`, headers)
-      setUsers(list)
+      await loadFirstPage<User>('users', `${API_BASE}/api/users`, setUsers)
     } catch {
       setUsers([])
+      trackCursor('users', '', null)
     }
-  }, [token])
+  }, [token, loadFirstPage, trackCursor])
 
   useEffect(() => {
     async function bootstrap() {
@@ -751,11 +793,7 @@ function App() {
     try {
       setSelectedRun(runId)
       setLoading(true)
-      const results = await fetchJson<PayResult[]>(
-        `${API_BASE}/api/payroll/runs/${runId}/results`,
-        headers,
-      )
-      setPayResults(results)
+      await loadFirstPage<PayResult>('payResults', `${API_BASE}/api/payroll/runs/${runId}/results`, setPayResults)
     } catch (e) {
       setError(e instanceof Error ? e.message : 'Failed to load payroll results.')
     } finally {
@@ -763,6 +801,41 @@ function App() {
     }
   }
 
+  async function loadMore(key: PagedList) {
+    const next = pageCursors[key]
+    if (!next) return
+    try {
+      setLoading(true)
+      const page = await fetchPage<never>(next.url, headers, next.cursor)
+      const append = <T,>(set: Dispatch<SetStateAction<T[]>>) => set((prev) => [...prev, ...(page.items as T[])])
+      switch (key) {
+        case 'employees': append(setEmployees); break
+        case 'departments': append(setDepartments); break
+        case 'leaveRequests': append(setLeaveRequests); break
+        case 'payResults': append(setPayResults); break
+        case 'permissionRequests': append(setPermissionRequests); break
+        case 'timeLogs': append(setTimeLogs); break
+        case 'users': append(setUsers); break
+      }
+      trackCursor(key, next.url, page.nextCursor)
+    } catch (e) {
+      setError(e instanceof Error ? e.message : 'Failed to load more.')
+    } finally {
+      setLoading(false)
+    }
+  }
+
+  function loadMoreButton(key: PagedList) {
+    if (!pageCursors[key]) return null
+    return (
+      <div className="load-more">
+        <button type="button" disabled={loading} onClick={() => loadMore(key)}>
+          {t('common.loadMore')}
+        </button>
+      </div>
+    )
+  }
+
   if (!token) {
     const params = new URLSearchParams(window.location.search)
     const resetToken = params.get('reset')
@@ -1344,6 +1417,7 @@ function App() {
                 </div>
               ))}
             </div>
+            {loadMoreButton('employees')}
             <div className="section-footer">
               <span>{t('employees.manageHint')}</span>
               <button type="button" className="primary-button" onClick={openAddEmployee}>
@@ -1390,6 +1464,7 @@ function App() {
                   </div>
                 ))}
               </div>
+              {loadMoreButton('departments')}
               <button type="button" className="primary-button" onClick={openAddDept} style={{ marginTop: '0.5rem' }}>
                 {t('organization.addDepartment')}
               </button>
@@ -1544,6 +1619,7 @@ function App() {
                   )
                 })}
               </div>
+              {loadMoreButton('leaveRequests')}
               <button type="button" className="primary-button" onClick={openLeaveRequest} style={{ marginTop: '0.5rem' }}>
                 {t('attendance.requestLeave')}
               </button>
@@ -1600,7 +1676,7 @@ function App() {
                       const now = new Date().toISOString().slice(0, 19).replace('T', ' ')
                       await postJson(`${API_BASE}/api/attendance/time-logs`, {
                         log_datetime: now,
-                        log_type: timeLogs.length % 2 === 0 ? 'IN' : 'OUT',
+                        log_type: timeLogs[0]?.log_type === 'IN' ? 'OUT' : 'IN',
                         source: 'WEB',
                       }, headers)
                       await loadTimeLogs()
@@ -1636,6 +1712,7 @@ function App() {
                   </div>
                 )}
               </div>
+              {loadMoreButton('timeLogs')}
             </div>
           </section>
         )}
@@ -1707,6 +1784,7 @@ function App() {
                 })}
               </div>
             )}
+            {selectedRun && loadMoreButton('payResults')}
             <div className="section-footer">
               <span>{t('payroll.newRunHint')}</span>
               <button
@@ -2192,6 +2270,7 @@ function App() {
                     </div>
                   ))}
                 </div>
+                {loadMoreButton('users')}
                 <div className="section-footer">
                   <span>{t('auth.addUserHint')}</span>
                   <button type="button" className="primary-button" onClick={() => { setAddUserForm({ username: '', password: '', role: 'EMPLOYEE' }); setShowAddUserModal(true) }}>
@@ -2265,6 +2344,7 @@ function App() {
                 </div>
               )}
             </div>
+            {loadMoreButton('permissionRequests')}
           </section>
         )}
       </div>